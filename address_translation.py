@@ -0,0 +1,559 @@
+"""
+Address translation for the Memory Management Visualizer
+Per-process multi-level page tables with a set-associative TLB in front
+"""
+import random
+from array import array
+from collections import OrderedDict
+
+from snapshot_format import checked_int, frame_array, require
+
+TLB_POLICIES = ('LRU', 'FIFO', 'RANDOM')
+MAX_PAGE_TABLE_LEVELS = 4
+
+# Simulated cost of a translation: a TLB lookup, plus one memory reference
+# per page table entry read when the lookup misses
+TLB_HIT_CYCLES = 1
+MEMORY_REFERENCE_CYCLES = 100
+
+
+class MultiLevelPageTable:
+    """
+    Radix-tree page table of one process.
+
+    The virtual page number is split into ``levels`` equal-width indexes,
+    most significant first, and each table is a sparse dict keyed by its
+    index. A walk reads one entry per level until it reaches the frame or a
+    missing table. Tables are created when the first page under them is
+    mapped and dropped when their last page is unmapped, so ``node_count``
+    is the number of tables a real system would have to keep in memory.
+    """
+
+    def __init__(self, levels, vpn_bits):
+        """
+        Initialize an empty page table
+
+        Args:
+            levels (int): Number of table levels
+            vpn_bits (int): Width of virtual page numbers in bits
+        """
+        self.levels = levels
+        self.bits_per_level = -(-vpn_bits // levels)
+        self._mask = (1 << self.bits_per_level) - 1
+        self._shifts = [self.bits_per_level * level for level in range(levels - 1, -1, -1)]
+        self.root = {}
+        self.node_count = 1
+        self.mapped_pages = 0
+
+    def copy(self):
+        """
+        Copy the table, one dict copy per table node
+
+        Returns:
+            MultiLevelPageTable: Independent table with the same mappings
+        """
+        def copy_node(node, depth):
+            if depth == 1:
+                return dict(node)
+            return {index: copy_node(child, depth - 1) for index, child in node.items()}
+
+        clone = MultiLevelPageTable.__new__(MultiLevelPageTable)
+        clone.__dict__.update(self.__dict__)
+        clone.root = copy_node(self.root, self.levels)
+        return clone
+
+    def walk(self, vpn):
+        """
+        Look up a virtual page the way a hardware page walker would
+
+        Args:
+            vpn (int): Virtual page number
+
+        Returns:
+            tuple: (frame number or None if unmapped, entries read)
+        """
+        node = self.root
+        references = 0
+        for shift in self._shifts:
+            references += 1
+            node = node.get((vpn >> shift) & self._mask)
+            if node is None:
+                return None, references
+        return node, references
+
+    def map(self, vpn, frame_idx):
+        """
+        Point a virtual page at a frame, creating tables as needed
+
+        Args:
+            vpn (int): Virtual page number
+            frame_idx (int): Frame holding the page
+        """
+        node = self.root
+        for shift in self._shifts[:-1]:
+            index = (vpn >> shift) & self._mask
+            child = node.get(index)
+            if child is None:
+                child = node[index] = {}
+                self.node_count += 1
+            node = child
+        index = vpn & self._mask
+        if index not in node:
+            self.mapped_pages += 1
+        node[index] = frame_idx
+
+    def unmap(self, vpn):
+        """
+        Remove a virtual page's mapping and any tables left empty
+
+        Args:
+            vpn (int): Virtual page number
+        """
+        path = []
+        node = self.root
+        for shift in self._shifts[:-1]:
+            index = (vpn >> shift) & self._mask
+            child = node.get(index)
+            if child is None:
+                return
+            path.append((node, index))
+            node = child
+        if node.pop(vpn & self._mask, None) is None:
+            return
+        self.mapped_pages -= 1
+
+        while path and not node:
+            node, index = path.pop()
+            del node[index]
+            self.node_count -= 1
+
+    def frames(self):
+        """
+        Get the frame of every mapped page
+
+        Returns:
+            list: Frame numbers in no particular order
+        """
+        nodes = [self.root]
+        for _ in range(self.levels - 1):
+            nodes = [child for node in nodes for child in node.values()]
+        return [frame_idx for node in nodes for frame_idx in node.values()]
+
+    def mappings(self):
+        """
+        Get every mapped page with its frame
+
+        Returns:
+            list: (vpn, frame number) pairs in no particular order
+        """
+        nodes = [(0, self.root)]
+        for _ in range(self.levels - 1):
+            nodes = [((prefix << self.bits_per_level) | index, child)
+                     for prefix, node in nodes for index, child in node.items()]
+        return [((prefix << self.bits_per_level) | index, frame_idx)
+                for prefix, node in nodes for index, frame_idx in node.items()]
+
+
+class Tlb:
+    """
+    Set-associative translation lookaside buffer.
+
+    Entries are tagged with the process ID, so switching between processes
+    does not flush it. A virtual page can only be cached in set
+    ``vpn % num_sets``, and each set is an ordered dict of at most ``ways``
+    entries so LRU and FIFO victims are the oldest entry in O(1).
+    """
+
+    def __init__(self, entries=64, ways=4, policy='LRU', seed=0):
+        """
+        Initialize an empty TLB
+
+        Args:
+            entries (int): Total number of entries
+            ways (int): Entries per set (``entries`` for fully associative)
+            policy (str): Replacement within a set (see TLB_POLICIES)
+            seed (int): Seed for the RANDOM policy
+        """
+        if entries <= 0 or ways <= 0 or entries % ways:
+            raise ValueError(f"TLB entries ({entries}) must be a positive multiple of its ways ({ways})")
+        if policy not in TLB_POLICIES:
+            raise ValueError(f"Unknown TLB replacement policy: {policy}")
+        self.entries = entries
+        self.ways = ways
+        self.policy = policy
+        self.num_sets = entries // ways
+        self._sets = [OrderedDict() for _ in range(self.num_sets)]
+        self._rng = random.Random(seed)
+
+    def copy(self):
+        """
+        Copy the TLB, including the RANDOM policy's generator state
+
+        Returns:
+            Tlb: Independent TLB with the same entries
+        """
+        clone = Tlb.__new__(Tlb)
+        clone.__dict__.update(self.__dict__)
+        clone._sets = [entries.copy() for entries in self._sets]
+        clone._rng = random.Random()
+        clone._rng.setstate(self._rng.getstate())
+        return clone
+
+    def lookup(self, process_id, vpn):
+        """
+        Find a cached translation
+
+        Args:
+            process_id (int): Process the virtual page belongs to
+            vpn (int): Virtual page number
+
+        Returns:
+            int: Frame number, or None on a TLB miss
+        """
+        entries = self._sets[vpn % self.num_sets]
+        key = (process_id, vpn)
+        frame_idx = entries.get(key)
+        if frame_idx is not None and self.policy == 'LRU':
+            entries.move_to_end(key)
+        return frame_idx
+
+    def insert(self, process_id, vpn, frame_idx):
+        """
+        Cache a translation, evicting an entry of its set if the set is full
+
+        Args:
+            process_id (int): Process the virtual page belongs to
+            vpn (int): Virtual page number
+            frame_idx (int): Frame holding the page
+        """
+        entries = self._sets[vpn % self.num_sets]
+        key = (process_id, vpn)
+        if key not in entries and len(entries) >= self.ways:
+            if self.policy == 'RANDOM':
+                del entries[self._rng.choice(list(entries))]
+            else:
+                entries.popitem(last=False)
+        entries[key] = frame_idx
+
+    def invalidate(self, process_id, vpn):
+        """
+        Drop the cached translation of one page (a TLB shootdown)
+
+        Args:
+            process_id (int): Process the virtual page belongs to
+            vpn (int): Virtual page number
+        """
+        self._sets[vpn % self.num_sets].pop((process_id, vpn), None)
+
+    def flush(self, process_id):
+        """
+        Drop every cached translation of a process
+
+        Args:
+            process_id (int): Process whose entries are removed
+        """
+        for entries in self._sets:
+            for key in [key for key in entries if key[0] == process_id]:
+                del entries[key]
+
+    def get_state(self):
+        """
+        Get the cached translations as plain data for a snapshot
+
+        Returns:
+            dict: (process, vpn, frame) entries of each set in replacement
+                order, and the state of the RANDOM policy's generator
+        """
+        return {
+            'sets': [[(process_id, vpn, frame_idx) for (process_id, vpn), frame_idx in entries.items()]
+                     for entries in self._sets],
+            'rng': self._rng.getstate()
+        }
+
+    def set_state(self, state):
+        """
+        Load get_state() data into a TLB of the same geometry
+
+        Args:
+            state (dict): Output of get_state()
+        """
+        sets = state['sets']
+        require(type(sets) is list and len(sets) == self.num_sets, "TLB sets do not match its geometry")
+        self._sets = []
+        for index, entries in enumerate(sets):
+            require(type(entries) is list and len(entries) <= self.ways, "overfull TLB set")
+            for process_id, vpn, frame_idx in entries:
+                require(checked_int(vpn, 0) % self.num_sets == index and type(frame_idx) is int,
+                        "TLB entry in the wrong set")
+            self._sets.append(OrderedDict(((process_id, vpn), frame_idx) for process_id, vpn, frame_idx in entries))
+        self._rng.setstate(state['rng'])
+
+
+class AddressTranslator:
+    """
+    Virtual address spaces for the processes of a MemoryManager.
+
+    Each process sees its pages at virtual page numbers 0..n-1 in allocation
+    order, mapped by its own MultiLevelPageTable. Translations go through
+    the shared Tlb first; a miss costs a page walk whose memory references
+    are counted. A reverse map from frame to (process, page) lets the
+    manager unmap a page when its frame is reclaimed by page replacement.
+    """
+
+    def __init__(self, page_size, levels=2, address_bits=32, tlb_entries=64, tlb_ways=4, tlb_policy='LRU'):
+        """
+        Initialize the translator with no processes
+
+        Args:
+            page_size (int): Size of each page in bytes
+            levels (int): Page table levels (1 to MAX_PAGE_TABLE_LEVELS)
+            address_bits (int): Width of virtual addresses
+            tlb_entries (int): Total TLB entries
+            tlb_ways (int): TLB associativity
+            tlb_policy (str): TLB replacement policy (see TLB_POLICIES)
+        """
+        if not 1 <= levels <= MAX_PAGE_TABLE_LEVELS:
+            raise ValueError(f"Page table levels must be between 1 and {MAX_PAGE_TABLE_LEVELS}")
+        max_vpn = ((1 << address_bits) - 1) // page_size if address_bits > 0 else 0
+        if max_vpn < 1:
+            raise ValueError(f"A {address_bits}-bit address space cannot hold pages of {page_size} bytes")
+        self.page_size = page_size
+        self.levels = levels
+        self.address_bits = address_bits
+        self.vpn_bits = max_vpn.bit_length()
+        self.tlb = Tlb(tlb_entries, tlb_ways, tlb_policy)
+
+        self._tables = {}  # process_id -> MultiLevelPageTable
+        self._shared_tables = set()  # Processes whose table a fork also uses
+        self._sizes = {}  # process_id -> pages in its address space
+        self._reverse = {}  # frame_idx -> (process_id, vpn)
+
+        self.translations = 0
+        self.tlb_hits = 0
+        self.page_walks = 0
+        self.walk_references = 0
+        self.cycles = 0
+
+    def copy(self):
+        """
+        Copy the translator for a forked simulation
+
+        Page tables are shared copy-on-write: both translators copy a
+        process's table the first time they change it.
+
+        Returns:
+            AddressTranslator: Independent translator in the same state
+        """
+        clone = AddressTranslator.__new__(AddressTranslator)
+        clone.__dict__.update(self.__dict__)
+        clone.tlb = self.tlb.copy()
+        clone._tables = dict(self._tables)
+        self._shared_tables = set(self._tables)
+        clone._shared_tables = set(self._tables)
+        clone._sizes = dict(self._sizes)
+        clone._reverse = dict(self._reverse)
+        return clone
+
+    def _own_table(self, process_id):
+        """Get a process's table, copying it first if a fork shares it"""
+        if process_id in self._shared_tables:
+            self._shared_tables.discard(process_id)
+            self._tables[process_id] = self._tables[process_id].copy()
+        return self._tables[process_id]
+
+    def add_process(self, process_id, frames):
+        """
+        Create a process's address space with its pages in the given frames
+
+        Args:
+            process_id (int): New process
+            frames (list): Frame of each virtual page, in page order
+        """
+        table = MultiLevelPageTable(self.levels, self.vpn_bits)
+        self._tables[process_id] = table
+        self._sizes[process_id] = len(frames)
+        for vpn, frame_idx in enumerate(frames):
+            table.map(vpn, frame_idx)
+            self._reverse[frame_idx] = (process_id, vpn)
+
+    def remove_process(self, process_id):
+        """
+        Drop a process's address space and its TLB entries
+
+        Args:
+            process_id (int): Process being deallocated
+        """
+        table = self._tables.pop(process_id, None)
+        if table is None:
+            return
+        self._shared_tables.discard(process_id)
+        del self._sizes[process_id]
+        for frame_idx in table.frames():
+            del self._reverse[frame_idx]
+        self.tlb.flush(process_id)
+
+    def map_page(self, process_id, vpn, frame_idx):
+        """
+        Map a page of an existing process after it was loaded into a frame
+
+        Args:
+            process_id (int): Process that owns the page
+            vpn (int): Virtual page number
+            frame_idx (int): Frame the page was loaded into
+        """
+        self._own_table(process_id).map(vpn, frame_idx)
+        self._reverse[frame_idx] = (process_id, vpn)
+
+    def unmap_frame(self, frame_idx):
+        """
+        Unmap the page held by a frame that is being reclaimed
+
+        Args:
+            frame_idx (int): Frame losing its page
+        """
+        owner = self._reverse.pop(frame_idx, None)
+        if owner is None:
+            return
+        process_id, vpn = owner
+        self._own_table(process_id).unmap(vpn)
+        self.tlb.invalidate(process_id, vpn)
+
+    def translate(self, process_id, address):
+        """
+        Translate a virtual address, counting TLB hits and walk cost
+
+        Args:
+            process_id (int): Process issuing the access
+            address (int): Virtual address
+
+        Returns:
+            int: Frame number, or None if the page is not resident
+
+        Raises:
+            ValueError: If the process does not exist or the address is
+                outside its address space
+        """
+        table = self._tables.get(process_id)
+        if table is None:
+            raise ValueError(f"No address space for process {process_id}")
+        vpn = address // self.page_size
+        if address < 0 or vpn >= self._sizes[process_id]:
+            raise ValueError(f"Address {address} is outside the address space of process {process_id}")
+
+        self.translations += 1
+        self.cycles += TLB_HIT_CYCLES
+        frame_idx = self.tlb.lookup(process_id, vpn)
+        if frame_idx is not None:
+            self.tlb_hits += 1
+            return frame_idx
+
+        frame_idx, references = table.walk(vpn)
+        self.page_walks += 1
+        self.walk_references += references
+        self.cycles += references * MEMORY_REFERENCE_CYCLES
+        if frame_idx is not None:
+            self.tlb.insert(process_id, vpn, frame_idx)
+        return frame_idx
+
+    def get_options(self):
+        """
+        Get the constructor options that rebuild this translator's geometry
+
+        Returns:
+            dict: levels, address_bits, tlb_entries, tlb_ways and tlb_policy
+        """
+        return {
+            'levels': self.levels,
+            'address_bits': self.address_bits,
+            'tlb_entries': self.tlb.entries,
+            'tlb_ways': self.tlb.ways,
+            'tlb_policy': self.tlb.policy
+        }
+
+    def get_state(self):
+        """
+        Get the address spaces, TLB and counters as plain data for a snapshot
+
+        Returns:
+            dict: Per process its size and mapped pages, the Tlb state and
+                the translation counters
+        """
+        processes = {}
+        for process_id, table in self._tables.items():
+            mappings = table.mappings()
+            processes[process_id] = (
+                self._sizes[process_id],
+                array('q', [vpn for vpn, _ in mappings]),
+                array('i', [frame_idx for _, frame_idx in mappings])
+            )
+        return {
+            'processes': processes,
+            'tlb': self.tlb.get_state(),
+            'counters': [self.translations, self.tlb_hits, self.page_walks, self.walk_references, self.cycles]
+        }
+
+    def set_state(self, state, total_frames):
+        """
+        Load get_state() data into a translator with the same options
+
+        Args:
+            state (dict): Output of get_state()
+            total_frames (int): Frames the mapped pages may be in
+        """
+        processes = state['processes']
+        require(type(processes) is dict, "invalid address spaces")
+        self._tables = {}
+        self._shared_tables = set()
+        self._sizes = {}
+        self._reverse = {}
+        for process_id, (size, vpns, frames) in processes.items():
+            checked_int(size, 0)
+            require(type(vpns) is array and len(vpns) == len(frame_array(frames, total_frames))
+                    and (not vpns or (min(vpns) >= 0 and max(vpns) < size)), "invalid page mapping")
+            self.add_process(process_id, [])
+            self._sizes[process_id] = size
+            for vpn, frame_idx in zip(vpns, frames):
+                require(frame_idx not in self._reverse, "frame mapped twice")
+                self.map_page(process_id, vpn, frame_idx)
+        self.tlb.set_state(state['tlb'])
+        self.translations, self.tlb_hits, self.page_walks, self.walk_references, self.cycles = (
+            checked_int(counter, 0) for counter in state['counters']
+        )
+
+    def virtual_page_count(self, process_id):
+        """
+        Get the size of a process's address space
+
+        Args:
+            process_id (int): Process
+
+        Returns:
+            int: Number of virtual pages, or 0 if the process does not exist
+        """
+        return self._sizes.get(process_id, 0)
+
+    def get_stats(self):
+        """
+        Get translation counters and configuration
+
+        Returns:
+            dict: TLB hit ratio, page walk counts, simulated cycles and
+                page table memory
+        """
+        translations = self.translations
+        return {
+            'page_table_levels': self.levels,
+            'tlb_entries': self.tlb.entries,
+            'tlb_ways': self.tlb.ways,
+            'tlb_policy': self.tlb.policy,
+            'translations': translations,
+            'tlb_hits': self.tlb_hits,
+            'tlb_misses': translations - self.tlb_hits,
+            'tlb_hit_ratio': self.tlb_hits / translations if translations > 0 else 0,
+            'page_walks': self.page_walks,
+            'walk_references': self.walk_references,
+            'average_walk_references': self.walk_references / self.page_walks if self.page_walks > 0 else 0,
+            'translation_cycles': self.cycles,
+            'average_translation_cycles': self.cycles / translations if translations > 0 else 0,
+            'page_table_nodes': sum(table.node_count for table in self._tables.values())
+        }
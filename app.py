@@ -1,107 +1,650 @@
 import os
+import hmac
+import json
+import uuid
+import hashlib
 import logging
 import webbrowser
 import threading
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, session
 from memory_manager import MemoryManager
-from tutorial_manager import TutorialManager
+from segmentation import FIT_STRATEGIES
+from replacement_policies import REPLACEMENT_ALGORITHMS
+from address_translation import TLB_POLICIES, MAX_PAGE_TABLE_LEVELS
+from tutorial_manager import TutorialManager, TutorialCatalogue
+from simulation_registry import SimulationRegistry, SimulationBusyError
+from logging_config import configure_logging
+from comparison import build_grid, validate_configuration, run_comparison
+from workloads import GENERATORS, generate, stream_addresses
 
 # Uncomment if deploying frontend and backend separately
 # from flask_cors import CORS
 
-logging.basicConfig(filename="app.log", level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
+configure_logging(filename="app.log")
 app = Flask(__name__, static_folder="static", template_folder="templates")
-app.secret_key = os.environ.get("SESSION_SECRET", "memory-visualizer-secret")
+# Development fallback; snapshots are refused while it is in use since
+# anyone can sign with it
+DEFAULT_SESSION_SECRET = "memory-visualizer-secret"
+app.secret_key = os.environ.get("SESSION_SECRET", DEFAULT_SESSION_SECRET)
 
 # CORS(app)  # Uncomment if needed
 
-memory_manager = None
-tutorial_manager = TutorialManager()
+# Upper bound on simulated frames. The frame table costs a few bytes per
+# frame, but full-state responses send a dict per frame: about 10 MB of
+# JSON and 0.35 s to build at this size
+MAX_TOTAL_FRAMES = 256 * 1024
+
+# One simulation per browser session, bounded in count and idle time; a
+# request waits at most SIMULATION_LOCK_TIMEOUT seconds for another
+# request of the same session to finish with it
+simulations = SimulationRegistry(
+    max_simulations=int(os.environ.get("MAX_SIMULATIONS", 100)),
+    ttl_seconds=int(os.environ.get("SIMULATION_TTL", 1800)),
+    lock_timeout=float(os.environ.get("SIMULATION_LOCK_TIMEOUT", 10))
+)
+# Largest grid /api/compare runs in one request, and the processes it may use
+MAX_COMPARE_CONFIGS = int(os.environ.get("MAX_COMPARE_CONFIGS", 64))
+COMPARE_WORKERS = int(os.environ["COMPARE_WORKERS"]) if os.environ.get("COMPARE_WORKERS") else None
+# Largest synthetic workload /api/run_workload generates in one request
+MAX_WORKLOAD_ACCESSES = int(os.environ.get("MAX_WORKLOAD_ACCESSES", 1000000))
+# Longest operation list /api/run_trace, /api/stream and /api/compare accept
+MAX_TRACE_OPERATIONS = int(os.environ.get("MAX_TRACE_OPERATIONS", 1000000))
+WORKLOAD_OPTIONS = ('seed', 'alpha', 'stride', 'start', 'working_set', 'phases')
+# Largest Zipf skew accepted for synthetic workloads
+MAX_WORKLOAD_ALPHA = 10.0
+# Bounds on the update rate clients may request from /api/stream; at least
+# one update a second means a disconnected client is noticed within a second
+MIN_STREAM_UPDATES_PER_SECOND = 1
+MAX_STREAM_UPDATES_PER_SECOND = 30
+# Slowest pacing /api/stream accepts (0 runs unpaced) and the longest a
+# stream may hold its simulation
+MIN_STREAM_OPS_PER_SECOND = 1
+MAX_STREAM_SECONDS = float(os.environ.get("MAX_STREAM_SECONDS", 300))
+# Address translation options accepted by /api/start_simulation, and the TLB size limit
+TRANSLATION_OPTIONS = ('levels', 'address_bits', 'tlb_entries', 'tlb_ways')
+MAX_TLB_ENTRIES = 4096
+# Longest per-process working-set window a simulation may ask to track
+MAX_WORKING_SET_WINDOW = int(os.environ.get("MAX_WORKING_SET_WINDOW", 100000))
+# Largest snapshot /api/restore accepts
+MAX_SNAPSHOT_BYTES = int(os.environ.get("MAX_SNAPSHOT_BYTES", 64 * 1024 * 1024))
+# Tutorial content and its JSON responses, built once at startup
+tutorial_catalogue = TutorialCatalogue()
+# Rendered pages by template name (see _render_cached)
+_page_cache = {}
 # if __name__ == "__main__":
 #     app.run(debug=True, host="127.0.0.1", port=5000)
 
+def _cached_response(body, etag, mimetype='application/json', private=False):
+    """Serve a precomputed body, or 304 if the client's copy is current"""
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.last_modified = tutorial_catalogue.loaded_at
+    response.cache_control.no_cache = True  # Revalidate, then reuse on 304
+    if private:
+        response.cache_control.private = True
+    return response.make_conditional(request)
+
+def _render_cached(template):
+    """
+    Render a page that does not depend on the request once and serve it
+    from memory afterwards. Pages are rendered on every request while
+    templates auto-reload (debug mode) so edits still show up.
+    """
+    page = _page_cache.get(template)
+    if page is None or app.jinja_env.auto_reload:
+        body = render_template(template, tutorials=tutorial_catalogue.get_all())
+        page = _page_cache[template] = (body, hashlib.sha256(body.encode()).hexdigest()[:16])
+    return _cached_response(page[0], page[1], mimetype='text/html')
+
+@app.errorhandler(SimulationBusyError)
+def simulation_busy(e):
+    return jsonify({'status': 'error', 'message': 'The simulation is busy with another request. Try again shortly.'}), 409
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return _render_cached('index.html')
 
 @app.route('/dashboard')
 def dashboard():
-    return render_template('dashboard.html')
+    return _render_cached('dashboard.html')
 
 @app.route('/api/start_simulation', methods=['POST'])
 def start_simulation():
-    global memory_manager
     try:
         if not request.is_json:
             return jsonify({'status': 'error', 'message': 'Invalid request format. Expected JSON.'}), 400
         data = request.json
         technique = data.get('technique', 'paging')
-        if technique not in ['paging', 'segmentation']:
+        if technique not in ['paging', 'segmentation', 'buddy']:
             return jsonify({'status': 'error', 'message': 'Invalid technique.'}), 400
         memory_size = int(data.get('memory_size', 1024))
         page_size = int(data.get('page_size', 64))
         algorithm = data.get('algorithm', 'FIFO')
-        if algorithm not in ['FIFO', 'LRU']:
+        if algorithm not in REPLACEMENT_ALGORITHMS:
             return jsonify({'status': 'error', 'message': 'Invalid algorithm.'}), 400
-        if memory_size <= 0 or memory_size > 4096:
+        fit = data.get('fit', 'first')
+        if fit not in FIT_STRATEGIES:
+            return jsonify({'status': 'error', 'message': 'Invalid fit strategy.'}), 400
+        if memory_size <= 0:
             return jsonify({'status': 'error', 'message': 'Invalid memory size.'}), 400
         if page_size <= 0 or page_size > 512:
             return jsonify({'status': 'error', 'message': 'Invalid page size.'}), 400
         if memory_size % page_size != 0:
             return jsonify({'status': 'error', 'message': 'Memory size must be a multiple of page size.'}), 400
+        if memory_size // page_size > MAX_TOTAL_FRAMES:
+            return jsonify({'status': 'error', 'message': f'Memory size exceeds {MAX_TOTAL_FRAMES} frames.'}), 400
+
+        # Optional virtual addressing: {"levels": 2, "tlb_entries": 64, "tlb_ways": 4, "tlb_policy": "LRU"}
+        translation = data.get('translation')
+        if translation is not None:
+            if not isinstance(translation, dict):
+                return jsonify({'status': 'error', 'message': '"translation" must be an object.'}), 400
+            options = {key: int(translation[key]) for key in TRANSLATION_OPTIONS if key in translation}
+            options['tlb_policy'] = translation.get('tlb_policy', 'LRU')
+            if options['tlb_policy'] not in TLB_POLICIES:
+                return jsonify({'status': 'error', 'message': 'Invalid TLB policy.'}), 400
+            if not 1 <= options.get('levels', 2) <= MAX_PAGE_TABLE_LEVELS:
+                return jsonify({'status': 'error', 'message': 'Invalid number of page table levels.'}), 400
+            if not 1 <= options.get('address_bits', 32) <= 64:
+                return jsonify({'status': 'error', 'message': 'Invalid virtual address width.'}), 400
+            tlb_entries = options.get('tlb_entries', 64)
+            tlb_ways = options.get('tlb_ways', 4)
+            if not 0 < tlb_entries <= MAX_TLB_ENTRIES or tlb_ways <= 0 or tlb_entries % tlb_ways:
+                return jsonify({'status': 'error', 'message': 'TLB entries must be a multiple of its ways.'}), 400
+            translation = options
+
+        # Optional analyses, off unless asked for since they add work to every access
+        stack_analysis = data.get('stack_analysis', False)
+        if not isinstance(stack_analysis, bool):
+            return jsonify({'status': 'error', 'message': '"stack_analysis" must be true or false.'}), 400
+        working_set_window = data.get('working_set_window')
+        if working_set_window is not None and (type(working_set_window) is not int
+                                               or not 0 < working_set_window <= MAX_WORKING_SET_WINDOW):
+            return jsonify({'status': 'error', 'message': f'Working set window must be between 1 and {MAX_WORKING_SET_WINDOW}.'}), 400
 
         memory_manager = MemoryManager(
             technique=technique,
             memory_size=memory_size,
             page_size=page_size,
-            algorithm=algorithm
+            algorithm=algorithm,
+            fit=fit,
+            stack_analysis=stack_analysis,
+            translation=translation,
+            working_set_window=working_set_window
         )
+        if 'simulation_id' not in session:
+            session['simulation_id'] = uuid.uuid4().hex
+        simulations.put(session['simulation_id'], memory_manager)
         initial_state = memory_manager.get_current_state()
-        analytics = memory_manager.get_analytics() if hasattr(memory_manager, "get_analytics") else {}
+        analytics = memory_manager.get_analytics()
         return jsonify({'status': 'success', 'message': 'Simulation started successfully', 'initial_state': initial_state, 'analytics': analytics})
     except Exception as e:
-        logging.error(f"Unexpected error in start_simulation: {str(e)}")
+        logging.error("Unexpected error in start_simulation: %s", e)
         return jsonify({'status': 'error', 'message': 'An unexpected error occurred'}), 500
 
 @app.route('/api/next_step', methods=['POST'])
 def next_step():
-    global memory_manager
-    if not memory_manager:
-        return jsonify({'status': 'error', 'message': 'No active simulation. Please start a simulation first.'}), 400
+    with simulations.use(session.get('simulation_id')) as memory_manager:
+        if not memory_manager:
+            return jsonify({'status': 'error', 'message': 'No active simulation. Please start a simulation first.'}), 400
+        try:
+            data = request.json
+            if not data:
+                return jsonify({'status': 'error', 'message': 'Invalid request: No JSON data provided'}), 400
+            operation = data.get('operation')
+            if not operation:
+                return jsonify({'status': 'error', 'message': 'Missing "operation" parameter'}), 400
+            size = data.get('size', 64) if operation == 'allocate' else None
+            if operation == 'allocate' and not _valid_size(size):
+                return jsonify({'status': 'error', 'message': 'Size must be a positive integer.'}), 400
+            address = int(data.get('address', 0)) if operation in ['deallocate', 'access'] else None
+            # An access with a process ID is to that process's virtual address space
+            process_id = data.get('process_id') if operation == 'access' else None
+
+            memory_manager.process_operation(operation, size=size, address=address, process_id=process_id)
+
+            # Clients that send the last version they applied get only the changes
+            since_version = data.get('since_version')
+            if since_version is not None:
+                state = memory_manager.get_state_delta(int(since_version))
+            else:
+                state = memory_manager.get_current_state()
+            analytics = memory_manager.get_analytics()
+            return jsonify({'status': 'success', 'state': state, 'analytics': analytics})
+        except Exception as e:
+            logging.error("Error in next_step: %s", e)
+            return jsonify({'status': 'error', 'message': f'Error processing step: {str(e)}'}), 500
+
+@app.route('/api/run_trace', methods=['POST'])
+def run_trace():
+    with simulations.use(session.get('simulation_id')) as memory_manager:
+        if not memory_manager:
+            return jsonify({'status': 'error', 'message': 'No active simulation. Please start a simulation first.'}), 400
+        try:
+            data = request.json
+            if not data:
+                return jsonify({'status': 'error', 'message': 'Invalid request: No JSON data provided'}), 400
+            operations = data.get('operations')
+            error = _operations_error(operations)
+            if error:
+                return jsonify({'status': 'error', 'message': error}), 400
+            snapshot_interval = int(data.get('snapshot_interval', 0))
+            if snapshot_interval < 0:
+                return jsonify({'status': 'error', 'message': 'Invalid snapshot interval.'}), 400
+
+            trace_result = memory_manager.run_trace(operations, snapshot_interval=snapshot_interval)
+            return jsonify({'status': 'success', **trace_result})
+        except Exception as e:
+            logging.error("Error in run_trace: %s", e)
+            return jsonify({'status': 'error', 'message': f'Error running trace: {str(e)}'}), 500
+
+@app.route('/api/run_workload', methods=['POST'])
+def run_workload():
+    with simulations.use(session.get('simulation_id')) as memory_manager:
+        if not memory_manager:
+            return jsonify({'status': 'error', 'message': 'No active simulation. Please start a simulation first.'}), 400
+        try:
+            data = request.json
+            if not data:
+                return jsonify({'status': 'error', 'message': 'Invalid request: No JSON data provided'}), 400
+            workload = data.get('workload')
+            if workload not in GENERATORS:
+                return jsonify({'status': 'error', 'message': 'Invalid workload.'}), 400
+            count = int(data.get('count', 10000))
+            if count <= 0 or count > MAX_WORKLOAD_ACCESSES:
+                return jsonify({'status': 'error', 'message': f'Count must be between 1 and {MAX_WORKLOAD_ACCESSES}.'}), 400
+            num_pages = int(data.get('num_pages', memory_manager.total_frames))
+            if not 0 < num_pages <= MAX_TOTAL_FRAMES:
+                return jsonify({'status': 'error', 'message': f'Number of pages must be between 1 and {MAX_TOTAL_FRAMES}.'}), 400
+            try:
+                options = _workload_options(data, count)
+            except ValueError as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 400
+
+            try:
+                addresses = generate(workload, count, num_pages, page_size=memory_manager.page_size, **options)
+            except TypeError as e:
+                return jsonify({'status': 'error', 'message': f'Invalid workload options: {str(e)}'}), 400
+            trace_result = memory_manager.replay_accesses(stream_addresses(addresses))
+            state = memory_manager.get_current_state()
+            analytics = memory_manager.get_analytics()
+            return jsonify({'status': 'success', **trace_result, 'state': state, 'analytics': analytics})
+        except Exception as e:
+            logging.error("Error in run_workload: %s", e)
+            return jsonify({'status': 'error', 'message': f'Error running workload: {str(e)}'}), 500
+
+def _workload_options(params, count):
+    """
+    Parse the generator options of a workload request and check their ranges
+
+    Generators allocate arrays sized by some options (one entry per phase),
+    so every numeric option is bounded.
+
+    Args:
+        params (dict): Request parameters
+        count (int): Number of accesses requested
+
+    Returns:
+        dict: Options to pass to generate()
+
+    Raises:
+        ValueError: If an option is not a number or out of range
+    """
+    limits = {
+        'seed': (0, 2 ** 63 - 1),
+        'alpha': (0, MAX_WORKLOAD_ALPHA),
+        'stride': (-MAX_TOTAL_FRAMES, MAX_TOTAL_FRAMES),
+        'start': (0, MAX_TOTAL_FRAMES),
+        'working_set': (1, MAX_TOTAL_FRAMES),
+        'phases': (1, count),
+    }
+    options = {}
+    for key in WORKLOAD_OPTIONS:
+        if key not in params:
+            continue
+        try:
+            value = float(params[key]) if key == 'alpha' else int(params[key])
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid workload option "{key}".')
+        low, high = limits[key]
+        if not low <= value <= high:
+            raise ValueError(f'Workload option "{key}" must be between {low} and {high}.')
+        options[key] = value
+    return options
+
+def _valid_size(size):
+    """
+    Check an allocation size sent by a client
+
+    Args:
+        size: Requested size in bytes
+
+    Returns:
+        bool: True if the size is a positive integer
+    """
+    return type(size) is int and size > 0
+
+def _operations_error(operations):
+    """
+    Check a list of operations sent to replay
+
+    Args:
+        operations: The "operations" request value
+
+    Returns:
+        str: What is wrong with the operations, or None if they are valid
+    """
+    if not isinstance(operations, list):
+        return '"operations" must be a list of operation objects'
+    if len(operations) > MAX_TRACE_OPERATIONS:
+        return f'Traces are limited to {MAX_TRACE_OPERATIONS} operations.'
+    if not all(isinstance(op, dict) for op in operations):
+        return '"operations" must be a list of operation objects'
+    for op in operations:
+        if op.get('operation', op.get('type')) == 'allocate' and not _valid_size(op.get('size', 64)):
+            return 'Allocation sizes must be positive integers.'
+    return None
+
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/stream', methods=['GET', 'POST'])
+def stream():
+    # EventSource clients send parameters in the query string; clients that
+    # upload a trace POST it as JSON and read the event stream from the body
+    params = request.args if request.method == 'GET' else (request.get_json(silent=True) or {})
+    try:
+        updates_per_second = float(params.get('updates_per_second', 10))
+        ops_per_second = float(params.get('ops_per_second', 0))
+        since_version = params.get('since_version')
+        since_version = int(since_version) if since_version not in (None, '') else None
+        operations = params.get('operations') if request.method == 'POST' else None
+        workload = params.get('workload')
+        count = int(params.get('count', 10000))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'Invalid stream parameters.'}), 400
+
+    if not MIN_STREAM_UPDATES_PER_SECOND <= updates_per_second <= MAX_STREAM_UPDATES_PER_SECOND:
+        return jsonify({'status': 'error', 'message': f'Updates per second must be between {MIN_STREAM_UPDATES_PER_SECOND} and {MAX_STREAM_UPDATES_PER_SECOND}.'}), 400
+    if ops_per_second != 0 and not ops_per_second >= MIN_STREAM_OPS_PER_SECOND:
+        return jsonify({'status': 'error', 'message': f'Operations per second must be 0 (unpaced) or at least {MIN_STREAM_OPS_PER_SECOND}.'}), 400
+    if operations is not None:
+        error = _operations_error(operations)
+        if error:
+            return jsonify({'status': 'error', 'message': error}), 400
+    elif workload not in GENERATORS:
+        return jsonify({'status': 'error', 'message': 'Provide "operations" or a valid "workload".'}), 400
+    elif count <= 0 or count > MAX_WORKLOAD_ACCESSES:
+        return jsonify({'status': 'error', 'message': f'Count must be between 1 and {MAX_WORKLOAD_ACCESSES}.'}), 400
+    try:
+        options = _workload_options(params, count)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    simulation_id = session.get('simulation_id')
+
+    def events():
+        # The simulation stays locked until the run ends, the client goes
+        # away or MAX_STREAM_SECONDS pass
+        try:
+            with simulations.use(simulation_id) as memory_manager:
+                if not memory_manager:
+                    yield _sse_event('error', {'message': 'No active simulation. Please start a simulation first.'})
+                    return
+                try:
+                    ops = operations
+                    if ops is None:
+                        addresses = generate(workload, count, memory_manager.total_frames,
+                                             page_size=memory_manager.page_size, **options)
+                        ops = ({'operation': 'access', 'address': address} for address in stream_addresses(addresses))
+                    for update in memory_manager.stream_trace(ops, max_updates_per_second=updates_per_second,
+                                                              since_version=since_version,
+                                                              max_ops_per_second=ops_per_second,
+                                                              max_seconds=MAX_STREAM_SECONDS):
+                        yield _sse_event('done' if update['done'] else 'update', update)
+                except Exception as e:
+                    logging.error("Error in stream: %s", e)
+                    yield _sse_event('error', {'message': f'Error running stream: {str(e)}'})
+        except SimulationBusyError:
+            yield _sse_event('error', {'message': 'The simulation is busy with another request. Try again shortly.'})
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/operations', methods=['GET'])
+def operations_page():
+    with simulations.use(session.get('simulation_id')) as memory_manager:
+        if not memory_manager:
+            return jsonify({'status': 'error', 'message': 'No active simulation. Please start a simulation first.'}), 400
+        try:
+            start = int(request.args.get('start', 0))
+            count = int(request.args.get('count', 100))
+            if start < 0 or count <= 0 or count > 1000:
+                return jsonify({'status': 'error', 'message': 'Invalid operation range.'}), 400
+            operations = memory_manager.operations.page(start, count)
+            return jsonify({'status': 'success', 'operations': operations, 'total': memory_manager.operations.total})
+        except Exception as e:
+            logging.error("Error in operations_page: %s", e)
+            return jsonify({'status': 'error', 'message': f'Error reading operations: {str(e)}'}), 500
+
+@app.route('/api/lru_curve', methods=['GET'])
+def lru_curve():
+    with simulations.use(session.get('simulation_id')) as memory_manager:
+        if not memory_manager:
+            return jsonify({'status': 'error', 'message': 'No active simulation. Please start a simulation first.'}), 400
+        try:
+            points = int(request.args.get('points', 100))
+            if points <= 0:
+                return jsonify({'status': 'error', 'message': 'Invalid number of points.'}), 400
+            curve = memory_manager.get_lru_curve(max_points=points)
+            if curve is None:
+                return jsonify({'status': 'error', 'message': 'Stack distance analysis is not enabled.'}), 400
+            return jsonify({'status': 'success', 'curve': curve})
+        except Exception as e:
+            logging.error("Error in lru_curve: %s", e)
+            return jsonify({'status': 'error', 'message': f'Error computing LRU curve: {str(e)}'}), 500
+
+def _snapshot_signature(data):
+    return hmac.new(app.secret_key.encode(), data, hashlib.sha256).digest()
+
+def _snapshots_disabled():
+    """Error response while the session secret is the public default, or None"""
+    if app.secret_key == DEFAULT_SESSION_SECRET:
+        return jsonify({'status': 'error', 'message': 'Snapshots are disabled until SESSION_SECRET is configured.'}), 403
+    return None
+
+@app.route('/api/snapshot', methods=['GET'])
+def snapshot():
+    disabled = _snapshots_disabled()
+    if disabled:
+        return disabled
+    with simulations.use(session.get('simulation_id')) as memory_manager:
+        if not memory_manager:
+            return jsonify({'status': 'error', 'message': 'No active simulation. Please start a simulation first.'}), 400
+        try:
+            data = memory_manager.snapshot()
+            filename = f"simulation-{memory_manager.memory_accesses}.mmsnap"
+        except Exception as e:
+            logging.error("Error in snapshot: %s", e)
+            return jsonify({'status': 'error', 'message': f'Error taking snapshot: {str(e)}'}), 500
+
+    # Snapshots are signed and only signed ones are accepted back, so a
+    # restore only ever loads state this server produced
+    return Response(_snapshot_signature(data) + data, mimetype='application/octet-stream',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+@app.route('/api/restore', methods=['POST'])
+def restore():
+    disabled = _snapshots_disabled()
+    if disabled:
+        return disabled
+    try:
+        if request.content_length is not None and request.content_length > MAX_SNAPSHOT_BYTES:
+            return jsonify({'status': 'error', 'message': f'Snapshot exceeds {MAX_SNAPSHOT_BYTES} bytes.'}), 400
+        # Either a multipart upload ("snapshot" field) or the raw file as the body
+        upload = request.files.get('snapshot')
+        blob = upload.read(MAX_SNAPSHOT_BYTES + 1) if upload else request.get_data()
+        if len(blob) > MAX_SNAPSHOT_BYTES:
+            return jsonify({'status': 'error', 'message': f'Snapshot exceeds {MAX_SNAPSHOT_BYTES} bytes.'}), 400
+
+        signature_size = hashlib.sha256().digest_size
+        signature, data = blob[:signature_size], blob[signature_size:]
+        if len(signature) < signature_size or not hmac.compare_digest(signature, _snapshot_signature(data)):
+            return jsonify({'status': 'error', 'message': 'Invalid or tampered snapshot.'}), 400
+        memory_manager = MemoryManager.restore(data)
+        if memory_manager.total_frames > MAX_TOTAL_FRAMES:
+            return jsonify({'status': 'error', 'message': f'Memory size exceeds {MAX_TOTAL_FRAMES} frames.'}), 400
+
+        if 'simulation_id' not in session:
+            session['simulation_id'] = uuid.uuid4().hex
+        simulations.put(session['simulation_id'], memory_manager)
+        state = memory_manager.get_current_state()
+        analytics = memory_manager.get_analytics()
+        return jsonify({'status': 'success', 'message': 'Simulation restored successfully', 'state': state, 'analytics': analytics})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        logging.error("Error in restore: %s", e)
+        return jsonify({'status': 'error', 'message': f'Error restoring snapshot: {str(e)}'}), 500
+
+@app.route('/api/compare', methods=['POST'])
+def compare():
     try:
         data = request.json
         if not data:
             return jsonify({'status': 'error', 'message': 'Invalid request: No JSON data provided'}), 400
-        operation = data.get('operation')
-        if not operation:
-            return jsonify({'status': 'error', 'message': 'Missing "operation" parameter'}), 400
-        size = int(data.get('size', 64)) if operation == 'allocate' else None
-        address = int(data.get('address', 0)) if operation in ['deallocate', 'access'] else None
-
-        # Call the relevant method on memory_manager, e.g.:
-        # result = memory_manager.allocate(size) if operation == 'allocate' else ...
-        # For now, let's assume you have a method memory_manager.process_operation(...)
-        if hasattr(memory_manager, "process_operation"):
-            memory_manager.process_operation(operation, size=size, address=address)
-        state = memory_manager.get_current_state()
-        analytics = memory_manager.get_analytics() if hasattr(memory_manager, "get_analytics") else {}
-        return jsonify({'status': 'success', 'state': state, 'analytics': analytics})
+        operations = data.get('operations')
+        error = _operations_error(operations)
+        if error:
+            return jsonify({'status': 'error', 'message': error}), 400
+        grid = data.get('grid', {})
+        if not isinstance(grid, dict):
+            return jsonify({'status': 'error', 'message': '"grid" must map parameter names to lists of values'}), 400
+
+        try:
+            configs = build_grid(grid, max_configs=MAX_COMPARE_CONFIGS)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        for config in configs:
+            error = validate_configuration(config, max_frames=MAX_TOTAL_FRAMES)
+            if error:
+                return jsonify({'status': 'error', 'message': error}), 400
+
+        rows = run_comparison(operations, configs, max_workers=COMPARE_WORKERS)
+        return jsonify({'status': 'success', 'results': rows})
     except Exception as e:
-        logging.error(f"Error in next_step: {str(e)}")
-        return jsonify({'status': 'error', 'message': f'Error processing step: {str(e)}'}), 500
+        logging.error("Error in compare: %s", e)
+        return jsonify({'status': 'error', 'message': f'Error running comparison: {str(e)}'}), 500
 
 @app.route('/api/reset_simulation', methods=['POST'])
 def reset_simulation():
-    global memory_manager
-    memory_manager = None
+    simulations.remove(session.get('simulation_id'))
     return jsonify({'status': 'success', 'message': 'Simulation reset successfully'})
 
-# Add any additional endpoints, e.g. for tutorials, as needed
 @app.route('/tutorials')
 def tutorials_page():
-    # If your TutorialManager has a method to fetch tutorials, use it.
-    tutorials = tutorial_manager.get_all() if hasattr(tutorial_manager, "get_all") else []
-    return render_template('tutorials.html', tutorials=tutorials)
+    return _render_cached('tutorials.html')
+
+def _tutorial_manager():
+    """Get a TutorialManager holding this session's tutorial progress"""
+    manager = TutorialManager(tutorial_catalogue.tutorials)
+    manager.set_progress(session.get('tutorial_progress'))
+    return manager
+
+def _tutorial_step_response(manager):
+    """
+    Save the session's progress and serve its current step from the catalogue.
+    A step with a configuration starts a fresh simulation with it, laid over
+    the tutorial's first step (so a step can change only the algorithm),
+    and the response carries that simulation's state as its memory_state.
+    """
+    session['tutorial_progress'] = manager.get_progress()
+    steps = manager.tutorials[manager.current_tutorial]['steps']
+    step_json = tutorial_catalogue.step_json(manager.current_tutorial, manager.current_step)
+    config = steps[manager.current_step]['config']
+    if not config:
+        return Response('{"status": "success", "tutorial_step": ' + step_json + '}', mimetype='application/json')
+
+    memory_manager = MemoryManager(**{**steps[0]['config'], **config})
+    if 'simulation_id' not in session:
+        session['simulation_id'] = uuid.uuid4().hex
+    simulations.put(session['simulation_id'], memory_manager)
+    step = json.loads(step_json)
+    step['memory_state'] = memory_manager.get_current_state()
+    return jsonify({'status': 'success', 'tutorial_step': step})
+
+@app.route('/api/tutorials', methods=['GET'])
+def list_tutorials():
+    completed = session.get('tutorial_progress', {}).get('completed', [])
+    # The list differs per user only in which tutorials they completed
+    etag = tutorial_catalogue.etag + '-' + hashlib.sha256(' '.join(completed).encode()).hexdigest()[:8]
+    body = '{"status": "success", "tutorials": ' + tutorial_catalogue.list_json(completed) + '}'
+    return _cached_response(body, etag, private=True)
+
+@app.route('/api/tutorials/<tutorial_id>/steps/<int:step_index>', methods=['GET'])
+def tutorial_step(tutorial_id, step_index):
+    try:
+        step_json = tutorial_catalogue.step_json(tutorial_id, step_index)
+    except KeyError:
+        return jsonify({'status': 'error', 'message': f'Tutorial step {tutorial_id}/{step_index} not found'}), 404
+    return _cached_response('{"status": "success", "tutorial_step": ' + step_json + '}', tutorial_catalogue.etag)
+
+@app.route('/api/tutorials/start', methods=['POST'])
+def start_tutorial():
+    try:
+        data = request.get_json(silent=True) or {}
+        manager = _tutorial_manager()
+        result = manager.start_tutorial(data.get('tutorial_id'))
+        if result['error']:
+            return jsonify({'status': 'error', 'message': result['message']}), 404
+        return _tutorial_step_response(manager)
+    except Exception as e:
+        logging.error("Error in start_tutorial: %s", e)
+        return jsonify({'status': 'error', 'message': f'Error starting tutorial: {str(e)}'}), 500
+
+@app.route('/api/tutorials/next', methods=['POST'])
+def next_tutorial_step():
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Invalid request: expected a JSON object'}), 400
+        operation_data = data.get('operation_data')
+        if operation_data is not None and not isinstance(operation_data, dict):
+            return jsonify({'status': 'error', 'message': '"operation_data" must be an object'}), 400
+        manager = _tutorial_manager()
+        if operation_data is not None and not manager.verify_step_completed(operation_data):
+            return jsonify({'status': 'error', 'message': 'That operation does not complete this step.'}), 400
+        result = manager.next_step()
+        if result.get('error'):
+            return jsonify({'status': 'error', 'message': result['message']}), 400
+        if result.get('completed'):
+            session['tutorial_progress'] = manager.get_progress()
+            return jsonify({'status': 'success', 'completed': True, 'message': result['message']})
+        return _tutorial_step_response(manager)
+    except Exception as e:
+        logging.error("Error in next_tutorial_step: %s", e)
+        return jsonify({'status': 'error', 'message': f'Error advancing tutorial: {str(e)}'}), 500
+
+@app.route('/api/tutorials/previous', methods=['POST'])
+def previous_tutorial_step():
+    try:
+        manager = _tutorial_manager()
+        result = manager.previous_step()
+        if result['error']:
+            return jsonify({'status': 'error', 'message': result['message']}), 400
+        return _tutorial_step_response(manager)
+    except Exception as e:
+        logging.error("Error in previous_tutorial_step: %s", e)
+        return jsonify({'status': 'error', 'message': f'Error going back: {str(e)}'}), 500
+
+@app.route('/api/tutorials/end', methods=['POST'])
+def end_tutorial():
+    manager = _tutorial_manager()
+    result = manager.end_tutorial()
+    session['tutorial_progress'] = manager.get_progress()
+    if result['error']:
+        return jsonify({'status': 'error', 'message': result['message']}), 400
+    return jsonify({'status': 'success', 'message': result['message']})
 
 
 def open_in_browser(url, delay=1.0):
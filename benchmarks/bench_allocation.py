@@ -0,0 +1,78 @@
+"""
+Allocation latency benchmark for the Memory Management Visualizer
+Shows that allocate/deallocate cost stays flat as the frame count grows
+"""
+import os
+import sys
+import logging
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_manager import MemoryManager
+
+FRAME_COUNTS = [256, 1024, 4096, 16384, 65536]
+PAGE_SIZE = 64
+PAGES_PER_ALLOCATION = 4
+OPERATIONS = 2000
+
+
+def build_half_full_manager(total_frames):
+    """
+    Create a manager whose memory is half allocated, in small processes
+
+    Args:
+        total_frames (int): Number of frames in the simulated memory
+
+    Returns:
+        MemoryManager: Prepared memory manager
+    """
+    manager = MemoryManager(memory_size=total_frames * PAGE_SIZE, page_size=PAGE_SIZE)
+    for _ in range(total_frames // (2 * PAGES_PER_ALLOCATION)):
+        manager.allocate_memory(PAGES_PER_ALLOCATION * PAGE_SIZE)
+    return manager
+
+
+def bench_allocate_deallocate(total_frames):
+    """
+    Time allocations into free memory and the matching deallocations
+
+    Args:
+        total_frames (int): Number of frames in the simulated memory
+
+    Returns:
+        tuple: Mean (allocate, deallocate) latency in microseconds
+    """
+    manager = build_half_full_manager(total_frames)
+    size = PAGES_PER_ALLOCATION * PAGE_SIZE
+    batch = max(1, manager.memory.free_count // PAGES_PER_ALLOCATION)
+
+    allocate_seconds = 0.0
+    deallocate_seconds = 0.0
+    done = 0
+    while done < OPERATIONS:
+        start = timeit.default_timer()
+        addresses = [manager.allocate_memory(size) for _ in range(batch)]
+        allocate_seconds += timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        for address in addresses:
+            manager.deallocate_memory(address)
+        deallocate_seconds += timeit.default_timer() - start
+        done += batch
+
+    return allocate_seconds / done * 1e6, deallocate_seconds / done * 1e6
+
+
+def main():
+    # Per-op logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'frames':>8}  {'allocate (us)':>14}  {'deallocate (us)':>16}")
+    for total_frames in FRAME_COUNTS:
+        allocate_us, deallocate_us = bench_allocate_deallocate(total_frames)
+        print(f"{total_frames:>8}  {allocate_us:>14.2f}  {deallocate_us:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
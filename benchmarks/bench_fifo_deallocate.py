@@ -0,0 +1,59 @@
+"""
+FIFO deallocation benchmark for the Memory Management Visualizer
+Frees large multi-frame processes while the FIFO queue is full
+"""
+import os
+import sys
+import logging
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_manager import MemoryManager
+
+FRAME_COUNTS = [1024, 4096, 16384, 65536]
+PAGE_SIZE = 64
+PAGES_PER_PROCESS = 64
+ROUNDS = 3
+
+
+def bench_free_full_queue(total_frames):
+    """
+    Fill memory with large processes, then free and re-allocate each one
+
+    Args:
+        total_frames (int): Number of frames in the simulated memory
+
+    Returns:
+        float: Mean deallocation latency per freed frame in microseconds
+    """
+    manager = MemoryManager(memory_size=total_frames * PAGE_SIZE, page_size=PAGE_SIZE, algorithm='FIFO')
+    size = PAGES_PER_PROCESS * PAGE_SIZE
+    addresses = [manager.allocate_memory(size) for _ in range(total_frames // PAGES_PER_PROCESS)]
+
+    seconds = 0.0
+    freed_frames = 0
+    for _ in range(ROUNDS):
+        for i, address in enumerate(addresses):
+            start = timeit.default_timer()
+            manager.deallocate_memory(address)
+            seconds += timeit.default_timer() - start
+            freed_frames += PAGES_PER_PROCESS
+
+            # Keep the queue full for the next deallocation
+            addresses[i] = manager.allocate_memory(size)
+
+    return seconds / freed_frames * 1e6
+
+
+def main():
+    # Per-op logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'frames':>8}  {'free per frame (us)':>20}")
+    for total_frames in FRAME_COUNTS:
+        print(f"{total_frames:>8}  {bench_free_full_queue(total_frames):>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Logging overhead benchmark for the Memory Management Visualizer
+Measures per-operation cost of the simulator under each logging mode
+"""
+import os
+import sys
+import random
+import logging
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logging_config import LOG_MODES, configure_logging
+from memory_manager import MemoryManager
+
+TOTAL_FRAMES = 1024
+PAGE_SIZE = 64
+OPERATIONS = 50000
+SEED = 42
+
+
+def generate_workload():
+    """
+    Build a reproducible mix of allocations (10%) and accesses (90%)
+
+    Returns:
+        list: ('allocate', size) / ('access', address) steps
+    """
+    rng = random.Random(SEED)
+    return [
+        ('allocate', rng.randint(1, 8 * PAGE_SIZE)) if rng.random() < 0.1
+        else ('access', rng.randrange(TOTAL_FRAMES * PAGE_SIZE))
+        for _ in range(OPERATIONS)
+    ]
+
+
+def run_workload(workload):
+    """
+    Replay the workload on a fresh LRU simulation
+
+    Args:
+        workload (list): Steps from generate_workload()
+
+    Returns:
+        float: Mean microseconds per operation
+    """
+    manager = MemoryManager(memory_size=TOTAL_FRAMES * PAGE_SIZE, page_size=PAGE_SIZE, algorithm='LRU')
+    start = timeit.default_timer()
+    for kind, value in workload:
+        if kind == 'allocate':
+            manager.allocate_memory(value)
+        else:
+            manager.access_memory(value)
+    return (timeit.default_timer() - start) / len(workload) * 1e6
+
+
+def main():
+    workload = generate_workload()
+    log_dir = tempfile.mkdtemp()
+
+    print(f"{'mode':<10}  {'per op (us)':>11}  {'log size (KB)':>13}")
+    for mode in LOG_MODES:
+        filename = os.path.join(log_dir, f"{mode}.log")
+        configure_logging(mode, filename=filename)
+        per_op = run_workload(workload)
+        logging.getLogger().handlers[0].flush()
+        size_kb = os.path.getsize(filename) / 1024
+        print(f"{mode:<10}  {per_op:>11.2f}  {size_kb:>13.0f}")
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'disabled':<10}  {run_workload(workload):>11.2f}  {0:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Benchmark suite for the Memory Management Visualizer
+Runs every simulator benchmark and writes the results as JSON
+
+Usage:
+    python benchmarks/run_suite.py --output results.json
+    python benchmarks/run_suite.py --quick --compare results.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import subprocess
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_manager import MemoryManager
+from bench_allocation import bench_allocate_deallocate
+from bench_techniques import CONFIGURATIONS, generate_workload, run_workload
+
+PAGE_SIZE = 64
+SEED = 42
+
+FRAME_COUNTS = [1024, 16384, 262144]
+QUICK_FRAME_COUNTS = [1024, 16384]
+ALGORITHMS = ['FIFO', 'LRU']
+ACCESSES = 50000
+REPLACEMENTS = 5000
+STATE_REPEATS = 5
+
+# Metrics where a larger value is a regression
+LOWER_IS_BETTER = ('allocate_us', 'deallocate_us', 'access_us', 'replace_us', 'state_ms', 'json_ms', 'delta_ms')
+
+
+def bench_access(total_frames, algorithm):
+    """
+    Time random accesses to a half-allocated memory (about half fault)
+
+    Args:
+        total_frames (int): Number of frames
+        algorithm (str): Replacement algorithm
+
+    Returns:
+        dict: Mean access latency in microseconds and the hit ratio
+    """
+    manager = MemoryManager(memory_size=total_frames * PAGE_SIZE, page_size=PAGE_SIZE, algorithm=algorithm)
+    manager.allocate_memory(total_frames // 2 * PAGE_SIZE)
+    rng = random.Random(SEED)
+    addresses = [rng.randrange(total_frames * PAGE_SIZE) for _ in range(ACCESSES)]
+
+    start = timeit.default_timer()
+    for address in addresses:
+        manager.access_memory(address)
+    seconds = timeit.default_timer() - start
+    return {'access_us': seconds / ACCESSES * 1e6, 'hit_ratio': manager.page_hits / manager.memory_accesses}
+
+
+def bench_replacement(total_frames, algorithm):
+    """
+    Time single-page allocations into full memory, each evicting a page
+
+    Args:
+        total_frames (int): Number of frames
+        algorithm (str): Replacement algorithm
+
+    Returns:
+        dict: Mean allocation latency in microseconds, replacement included
+    """
+    manager = MemoryManager(memory_size=total_frames * PAGE_SIZE, page_size=PAGE_SIZE, algorithm=algorithm)
+    for _ in range(total_frames):
+        manager.allocate_memory(PAGE_SIZE)
+    rng = random.Random(SEED)
+    for _ in range(min(ACCESSES, total_frames)):
+        manager.access_memory(rng.randrange(total_frames * PAGE_SIZE))
+
+    start = timeit.default_timer()
+    for _ in range(REPLACEMENTS):
+        manager.allocate_memory(PAGE_SIZE)
+    seconds = timeit.default_timer() - start
+    return {'replace_us': seconds / REPLACEMENTS * 1e6}
+
+
+def bench_state(total_frames):
+    """
+    Time building and serializing the full state, and a one-step delta
+
+    Args:
+        total_frames (int): Number of frames
+
+    Returns:
+        dict: Milliseconds for get_current_state(), json.dumps of it and
+            get_state_delta() after one allocation, plus the JSON size
+    """
+    manager = MemoryManager(memory_size=total_frames * PAGE_SIZE, page_size=PAGE_SIZE)
+    for _ in range(total_frames // 8):
+        manager.allocate_memory(4 * PAGE_SIZE)
+
+    state_seconds = json_seconds = delta_seconds = float('inf')
+    for _ in range(STATE_REPEATS):
+        start = timeit.default_timer()
+        state = manager.get_current_state()
+        state_seconds = min(state_seconds, timeit.default_timer() - start)
+
+        start = timeit.default_timer()
+        payload = json.dumps(state)
+        json_seconds = min(json_seconds, timeit.default_timer() - start)
+
+        manager.allocate_memory(PAGE_SIZE)
+        start = timeit.default_timer()
+        manager.get_state_delta(state['version'])
+        delta_seconds = min(delta_seconds, timeit.default_timer() - start)
+
+    return {
+        'state_ms': state_seconds * 1e3,
+        'json_ms': json_seconds * 1e3,
+        'delta_ms': delta_seconds * 1e3,
+        'json_bytes': len(payload),
+    }
+
+
+def run_suite(quick=False):
+    """
+    Run every benchmark
+
+    Args:
+        quick (bool): Skip the largest frame counts
+
+    Returns:
+        list: Results as {'name', 'params', 'metrics'} dicts
+    """
+    frame_counts = QUICK_FRAME_COUNTS if quick else FRAME_COUNTS
+    results = []
+
+    def record(name, params, metrics):
+        results.append({'name': name, 'params': params, 'metrics': metrics})
+        print(f"{name:<20} {json.dumps(params):<45} "
+              + "  ".join(f"{key}={value:.3f}" for key, value in metrics.items()), flush=True)
+
+    for total_frames in frame_counts:
+        allocate_us, deallocate_us = bench_allocate_deallocate(total_frames)
+        record('allocate_deallocate', {'frames': total_frames},
+               {'allocate_us': allocate_us, 'deallocate_us': deallocate_us})
+
+    for total_frames in frame_counts:
+        for algorithm in ALGORITHMS:
+            params = {'frames': total_frames, 'algorithm': algorithm}
+            record('access', params, bench_access(total_frames, algorithm))
+            record('replacement', params, bench_replacement(total_frames, algorithm))
+
+    workload = generate_workload()
+    for technique, fit in CONFIGURATIONS:
+        metrics = run_workload(technique, fit, workload)
+        record('fragmentation', {'technique': technique, 'fit': fit}, {
+            'allocate_us': metrics['allocate_us'],
+            'internal': metrics['internal'],
+            'external': metrics['external'],
+            'failed': metrics['failed'],
+        })
+
+    for total_frames in frame_counts:
+        record('state', {'frames': total_frames}, bench_state(total_frames))
+
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(baseline, results, threshold):
+    """
+    Find latency metrics that got worse than a baseline run
+
+    Args:
+        baseline (list): Results from an earlier run
+        results (list): Results from this run
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        list: (name, params, metric, old, new) for each regression
+    """
+    previous = {(r['name'], json.dumps(r['params'], sort_keys=True)): r['metrics'] for r in baseline}
+    regressions = []
+    for result in results:
+        old_metrics = previous.get((result['name'], json.dumps(result['params'], sort_keys=True)))
+        if not old_metrics:
+            continue
+        for metric, new in result['metrics'].items():
+            old = old_metrics.get(metric)
+            if metric in LOWER_IS_BETTER and old and new > old * (1 + threshold):
+                regressions.append((result['name'], result['params'], metric, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the simulator benchmark suite")
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--quick', action='store_true', help="Skip the largest frame counts")
+    parser.add_argument('--compare', help="Earlier results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Per-op logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    results = run_suite(quick=args.quick)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare_results(baseline, results, args.threshold)
+        for name, params, metric, old, new in regressions:
+            print(f"REGRESSION {name} {json.dumps(params)} {metric}: {old:.3f} -> {new:.3f}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Buddy allocator for the Memory Management Visualizer
+Allocates power-of-two blocks of frames with split/merge of buddies
+"""
+from array import array
+
+from snapshot_format import require
+
+
+class BuddyAllocator:
+    """
+    Binary buddy allocator over a range of frames.
+
+    Each order k keeps a free list of blocks of 2**k frames. Allocation
+    splits the smallest large-enough block down to the requested order and
+    freeing merges a block with its buddy while the buddy is free, so both
+    take O(log frames). Free lists are insertion-ordered dicts, giving O(1)
+    removal of a buddy and a deterministic (LIFO) choice of block.
+    """
+
+    def __init__(self, total_frames):
+        """
+        Initialize the allocator with all memory free
+
+        Memory that is not a power of two is split into the largest aligned
+        power-of-two blocks that fit, none of which are buddies of each other.
+
+        Args:
+            total_frames (int): Number of frames to manage
+        """
+        self.total_frames = total_frames
+        self.max_order = max(0, total_frames.bit_length() - 1)
+        self._free_lists = [{} for _ in range(self.max_order + 1)]
+
+        start = 0
+        while start < total_frames:
+            order = self.max_order
+            while order > 0 and (start % (1 << order) or start + (1 << order) > total_frames):
+                order -= 1
+            self._free_lists[order][start] = None
+            start += 1 << order
+
+    @property
+    def hole_count(self):
+        """Number of free blocks"""
+        return sum(len(free_list) for free_list in self._free_lists)
+
+    @property
+    def largest_hole(self):
+        """Length in frames of the largest free block"""
+        for order in range(self.max_order, -1, -1):
+            if self._free_lists[order]:
+                return 1 << order
+        return 0
+
+    def copy(self):
+        """
+        Copy the allocator for a forked simulation
+
+        Returns:
+            BuddyAllocator: Independent allocator with the same free blocks
+        """
+        clone = BuddyAllocator.__new__(BuddyAllocator)
+        clone.__dict__.update(self.__dict__)
+        clone._free_lists = [dict(free_list) for free_list in self._free_lists]
+        return clone
+
+    def get_state(self):
+        """
+        Get the free lists as plain data for a snapshot
+
+        Returns:
+            dict: 'free_lists', the block starts of each order in list order
+        """
+        return {'free_lists': [array('i', free_list) for free_list in self._free_lists]}
+
+    def set_state(self, state):
+        """
+        Replace the free lists with those of get_state() data
+
+        Args:
+            state (dict): Output of get_state() for the same number of frames
+        """
+        free_lists = state['free_lists']
+        require(type(free_lists) is list and len(free_lists) == self.max_order + 1, "invalid buddy free lists")
+        for order, starts in enumerate(free_lists):
+            require(type(starts) is array and starts.typecode == 'i', "invalid buddy free lists")
+            require(all(start >= 0 and start % (1 << order) == 0 and start + (1 << order) <= self.total_frames
+                        for start in starts), "misaligned buddy block")
+        self._free_lists = [dict.fromkeys(starts) for starts in free_lists]
+
+    @staticmethod
+    def order_for(num_frames):
+        """
+        Get the smallest order whose blocks hold ``num_frames`` frames
+
+        Args:
+            num_frames (int): Number of frames requested
+
+        Returns:
+            int: Block order
+        """
+        return max(0, (num_frames - 1).bit_length())
+
+    def allocate(self, num_frames):
+        """
+        Allocate a block of at least ``num_frames`` frames
+
+        Args:
+            num_frames (int): Number of frames requested
+
+        Returns:
+            tuple: (start, length) of the block, or None if no free block
+                is large enough
+
+        Raises:
+            ValueError: If ``num_frames`` is not positive
+        """
+        if num_frames <= 0:
+            raise ValueError(f"Invalid block length {num_frames}")
+        order = self.order_for(num_frames)
+        if order > self.max_order:
+            return None
+
+        # Smallest order with a free block
+        block_order = order
+        while block_order <= self.max_order and not self._free_lists[block_order]:
+            block_order += 1
+        if block_order > self.max_order:
+            return None
+
+        start, _ = self._free_lists[block_order].popitem()
+
+        # Split down to the requested order, freeing the upper halves
+        while block_order > order:
+            block_order -= 1
+            self._free_lists[block_order][start + (1 << block_order)] = None
+
+        return start, 1 << order
+
+    def free(self, start, num_frames):
+        """
+        Free a block and merge it with its buddy while possible
+
+        Args:
+            start (int): First frame of the block
+            num_frames (int): Block length as returned by allocate()
+        """
+        order = self.order_for(num_frames)
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            if buddy not in self._free_lists[order]:
+                break
+            del self._free_lists[order][buddy]
+            start = min(start, buddy)
+            order += 1
+        self._free_lists[order][start] = None
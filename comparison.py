@@ -0,0 +1,231 @@
+"""
+Policy comparison runner for the Memory Management Visualizer
+Replays one trace against a grid of MemoryManager configurations in parallel
+
+Usage:
+    python comparison.py trace.json --algorithms FIFO LRU ARC \\
+        --memory-sizes 1024 4096 --page-sizes 32 64
+"""
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from memory_manager import MemoryManager
+from segmentation import FIT_STRATEGIES
+from replacement_policies import REPLACEMENT_ALGORITHMS
+
+TECHNIQUES = ('paging', 'segmentation', 'buddy')
+
+# Grid axes in the order they vary in the result table (last varies fastest)
+GRID_AXES = ('technique', 'fit', 'memory_size', 'page_size', 'algorithm')
+
+DEFAULT_GRID = {
+    'technique': ['paging'],
+    'fit': ['first'],
+    'memory_size': [1024],
+    'page_size': [64],
+    'algorithm': ['FIFO', 'LRU'],
+}
+
+# Trace shared by every configuration a worker process runs
+_worker_operations = None
+
+
+def build_grid(grid, max_configs=None):
+    """
+    Expand a grid of parameter lists into individual configurations
+
+    Args:
+        grid (dict): Axis name -> list of values; missing axes use
+            DEFAULT_GRID, and a single value may be given without a list
+        max_configs (int): Optional upper bound on the number of
+            combinations, checked before any are built
+
+    Returns:
+        list: Configuration dicts, one per combination
+
+    Raises:
+        ValueError: If a value is not a string, number or None, or the grid
+            has more than ``max_configs`` combinations
+    """
+    axes = []
+    for axis in GRID_AXES:
+        values = grid.get(axis, DEFAULT_GRID[axis])
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        for value in values:
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise ValueError(f"Invalid {axis} value: {value!r}")
+        axes.append(list(dict.fromkeys(values)))  # Drop duplicates, keep order
+    if max_configs is not None and math.prod(len(values) for values in axes) > max_configs:
+        raise ValueError(f"Grid exceeds {max_configs} configurations")
+    return [dict(zip(GRID_AXES, combination)) for combination in itertools.product(*axes)]
+
+
+def validate_configuration(config, max_frames=None):
+    """
+    Check a configuration against the rules start_simulation applies
+
+    Args:
+        config (dict): Configuration from build_grid()
+        max_frames (int): Optional upper bound on the number of frames
+
+    Returns:
+        str: Error message, or None if the configuration is valid
+    """
+    if config['technique'] not in TECHNIQUES:
+        return f"Invalid technique: {config['technique']}"
+    if config['algorithm'] not in REPLACEMENT_ALGORITHMS:
+        return f"Invalid algorithm: {config['algorithm']}"
+    if config['fit'] not in FIT_STRATEGIES:
+        return f"Invalid fit strategy: {config['fit']}"
+    memory_size, page_size = config['memory_size'], config['page_size']
+    if not isinstance(memory_size, int) or memory_size <= 0:
+        return f"Invalid memory size: {memory_size}"
+    if not isinstance(page_size, int) or page_size <= 0 or page_size > 512:
+        return f"Invalid page size: {page_size}"
+    if memory_size % page_size != 0:
+        return f"Memory size {memory_size} is not a multiple of page size {page_size}"
+    if max_frames is not None and memory_size // page_size > max_frames:
+        return f"Memory size {memory_size} exceeds {max_frames} frames"
+    return None
+
+
+def run_configuration(config, operations=None):
+    """
+    Replay the trace on a fresh MemoryManager built from one configuration
+
+    Args:
+        config (dict): Configuration from build_grid()
+        operations (list): Trace operations (defaults to the worker's trace)
+
+    Returns:
+        dict: The configuration plus fault/hit counters and run time
+    """
+    if operations is None:
+        operations = _worker_operations
+
+    start = time.perf_counter()
+    manager = MemoryManager(**config)
+    trace_result = manager.run_trace(operations)
+    elapsed = time.perf_counter() - start
+
+    results = trace_result['results']
+    return {
+        **config,
+        'page_faults': results['page_faults'],
+        'page_hits': results['page_hits'],
+        'memory_accesses': results['memory_accesses'],
+        'hit_ratio': results['hit_ratio'],
+        'failed_allocations': manager.failed_allocations,
+        'errors': trace_result['errors'],
+        'elapsed_seconds': elapsed,
+    }
+
+
+def _init_worker(operations):
+    """Receive the trace once per worker process instead of once per task"""
+    global _worker_operations
+    _worker_operations = operations
+    # Per-operation logging from every worker would dominate the run time
+    logging.disable(logging.CRITICAL)
+
+
+def run_comparison(operations, configs, max_workers=None):
+    """
+    Replay a trace against every configuration across a process pool
+
+    Args:
+        operations (list): Trace operations, as accepted by run_trace()
+        configs (list): Configurations from build_grid()
+        max_workers (int): Worker processes (defaults to the CPU count)
+
+    Returns:
+        list: One result row per configuration, in the order given
+    """
+    operations = list(operations)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(configs)))
+
+    if max_workers == 1:
+        # Not worth starting a pool; logging is left as configured
+        return [run_configuration(config, operations) for config in configs]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(operations,)) as executor:
+        return list(executor.map(run_configuration, configs))
+
+
+def format_table(rows):
+    """
+    Format comparison rows as a fixed-width text table
+
+    Args:
+        rows (list): Rows from run_comparison()
+
+    Returns:
+        str: Table with one line per configuration
+    """
+    lines = [f"{'technique':<12} {'fit':<6} {'memory':>9} {'page':>5} {'algorithm':<14} "
+             f"{'faults':>8} {'hits':>8} {'hit ratio':>9} {'time (s)':>8}"]
+    for row in rows:
+        lines.append(f"{row['technique']:<12} {row['fit']:<6} {row['memory_size']:>9} {row['page_size']:>5} "
+                     f"{row['algorithm']:<14} {row['page_faults']:>8} {row['page_hits']:>8} "
+                     f"{row['hit_ratio']:>9.3f} {row['elapsed_seconds']:>8.3f}")
+    return "\n".join(lines)
+
+
+def load_trace(path):
+    """
+    Read a trace file: a JSON list of operations or {"operations": [...]}
+
+    Args:
+        path (str): Path to the trace file
+
+    Returns:
+        list: Trace operations
+    """
+    with open(path) as f:
+        data = json.load(f)
+    return data['operations'] if isinstance(data, dict) else data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare replacement policies and memory layouts on one trace")
+    parser.add_argument('trace', help="JSON trace file")
+    parser.add_argument('--techniques', nargs='+', default=DEFAULT_GRID['technique'], choices=TECHNIQUES)
+    parser.add_argument('--fits', nargs='+', default=DEFAULT_GRID['fit'], choices=FIT_STRATEGIES)
+    parser.add_argument('--memory-sizes', nargs='+', type=int, default=DEFAULT_GRID['memory_size'])
+    parser.add_argument('--page-sizes', nargs='+', type=int, default=DEFAULT_GRID['page_size'])
+    parser.add_argument('--algorithms', nargs='+', default=DEFAULT_GRID['algorithm'], choices=REPLACEMENT_ALGORITHMS)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--json', action='store_true', help="Print rows as JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    configs = build_grid({
+        'technique': args.techniques,
+        'fit': args.fits,
+        'memory_size': args.memory_sizes,
+        'page_size': args.page_sizes,
+        'algorithm': args.algorithms,
+    })
+    for config in configs:
+        error = validate_configuration(config)
+        if error:
+            parser.error(error)
+
+    logging.disable(logging.CRITICAL)
+    rows = run_comparison(load_trace(args.trace), configs, max_workers=args.workers)
+    print(json.dumps(rows, indent=2) if args.json else format_table(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
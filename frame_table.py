@@ -0,0 +1,314 @@
+"""
+Compact frame table for the Memory Management Visualizer
+Stores frame status and owners in typed arrays instead of a list of dicts
+"""
+from array import array
+
+from snapshot_format import require
+
+# Status codes stored in the status bytearrays, indexed by code
+FRAME_STATUSES = ('free', 'allocated')
+FREE = 0
+ALLOCATED = 1
+
+# Frames per block in the free-frame summary
+BLOCK_SIZE = 256
+
+# Frames per copy-on-write chunk (a multiple of BLOCK_SIZE)
+CHUNK_SHIFT = 12
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# Owner value stored for frames without a process (process IDs start at 1)
+NO_OWNER = 0
+
+
+class FrameTable:
+    """
+    Frame table backed by parallel typed arrays.
+
+    Status is one byte per frame and the owner one C int per frame, both
+    split into chunks of CHUNK_SIZE frames. Free frames are summarized per
+    block of BLOCK_SIZE frames, so finding the lowest N free frames only
+    scans a byte per block plus the blocks that actually contain them.
+    Indexing and iteration yield the same ``{'status': ..., 'id': ...}``
+    dicts the rest of the app expects.
+
+    ``fork()`` shares every chunk between the two tables; a table copies a
+    chunk the first time it writes to it, so each copy only pays for the
+    chunks it changes.
+
+    Every frame written since the last ``drain_changes()`` is recorded so
+    callers can send only the frames that changed.
+    """
+
+    def __init__(self, total_frames):
+        """
+        Initialize a table with every frame free
+
+        Args:
+            total_frames (int): Number of frames in the table
+        """
+        self.total_frames = total_frames
+        self.free_count = total_frames
+        # Number of maximal runs of contiguous free frames (holes)
+        self.free_runs = 1 if total_frames else 0
+
+        chunk_sizes = [min(CHUNK_SIZE, total_frames - start) for start in range(0, total_frames, CHUNK_SIZE)]
+        self._status = [bytearray(size) for size in chunk_sizes]
+        self._owners = [array('i', bytes(4 * size)) for size in chunk_sizes]
+        self._owned = bytearray(b'\x01') * len(chunk_sizes)  # 0 while a chunk is shared
+
+        num_blocks = (total_frames + BLOCK_SIZE - 1) // BLOCK_SIZE
+        self._block_free = array('H', [BLOCK_SIZE] * num_blocks)
+        if num_blocks and total_frames % BLOCK_SIZE:
+            self._block_free[-1] = total_frames % BLOCK_SIZE
+        self._block_has_free = bytearray(b'\x01') * num_blocks
+
+        self.changed_frames = set()
+
+    def __len__(self):
+        return self.total_frames
+
+    def __getitem__(self, frame_idx):
+        if not 0 <= frame_idx < self.total_frames:
+            raise IndexError(f"Frame {frame_idx} out of range")
+        return self._frame_dict(frame_idx)
+
+    def __iter__(self):
+        for frame_idx in range(self.total_frames):
+            yield self._frame_dict(frame_idx)
+
+    @property
+    def allocated_count(self):
+        """Number of allocated frames"""
+        return self.total_frames - self.free_count
+
+    @property
+    def shared_chunks(self):
+        """Number of chunks still shared with a fork"""
+        return self._owned.count(0)
+
+    def fork(self):
+        """
+        Create a copy that shares all frame data with this table
+
+        Only the per-block free summary (a few bytes per BLOCK_SIZE frames)
+        is copied; status and owner chunks are copied by whichever table
+        writes to them first.
+
+        Returns:
+            FrameTable: Independent copy of this table
+        """
+        clone = FrameTable.__new__(FrameTable)
+        clone.__dict__.update(self.__dict__)
+        clone._status = list(self._status)
+        clone._owners = list(self._owners)
+        clone._block_free = array('H', self._block_free)
+        clone._block_has_free = bytearray(self._block_has_free)
+        clone.changed_frames = set(self.changed_frames)
+        self._owned = bytearray(len(self._owned))
+        clone._owned = bytearray(len(self._owned))
+        return clone
+
+    def get_state(self):
+        """
+        Get the table's contents as plain data for a snapshot
+
+        Returns:
+            dict: 'owners', one C int per frame (NO_OWNER for free frames)
+        """
+        owners = array('i')
+        for chunk in self._owners:
+            owners.extend(chunk)
+        return {'owners': owners}
+
+    def set_state(self, state):
+        """
+        Load get_state() data, recomputing status and free-frame counters
+        from the owners
+
+        Args:
+            state (dict): Output of get_state() for a table of this size
+        """
+        owners = state['owners']
+        require(type(owners) is array and owners.typecode == 'i' and len(owners) == self.total_frames,
+                "frame owners do not match the memory size")
+        require(not owners or min(owners) >= NO_OWNER, "invalid frame owner")
+
+        self._owners = [owners[start:start + CHUNK_SIZE] for start in range(0, self.total_frames, CHUNK_SIZE)]
+        self._status = [bytearray(map(bool, chunk)) for chunk in self._owners]
+        self._owned = bytearray(b'\x01') * len(self._owners)
+
+        status = b''.join(self._status)
+        self.free_count = status.count(FREE)
+        self.free_runs = status.count(bytes((ALLOCATED, FREE))) + (status[:1] == bytes((FREE,)))
+        for block in range(len(self._block_free)):
+            self._block_free[block] = status.count(FREE, block * BLOCK_SIZE, (block + 1) * BLOCK_SIZE)
+            self._block_has_free[block] = self._block_free[block] > 0
+        self.changed_frames = set()
+
+    def is_allocated(self, frame_idx):
+        """
+        Check whether a frame is allocated
+
+        Args:
+            frame_idx (int): Frame number
+
+        Returns:
+            bool: True if the frame is allocated
+        """
+        return self._status[frame_idx >> CHUNK_SHIFT][frame_idx & CHUNK_MASK] == ALLOCATED
+
+    def owner(self, frame_idx):
+        """
+        Get the process that owns a frame
+
+        Args:
+            frame_idx (int): Frame number
+
+        Returns:
+            int: Owning process ID, or None if the frame is free
+        """
+        process_id = self._owners[frame_idx >> CHUNK_SHIFT][frame_idx & CHUNK_MASK]
+        return process_id if process_id != NO_OWNER else None
+
+    def allocate(self, frame_idx, process_id):
+        """
+        Mark a frame as allocated to a process
+
+        Args:
+            frame_idx (int): Frame number
+            process_id (int): Owning process ID
+        """
+        chunk = frame_idx >> CHUNK_SHIFT
+        if not self._owned[chunk]:
+            self._own_chunk(chunk)
+        offset = frame_idx & CHUNK_MASK
+        status = self._status[chunk]
+        if status[offset] == FREE:
+            self.free_count -= 1
+            # The reverse of freeing it (see free())
+            if 0 < offset < len(status) - 1:
+                free_neighbours = (status[offset - 1] == FREE) + (status[offset + 1] == FREE)
+            else:
+                free_neighbours = self._free_neighbours(frame_idx)
+            self.free_runs += free_neighbours - 1
+            block = frame_idx // BLOCK_SIZE
+            self._block_free[block] -= 1
+            if self._block_free[block] == 0:
+                self._block_has_free[block] = 0
+        status[offset] = ALLOCATED
+        self._owners[chunk][offset] = process_id
+        self.changed_frames.add(frame_idx)
+
+    def free(self, frame_idx):
+        """
+        Mark a frame as free
+
+        Args:
+            frame_idx (int): Frame number
+        """
+        chunk = frame_idx >> CHUNK_SHIFT
+        if not self._owned[chunk]:
+            self._own_chunk(chunk)
+        offset = frame_idx & CHUNK_MASK
+        status = self._status[chunk]
+        if status[offset] == ALLOCATED:
+            self.free_count += 1
+            # Freeing a frame opens a run, extends one or merges two
+            if 0 < offset < len(status) - 1:
+                free_neighbours = (status[offset - 1] == FREE) + (status[offset + 1] == FREE)
+            else:
+                free_neighbours = self._free_neighbours(frame_idx)
+            self.free_runs += 1 - free_neighbours
+            block = frame_idx // BLOCK_SIZE
+            self._block_free[block] += 1
+            self._block_has_free[block] = 1
+        status[offset] = FREE
+        self._owners[chunk][offset] = NO_OWNER
+        self.changed_frames.add(frame_idx)
+
+    def _own_chunk(self, chunk):
+        """Replace a shared chunk with a private copy before writing to it"""
+        self._status[chunk] = bytearray(self._status[chunk])
+        self._owners[chunk] = array('i', self._owners[chunk])
+        self._owned[chunk] = 1
+
+    def _free_neighbours(self, frame_idx):
+        """
+        Count the free frames next to a frame, which may be in other chunks
+
+        Args:
+            frame_idx (int): Frame number
+
+        Returns:
+            int: 0, 1 or 2
+        """
+        left_free = frame_idx > 0 and not self.is_allocated(frame_idx - 1)
+        right_free = frame_idx + 1 < self.total_frames and not self.is_allocated(frame_idx + 1)
+        return left_free + right_free
+
+    def lowest_free(self, count):
+        """
+        Find the lowest-numbered free frames without allocating them
+
+        Args:
+            count (int): Maximum number of frames to return
+
+        Returns:
+            list: Up to ``count`` free frame numbers in ascending order
+        """
+        frames = []
+        has_free = self._block_has_free
+        block = has_free.find(1)
+        while block != -1 and len(frames) < count:
+            # Blocks never straddle chunks
+            start = block * BLOCK_SIZE
+            base = start & ~CHUNK_MASK
+            status = self._status[start >> CHUNK_SHIFT]
+            end = min(start + BLOCK_SIZE, self.total_frames) - base
+            offset = status.find(FREE, start - base, end)
+            while offset != -1 and len(frames) < count:
+                frames.append(base + offset)
+                offset = status.find(FREE, offset + 1, end)
+            block = has_free.find(1, block + 1)
+        return frames
+
+    def first_allocated(self):
+        """
+        Find the lowest-numbered allocated frame
+
+        Returns:
+            int: Frame number, or None if no frame is allocated
+        """
+        for chunk, status in enumerate(self._status):
+            offset = status.find(ALLOCATED)
+            if offset != -1:
+                return (chunk << CHUNK_SHIFT) + offset
+        return None
+
+    def drain_changes(self):
+        """
+        Get the frames written since the previous call and reset the record
+
+        Returns:
+            set: Frame numbers that were allocated or freed
+        """
+        changed, self.changed_frames = self.changed_frames, set()
+        return changed
+
+    def to_list(self):
+        """
+        Build the JSON-friendly list of frame dicts
+
+        Returns:
+            list: One ``{'status': ..., 'id': ...}`` dict per frame
+        """
+        return [self._frame_dict(frame_idx) for frame_idx in range(self.total_frames)]
+
+    def _frame_dict(self, frame_idx):
+        return {
+            'status': FRAME_STATUSES[self._status[frame_idx >> CHUNK_SHIFT][frame_idx & CHUNK_MASK]],
+            'id': self.owner(frame_idx)
+        }
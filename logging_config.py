@@ -0,0 +1,41 @@
+"""
+Logging setup for the Memory Management Visualizer
+Chooses how (and whether) per-operation log records are written
+"""
+import os
+import logging
+
+# 'debug': every record written synchronously by the calling thread
+# 'fast':  warnings and errors only; per-operation logging is skipped
+LOG_MODES = ('debug', 'fast')
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(mode=None, filename="app.log"):
+    """
+    Configure the root logger, replacing any handlers already installed
+
+    Args:
+        mode (str): One of LOG_MODES (defaults to the LOG_MODE environment
+            variable, or 'fast')
+        filename (str): Log file
+
+    Returns:
+        str: The mode that was applied
+    """
+    mode = mode or os.environ.get("LOG_MODE", "fast")
+    if mode not in LOG_MODES:
+        raise ValueError(f"Unknown logging mode: {mode}")
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    file_handler = logging.FileHandler(filename)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(file_handler)
+
+    root.setLevel(logging.WARNING if mode == 'fast' else logging.DEBUG)
+    return mode
@@ -1,55 +1,122 @@
+import time
+import zlib
 import random
 import logging
+from array import array
 from collections import deque
+from frame_table import FrameTable
+from segmentation import SegmentAllocator
+from buddy import BuddyAllocator
+from replacement_policies import create_policy
+from stack_distance import StackDistanceAnalyzer
+from operation_log import OperationLog
+from address_translation import AddressTranslator
+from working_set import WorkingSetTracker
+from snapshot_format import encode, decode, checked_int, frame_array, require
+
+# Number of state versions whose changes are kept for delta responses
+STATE_HISTORY_LIMIT = 64
+
+# Number of recent operations kept in memory
+OPERATION_HISTORY_LIMIT = 1024
+
+# Header of snapshot() data, followed by the zlib-compressed state (see
+# snapshot_format)
+SNAPSHOT_MAGIC = b'MMSNAP02'
+
+# Largest decompressed snapshot state restore() accepts
+SNAPSHOT_STATE_LIMIT = 256 * 1024 * 1024
+
+# Simulation counters saved in snapshots, in order
+SNAPSHOT_COUNTERS = ('page_faults', 'memory_accesses', 'page_hits', 'internal_fragmentation',
+                     'failed_allocations', 'next_id', 'state_version')
 
 class MemoryManager:
     """Class to manage memory allocation and tracking for visualization"""
     
-    def __init__(self, technique='paging', memory_size=1024, page_size=64, algorithm='FIFO'):
+    def __init__(self, technique='paging', memory_size=1024, page_size=64, algorithm='FIFO', fit='first',
+                 stack_analysis=False, operation_log_path=None, translation=None,
+                 working_set_window=None):
         """
         Initialize the memory manager with the specified parameters
         
         Args:
-            technique (str): Memory management technique ('paging' or 'segmentation')
+            technique (str): Memory management technique ('paging', 'segmentation' or 'buddy')
             memory_size (int): Total size of memory in bytes
             page_size (int): Size of each page/frame in bytes (for paging)
-            algorithm (str): Page replacement algorithm ('FIFO' or 'LRU')
+            algorithm (str): Page replacement algorithm (see REPLACEMENT_ALGORITHMS)
+            fit (str): Segment placement strategy ('first', 'best', 'next' or 'worst')
+            stack_analysis (bool): Track stack distances of accesses for
+                get_lru_curve() (costs O(log pages) per access)
+            operation_log_path (str): File to spill the full operation
+                history to (only the most recent operations are kept
+                in memory either way)
+            translation (dict): AddressTranslator options (levels,
+                address_bits, tlb_entries, tlb_ways, tlb_policy) to give
+                each process a virtual address space for access_virtual();
+                None disables address translation
+            working_set_window (int): Track per-process working sets and
+                page-fault frequency over this many accesses for
+                get_analytics() (None disables it)
         """
         self.technique = technique
         self.memory_size = memory_size
         self.page_size = page_size
         self.algorithm = algorithm
+        self.fit = fit
         
         # Calculate total number of frames/pages
         self.total_frames = memory_size // page_size
         
         # Initialize memory structures
-        self.memory = [{'status': 'free', 'id': None} for _ in range(self.total_frames)]
+        self.memory = FrameTable(self.total_frames)
         self.page_table = {}  # Maps page ID to frame number
+        # True while a fork shares the page table; frame lists in it are
+        # replaced rather than mutated, so the dict is all that is copied
+        self._page_table_shared = False
+        
+        # Contiguous allocator for segmentation/buddy (None for paging); blocks
+        # are placed in whole frames so they render on the same frame grid
+        if technique == 'segmentation':
+            self.allocator = SegmentAllocator(self.total_frames, fit)
+        elif technique == 'buddy':
+            self.allocator = BuddyAllocator(self.total_frames)
+        else:
+            self.allocator = None
         
-        # For page replacement algorithms
-        self.page_queue = deque()  # For FIFO
-        self.page_access_time = {}  # For LRU
+        # Page replacement policy (paging only; None for unknown algorithms,
+        # which fall back to evicting the first allocated frame)
+        self.policy = create_policy(algorithm, self.total_frames) if self.allocator is None else None
         
         # Performance metrics
         self.page_faults = 0
         self.memory_accesses = 0
         self.page_hits = 0
+        self.internal_fragmentation = 0  # Bytes allocated beyond what was requested
+        self.failed_allocations = 0  # Contiguous allocations with no hole large enough
+        self._process_slack = {}  # Unused bytes in each process's last page
+        self.stack_analyzer = StackDistanceAnalyzer() if stack_analysis else None
+        self.translator = AddressTranslator(page_size, **translation) if translation is not None else None
+        self.working_sets = WorkingSetTracker(working_set_window) if working_set_window else None
+        
+        # Operation history: a ring buffer of recent operations
+        self.operations = OperationLog(OPERATION_HISTORY_LIMIT, operation_log_path)
         
-        # Operation history
-        self.operations = []
+        # State versioning for delta responses: each version records the
+        # frames and page table entries changed since the previous one
+        self.state_version = 0
+        self._changed_processes = set()
+        self._state_history = deque(maxlen=STATE_HISTORY_LIMIT)
         
         # Next process/page ID (incremental)
         self.next_id = 1
         
+        # Per-operation debug records are skipped outright unless DEBUG is
+        # enabled when the simulation starts (see logging_config)
+        self._log_operations = logging.getLogger().isEnabledFor(logging.DEBUG)
         
-        logging.basicConfig(
-        filename="memory_manager.log",
-        level=logging.DEBUG,
-        format="%(asctime)s - %(levelname)s - %(message)s"
-        )
-        logging.debug(f"Memory Manager initialized with {technique}, size: {memory_size}, page size: {page_size}, algorithm: {algorithm}")
-
+        logging.debug("Memory Manager initialized with %s, size: %s, page size: %s, algorithm: %s",
+                      technique, memory_size, page_size, algorithm)
 
     
     def allocate_memory(self, size):
@@ -62,40 +129,103 @@ class MemoryManager:
         Returns:
             int: Starting address of allocated memory
         """
+        if size <= 0:
+            raise ValueError(f"Invalid allocation size {size}")
+        
         # Calculate number of pages/frames needed
         num_pages_needed = (size + self.page_size - 1) // self.page_size
         
         if num_pages_needed > self.total_frames:
             raise ValueError(f"Requested size {size} exceeds total memory size {self.memory_size}")
         
-        # Find free frames
-        free_frames = [i for i, frame in enumerate(self.memory) if frame['status'] == 'free']
+        if self.allocator is not None:
+            return self._allocate_contiguous(size, num_pages_needed)
         
         # If not enough free frames, perform page replacement
-        if len(free_frames) < num_pages_needed:
-            frames_to_replace = num_pages_needed - len(free_frames)
+        if self.memory.free_count < num_pages_needed:
+            frames_to_replace = num_pages_needed - self.memory.free_count
             self._replace_pages(frames_to_replace)
-            # Update free frames list
-            free_frames = [i for i, frame in enumerate(self.memory) if frame['status'] == 'free']
         
         # Allocate memory
         process_id = self.next_id
         self.next_id += 1
         
-        allocated_frames = free_frames[:num_pages_needed]
+        allocated_frames = self.memory.lowest_free(num_pages_needed)
+        self._own_page_table()
         
         for frame_idx in allocated_frames:
-            self.memory[frame_idx] = {
-                'status': 'allocated',
-                'id': process_id
-            }
+            self.memory.allocate(frame_idx, process_id)
             self.page_table[process_id] = allocated_frames
             
             # Update page replacement data structures
-            if self.algorithm == 'FIFO':
-                self.page_queue.append((process_id, frame_idx))
-            elif self.algorithm == 'LRU':
-                self.page_access_time[(process_id, frame_idx)] = self.memory_accesses
+            if self.policy is not None:
+                self.policy.on_load(frame_idx, self.memory_accesses)
+        
+        self._record_allocation(process_id, size, allocated_frames)
+        
+        if self._log_operations:
+            logging.debug("Allocated %s bytes (%s pages) for process %s in frames %s",
+                          size, num_pages_needed, process_id, allocated_frames)
+        
+        # Return the starting frame number as the "address"
+        return allocated_frames[0] * self.page_size
+    
+    def _allocate_contiguous(self, size, num_frames):
+        """
+        Allocate a contiguous block of frames from the technique's allocator
+        
+        Unlike paging there is no page replacement: if no hole is large
+        enough the allocation fails because of external fragmentation.
+        
+        Args:
+            size (int): Size of memory to allocate in bytes
+            num_frames (int): Number of frames needed to hold ``size`` bytes
+        
+        Returns:
+            int: Starting address of allocated memory
+        """
+        placement = self.allocator.allocate(num_frames)
+        if placement is None:
+            self.failed_allocations += 1
+            raise ValueError(f"No free hole of {num_frames} frames for {size} bytes "
+                             f"(largest hole: {self.allocator.largest_hole} frames)")
+        
+        start, length = placement
+        process_id = self.next_id
+        self.next_id += 1
+        
+        allocated_frames = list(range(start, start + length))
+        for frame_idx in allocated_frames:
+            self.memory.allocate(frame_idx, process_id)
+        self._own_page_table()
+        self.page_table[process_id] = allocated_frames
+        
+        self._record_allocation(process_id, size, allocated_frames)
+        
+        if self._log_operations:
+            logging.debug("Allocated %s bytes as a %s block of %s frames for process %s at frame %s",
+                          size, self.technique, length, process_id, start)
+        
+        return start * self.page_size
+    
+    def _record_allocation(self, process_id, size, allocated_frames):
+        """
+        Update fragmentation counters, change tracking and history for an allocation
+        
+        Args:
+            process_id (int): Newly allocated process ID
+            size (int): Requested size in bytes
+            allocated_frames (list): Frames given to the process
+        """
+        self._changed_processes.add(process_id)
+        
+        slack = len(allocated_frames) * self.page_size - size
+        if slack > 0:
+            self._process_slack[process_id] = slack
+            self.internal_fragmentation += slack
+        
+        if self.translator is not None:
+            self.translator.add_process(process_id, allocated_frames)
             
         self.operations.append({
             'type': 'allocate',
@@ -103,11 +233,6 @@ class MemoryManager:
             'size': size,
             'frames': allocated_frames
         })
-        
-        logging.debug(f"Allocated {size} bytes ({num_pages_needed} pages) for process {process_id} in frames {allocated_frames}")
-        
-        # Return the starting frame number as the "address"
-        return allocated_frames[0] * self.page_size
     
     def deallocate_memory(self, address):
         """
@@ -131,22 +256,19 @@ class MemoryManager:
         if frame_num >= len(self.memory) or frame_num < 0:
             raise ValueError(f"Invalid address: {address} (frame {frame_num} out of bounds)")
         
-        frame = self.memory[frame_num]
-        
         # Check if the frame is allocated
-        if frame['status'] != 'allocated':
+        if not self.memory.is_allocated(frame_num):
             # Look for any allocated memory and deallocate the first one found
-            allocated_frames = [(i, f) for i, f in enumerate(self.memory) if f['status'] == 'allocated']
+            first_allocated = self.memory.first_allocated()
             
-            if not allocated_frames:
+            if first_allocated is None:
                 raise ValueError("No allocated memory to deallocate")
             
             # Use the first allocated frame instead
-            frame_num = allocated_frames[0][0]
-            frame = allocated_frames[0][1]
-            logging.warning(f"No allocated memory at address {address}, using frame {frame_num} instead")
+            frame_num = first_allocated
+            logging.warning("No allocated memory at address %s, using frame %s instead", address, frame_num)
         
-        process_id = frame['id']
+        process_id = self.memory.owner(frame_num)
         if process_id is None:
             raise ValueError(f"No process ID associated with frame {frame_num}")
         
@@ -155,25 +277,31 @@ class MemoryManager:
         if not process_frames:
             # Just free this single frame if we can't find its process frames
             process_frames = [frame_num]
-            logging.warning(f"No frames found for process {process_id} in page table, only freeing frame {frame_num}")
+            logging.warning("No frames found for process %s in page table, only freeing frame %s", process_id, frame_num)
         
         # Free all frames
         for frame_idx in process_frames:
             if 0 <= frame_idx < len(self.memory):  # Safety check
-                self.memory[frame_idx] = {'status': 'free', 'id': None}
+                self.memory.free(frame_idx)
                 
                 # Remove from page replacement data structures
-                if self.algorithm == 'FIFO':
-                    self.page_queue = deque([p for p in self.page_queue if p[0] != process_id])
-                elif self.algorithm == 'LRU':
-                    keys_to_remove = [(pid, fidx) for (pid, fidx) in self.page_access_time.keys() if pid == process_id]
-                    for key in keys_to_remove:
-                        if key in self.page_access_time:
-                            del self.page_access_time[key]
+                if self.policy is not None:
+                    self.policy.on_remove(frame_idx)
+        
+        # Contiguous blocks are never split, so the frames form one block
+        if self.allocator is not None:
+            self.allocator.free(process_frames[0], len(process_frames))
         
         # Remove from page table
         if process_id in self.page_table:
+            self._own_page_table()
             del self.page_table[process_id]
+        self._changed_processes.add(process_id)
+        self.internal_fragmentation -= self._process_slack.pop(process_id, 0)
+        if self.translator is not None:
+            self.translator.remove_process(process_id)
+        if self.working_sets is not None:
+            self.working_sets.forget(process_id)
         
         # Update address to match the actual frame we deallocated
         actual_address = frame_num * self.page_size
@@ -185,7 +313,8 @@ class MemoryManager:
             'frames': process_frames
         })
         
-        logging.debug(f"Deallocated memory for process {process_id} from frames {process_frames}")
+        if self._log_operations:
+            logging.debug("Deallocated memory for process %s from frames %s", process_id, process_frames)
     
     def access_memory(self, address):
         """
@@ -211,21 +340,29 @@ class MemoryManager:
         
         if frame_num >= len(self.memory) or frame_num < 0:
             # Instead of raising error, choose a valid frame
-            logging.warning(f"Invalid address: {address}, choosing a valid frame instead")
+            logging.warning("Invalid address: %s, choosing a valid frame instead", address)
             frame_num = min(max(0, frame_num), len(self.memory) - 1)
         
         self.memory_accesses += 1
-        frame = self.memory[frame_num]
+        if self.stack_analyzer is not None:
+            self.stack_analyzer.access(frame_num)
         
-        if frame['status'] != 'allocated':
+        if not self.memory.is_allocated(frame_num):
             # Page fault
             self.page_faults += 1
             
             # Allocate a page if using virtual memory simulation
-            try:
-                self._handle_page_fault(frame_num)
-            except Exception as e:
-                logging.error(f"Error handling page fault: {e}")
+            # (contiguous techniques have no demand paging)
+            if self.allocator is None:
+                try:
+                    self._handle_page_fault(frame_num)
+                except Exception as e:
+                    logging.error("Error handling page fault: %s", e)
+            
+            if self.working_sets is not None:
+                process_id = self.memory.owner(frame_num)
+                if process_id is not None:
+                    self.working_sets.access(process_id, frame_num, True)
             
             self.operations.append({
                 'type': 'access',
@@ -233,16 +370,19 @@ class MemoryManager:
                 'result': 'fault'
             })
             
-            logging.debug(f"Page fault on address {address} (frame {frame_num})")
+            if self._log_operations:
+                logging.debug("Page fault on address %s (frame %s)", address, frame_num)
             return False
         else:
             # Page hit
             self.page_hits += 1
-            process_id = frame['id']
+            process_id = self.memory.owner(frame_num)
             
-            # Update LRU data
-            if self.algorithm == 'LRU':
-                self.page_access_time[(process_id, frame_num)] = self.memory_accesses
+            # Update replacement policy data
+            if self.policy is not None:
+                self.policy.on_hit(frame_num, self.memory_accesses)
+            if self.working_sets is not None:
+                self.working_sets.access(process_id, frame_num, False)
             
             self.operations.append({
                 'type': 'access',
@@ -250,9 +390,90 @@ class MemoryManager:
                 'result': 'hit'
             })
             
-            logging.debug(f"Page hit on address {address} (frame {frame_num})")
+            if self._log_operations:
+                logging.debug("Page hit on address %s (frame %s)", address, frame_num)
             return True
     
+    def access_virtual(self, process_id, address):
+        """
+        Simulate an access to a virtual address of a process
+        
+        The address is translated through the TLB and the process's page
+        table before its frame is accessed. A page that was evicted by page
+        replacement faults and is loaded back into a free frame, replacing
+        another page if memory is full.
+        
+        Args:
+            process_id (int): Process issuing the access
+            address (int): Virtual address, from 0 to the process's size
+        
+        Returns:
+            bool: True if page hit, False if page fault
+        """
+        if self.translator is None:
+            raise ValueError("Address translation is not enabled for this simulation")
+        
+        try:
+            process_id = int(process_id)
+            address = int(address)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid virtual address: process {process_id}, address {address}")
+        
+        frame_num = self.translator.translate(process_id, address)
+        vpn = address // self.page_size
+        
+        self.memory_accesses += 1
+        if self.stack_analyzer is not None:
+            self.stack_analyzer.access((process_id, vpn))
+        
+        if frame_num is not None:
+            self.page_hits += 1
+            if self.policy is not None:
+                self.policy.on_hit(frame_num, self.memory_accesses)
+            result = 'hit'
+        else:
+            frame_num = self._load_virtual_page(process_id, vpn)
+            result = 'fault'
+        if self.working_sets is not None:
+            self.working_sets.access(process_id, vpn, result == 'fault')
+        
+        # Recorded with the physical address so the frame can be shown
+        self.operations.append({
+            'type': 'access',
+            'address': frame_num * self.page_size + address % self.page_size,
+            'result': result
+        })
+        
+        if self._log_operations:
+            logging.debug("Page %s on virtual address %s of process %s (frame %s)",
+                          result, address, process_id, frame_num)
+        return result == 'hit'
+    
+    def process_operation(self, operation, size=None, address=None, process_id=None):
+        """
+        Execute a single memory operation by name
+        
+        Args:
+            operation (str): 'allocate', 'deallocate' or 'access'
+            size (int): Size in bytes for 'allocate' (defaults to 64)
+            address (int): Address for 'deallocate' and 'access' (defaults to 0)
+            process_id (int): For 'access', makes the address a virtual
+                address of this process (see access_virtual())
+        
+        Returns:
+            int or bool or None: Result of the underlying operation
+        """
+        if operation == 'access':
+            if process_id is not None:
+                return self.access_virtual(process_id, 0 if address is None else address)
+            return self.access_memory(0 if address is None else address)
+        elif operation == 'allocate':
+            return self.allocate_memory(64 if size is None else int(size))
+        elif operation == 'deallocate':
+            return self.deallocate_memory(0 if address is None else address)
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+    
     def _replace_pages(self, num_pages):
         """
         Replace pages according to the selected algorithm
@@ -263,7 +484,7 @@ class MemoryManager:
         try:
             # Input validation
             if num_pages <= 0:
-                logging.warning(f"Invalid number of pages to replace: {num_pages}")
+                logging.warning("Invalid number of pages to replace: %s", num_pages)
                 return
                 
             for _ in range(num_pages):
@@ -272,50 +493,19 @@ class MemoryManager:
                 frame_idx = None
                 
                 try:
-                    if self.algorithm == 'FIFO':
-                        if not self.page_queue:
-                            # If no pages in queue, find any allocated frame
-                            allocated_frames = [(i, f['id']) for i, f in enumerate(self.memory) 
-                                               if f['status'] == 'allocated']
-                            
-                            if not allocated_frames:
-                                logging.warning("No allocated frames to replace with FIFO")
-                                break
-                                
-                            frame_idx, process_id = allocated_frames[0]
-                            logging.warning(f"Page queue empty, using first allocated frame {frame_idx}")
-                        else:
-                            # Normal FIFO operation
-                            process_id, frame_idx = self.page_queue.popleft()
-                        
-                    elif self.algorithm == 'LRU':
-                        if not self.page_access_time:
-                            # If no access times, find any allocated frame
-                            allocated_frames = [(i, f['id']) for i, f in enumerate(self.memory) 
-                                               if f['status'] == 'allocated']
-                            
-                            if not allocated_frames:
-                                logging.warning("No allocated frames to replace with LRU")
-                                break
-                                
-                            frame_idx, process_id = allocated_frames[0]
-                            logging.warning(f"Access time map empty, using first allocated frame {frame_idx}")
-                        else:
-                            # Normal LRU operation
-                            lru_key = min(self.page_access_time.items(), key=lambda x: x[1])[0]
-                            process_id, frame_idx = lru_key
-                            del self.page_access_time[lru_key]
-                    else:
-                        # Unknown algorithm fallback
-                        allocated_frames = [(i, f['id']) for i, f in enumerate(self.memory) 
-                                           if f['status'] == 'allocated']
+                    frame_idx = self.policy.select_victim() if self.policy is not None else None
+                    
+                    if frame_idx is None:
+                        # If the policy tracks no pages, find any allocated frame
+                        frame_idx = self.memory.first_allocated()
                         
-                        if not allocated_frames:
-                            logging.warning(f"Unknown algorithm {self.algorithm} and no allocated frames")
+                        if frame_idx is None:
+                            logging.warning("No allocated frames to replace with %s", self.algorithm)
                             break
-                            
-                        frame_idx, process_id = allocated_frames[0]
-                        logging.warning(f"Unknown algorithm {self.algorithm}, using first allocated frame {frame_idx}")
+                        
+                        logging.warning("No page tracked by %s, using first allocated frame %s", self.algorithm, frame_idx)
+                    
+                    process_id = self.memory.owner(frame_idx)
                     
                     # Safety check for frame_idx and process_id
                     if frame_idx is None or process_id is None:
@@ -323,28 +513,35 @@ class MemoryManager:
                         continue
                         
                     if frame_idx >= len(self.memory) or frame_idx < 0:
-                        logging.error(f"Invalid frame index {frame_idx}")
+                        logging.error("Invalid frame index %s", frame_idx)
                         continue
                     
                     # Free the frame
-                    self.memory[frame_idx] = {'status': 'free', 'id': None}
+                    self.memory.free(frame_idx)
+                    if self.translator is not None:
+                        self.translator.unmap_frame(frame_idx)
                     
                     # Update page table
                     if process_id in self.page_table:
+                        self._own_page_table()
                         self.page_table[process_id] = [f for f in self.page_table[process_id] if f != frame_idx]
                         if not self.page_table[process_id]:
                             del self.page_table[process_id]
+                            self.internal_fragmentation -= self._process_slack.pop(process_id, 0)
+                        self._changed_processes.add(process_id)
                     
                     self.page_faults += 1
                     
-                    logging.debug(f"Replaced page in frame {frame_idx} for process {process_id} using {self.algorithm}")
+                    if self._log_operations:
+                        logging.debug("Replaced page in frame %s for process %s using %s",
+                                      frame_idx, process_id, self.algorithm)
                     
                 except Exception as e:
-                    logging.error(f"Error replacing page: {e}")
+                    logging.error("Error replacing page: %s", e)
                     continue
                     
         except Exception as e:
-            logging.error(f"Error in page replacement: {e}")
+            logging.error("Error in page replacement: %s", e)
     
     def _handle_page_fault(self, frame_num):
         """
@@ -357,7 +554,7 @@ class MemoryManager:
         # For simulation, we'll just mark it as allocated
         
         # If the frame is already allocated, we don't need to do anything
-        if self.memory[frame_num]['status'] == 'allocated':
+        if self.memory.is_allocated(frame_num):
             return
         
         # If the frame is free, allocate it
@@ -365,26 +562,54 @@ class MemoryManager:
             process_id = self.next_id
             self.next_id += 1
             
-            self.memory[frame_num] = {
-                'status': 'allocated',
-                'id': process_id
-            }
+            self.memory.allocate(frame_num, process_id)
             
+            self._own_page_table()
             if process_id in self.page_table:
-                self.page_table[process_id].append(frame_num)
+                self.page_table[process_id] = self.page_table[process_id] + [frame_num]
             else:
                 self.page_table[process_id] = [frame_num]
+            self._changed_processes.add(process_id)
+            if self.translator is not None:
+                self.translator.add_process(process_id, [frame_num])
             
             # Update page replacement data structures
-            if self.algorithm == 'FIFO':
-                self.page_queue.append((process_id, frame_num))
-            elif self.algorithm == 'LRU':
-                self.page_access_time[(process_id, frame_num)] = self.memory_accesses
+            if self.policy is not None:
+                self.policy.on_load(frame_num, self.memory_accesses)
             
-            logging.debug(f"Handled page fault by allocating frame {frame_num} to process {process_id}")
+            if self._log_operations:
+                logging.debug("Handled page fault by allocating frame %s to process %s", frame_num, process_id)
         else:
             # This shouldn't happen
-            logging.error(f"Unexpected frame status in handle_page_fault: {self.memory[frame_num]['status']}")
+            logging.error("Unexpected frame status in handle_page_fault: %s", self.memory[frame_num]['status'])
+    
+    def _load_virtual_page(self, process_id, vpn):
+        """
+        Bring an evicted virtual page back into memory
+        
+        Args:
+            process_id (int): Process that owns the page
+            vpn (int): Virtual page number
+        
+        Returns:
+            int: Frame the page was loaded into
+        """
+        # _replace_pages() counts the fault when it has to evict a page
+        if self.memory.free_count == 0:
+            self._replace_pages(1)
+        else:
+            self.page_faults += 1
+        
+        frame_num = self.memory.lowest_free(1)[0]
+        self.memory.allocate(frame_num, process_id)
+        self._own_page_table()
+        self.page_table[process_id] = self.page_table.get(process_id, []) + [frame_num]
+        self._changed_processes.add(process_id)
+        self.translator.map_page(process_id, vpn, frame_num)
+        
+        if self.policy is not None:
+            self.policy.on_load(frame_num, self.memory_accesses)
+        return frame_num
     
     def get_current_state(self):
         """
@@ -393,20 +618,94 @@ class MemoryManager:
         Returns:
             dict: Current memory state
         """
+        state = self._get_state_summary()
+        state['memory'] = self.memory.to_list()
+        state['page_table'] = self.page_table
+        return state
+    
+    def get_state_delta(self, since_version):
+        """
+        Get only the parts of the state that changed since a given version
+        
+        Falls back to the full state from get_current_state() when the
+        version is unknown or too old to rebuild from the retained history.
+        
+        Args:
+            since_version (int): Last state version the client has applied
+        
+        Returns:
+            dict: State delta (with 'delta': True) or full state
+        """
+        current_version = self._commit_state_version()
+        
+        changed_frames = set()
+        changed_processes = set()
+        if since_version != current_version:
+            history = [entry for entry in self._state_history if entry[0] > since_version]
+            # The history must cover every version after since_version
+            if (since_version > current_version or not history
+                    or history[0][0] != since_version + 1):
+                return self.get_current_state()
+            for _, frames, processes in history:
+                if frames is None:
+                    return self.get_current_state()
+                changed_frames.update(frames)
+                changed_processes.update(processes)
+        
+        delta = self._get_state_summary()
+        delta['delta'] = True
+        delta['base_version'] = since_version
+        delta['changed_frames'] = [
+            dict(self.memory[frame_idx], index=frame_idx) for frame_idx in sorted(changed_frames)
+        ]
+        delta['page_table'] = {
+            pid: self.page_table[pid] for pid in changed_processes if pid in self.page_table
+        }
+        delta['removed_processes'] = [pid for pid in changed_processes if pid not in self.page_table]
+        return delta
+    
+    def _get_state_summary(self):
+        """
+        Get the scalar part of the state shared by full and delta responses
+        
+        Returns:
+            dict: Configuration, counters, version and recent operations
+        """
         return {
             'technique': self.technique,
             'memory_size': self.memory_size,
             'page_size': self.page_size,
             'algorithm': self.algorithm,
             'total_frames': self.total_frames,
-            'memory': self.memory,
-            'page_table': self.page_table,
             'page_faults': self.page_faults,
             'memory_accesses': self.memory_accesses,
             'page_hits': self.page_hits,
-            'operations': self.operations[-10:] if self.operations else []  # Return last 10 operations
+            'version': self._commit_state_version(),
+            'delta': False,
+            'operations': self.operations.recent(10)  # Return last 10 operations
         }
     
+    def _commit_state_version(self):
+        """
+        Close the pending changes into a new state version if there are any
+        
+        Change sets covering more than half the frames are stored as None,
+        since a full snapshot is cheaper to send than such a delta.
+        
+        Returns:
+            int: Current state version
+        """
+        frames = self.memory.drain_changes()
+        if frames or self._changed_processes:
+            self.state_version += 1
+            if len(frames) > self.total_frames // 2:
+                frames = processes = None
+            else:
+                processes = self._changed_processes
+            self._state_history.append((self.state_version, frames, processes))
+            self._changed_processes = set()
+        return self.state_version
+    
     def get_results(self):
         """
         Get the simulation results
@@ -417,10 +716,10 @@ class MemoryManager:
         hit_ratio = self.page_hits / max(1, self.memory_accesses) if self.memory_accesses > 0 else 0
         miss_ratio = self.page_faults / max(1, self.memory_accesses) if self.memory_accesses > 0 else 0
         
-        allocated_frames = sum(1 for frame in self.memory if frame['status'] == 'allocated')
+        allocated_frames = self.memory.allocated_count
         utilization = allocated_frames / self.total_frames if self.total_frames > 0 else 0
         
-        return {
+        results = {
             'page_faults': self.page_faults,
             'memory_accesses': self.memory_accesses,
             'page_hits': self.page_hits,
@@ -430,3 +729,483 @@ class MemoryManager:
             'allocated_frames': allocated_frames,
             'total_frames': self.total_frames
         }
+        if self.translator is not None:
+            results['translation'] = self.translator.get_stats()
+        return results
+    
+    def get_analytics(self):
+        """
+        Get live analytics from counters maintained on every operation
+        
+        External fragmentation is 0 when all free frames form one hole and
+        approaches 1 as free frames are scattered into single-frame holes.
+        
+        Returns:
+            dict: Utilization, hit ratio and fragmentation metrics, plus the
+                WorkingSetTracker report if working sets are tracked
+        """
+        allocated_frames = self.memory.allocated_count
+        free_frames = self.memory.free_count
+        free_holes = self.memory.free_runs
+        
+        return {
+            'memory_utilization': allocated_frames / self.total_frames if self.total_frames > 0 else 0,
+            'allocated_frames': allocated_frames,
+            'free_frames': free_frames,
+            'hit_ratio': self.page_hits / self.memory_accesses if self.memory_accesses > 0 else 0,
+            'page_faults': self.page_faults,
+            'page_hits': self.page_hits,
+            'memory_accesses': self.memory_accesses,
+            'free_holes': free_holes,
+            'external_fragmentation': (free_holes - 1) / (free_frames - 1) if free_frames > 1 else 0,
+            'internal_fragmentation': self.internal_fragmentation,
+            'largest_free_hole': self.allocator.largest_hole if self.allocator is not None else None,
+            'failed_allocations': self.failed_allocations,
+            'active_processes': len(self.page_table),
+            'working_set': self.working_sets.get_report(self.total_frames) if self.working_sets is not None else None
+        }
+    
+    def get_lru_curve(self, max_points=100):
+        """
+        Get the LRU hit ratio this simulation's accesses would have for
+        every memory size up to the current one
+        
+        Args:
+            max_points (int): Sample at most this many frame counts
+        
+        Returns:
+            dict: Curve from StackDistanceAnalyzer.hit_ratio_curve(), or
+                None if the manager was created without stack_analysis
+        """
+        if self.stack_analyzer is None:
+            return None
+        curve = self.stack_analyzer.hit_ratio_curve(max_frames=self.total_frames, max_points=max_points)
+        curve['total_frames'] = self.total_frames
+        return curve
+    
+    def run_trace(self, ops, snapshot_interval=0):
+        """
+        Execute a whole list of operations in one call
+        
+        Each operation is a dict with an 'operation' (or 'type') key of
+        'allocate', 'deallocate' or 'access', plus 'size' or 'address' as
+        used by the step-by-step API. Operations that fail are counted and
+        skipped so one bad entry does not abort a long trace.
+        
+        Args:
+            ops (iterable): Operations to execute in order
+            snapshot_interval (int): Take a state snapshot every N operations
+                (0 disables snapshots)
+        
+        Returns:
+            dict: Number of operations run, errors, aggregate results from
+                get_results() and any sampled snapshots
+        """
+        operations_run = 0
+        errors = 0
+        snapshots = []
+        
+        for op in self._prepare_trace(ops):
+            try:
+                self._apply_trace_operation(op)
+            except (ValueError, TypeError, IndexError) as e:
+                errors += 1
+                if self._log_operations:
+                    logging.debug("Trace operation %s failed: %s", operations_run, e)
+            operations_run += 1
+            
+            if snapshot_interval > 0 and operations_run % snapshot_interval == 0:
+                snapshots.append({
+                    'step': operations_run,
+                    'state': self._snapshot_state()
+                })
+        
+        return {
+            'operations_run': operations_run,
+            'errors': errors,
+            'results': self.get_results(),
+            'snapshots': snapshots
+        }
+    
+    def stream_trace(self, ops, max_updates_per_second=10, since_version=None, max_ops_per_second=0,
+                     max_seconds=None):
+        """
+        Execute operations and yield state updates at a bounded rate
+        
+        Operations run as fast as possible (or at most ``max_ops_per_second``)
+        and an update is produced at most ``max_updates_per_second`` times a
+        second. Each update is a delta against the previous one, so all
+        frame changes in between are coalesced into a single update.
+        
+        Args:
+            ops (iterable): Operations as accepted by run_trace()
+            max_updates_per_second (float): Update rate limit
+            since_version (int): Version the client already has (None to
+                start with the full state)
+            max_ops_per_second (float): Execution rate limit (0 for none)
+            max_seconds (float): Stop the run after this long (None for no
+                limit)
+        
+        Yields:
+            dict: 'state' (delta or full), 'analytics', 'operations_run',
+                'errors' and 'done' (True for the final update only, which
+                also has 'timed_out' if max_seconds cut the run short)
+        """
+        update_interval = 1.0 / max_updates_per_second
+        op_interval = 1.0 / max_ops_per_second if max_ops_per_second > 0 else 0
+        operations_run = 0
+        errors = 0
+        
+        def update(done):
+            state = self.get_current_state() if since_version is None else self.get_state_delta(since_version)
+            return {
+                'state': state,
+                'analytics': self.get_analytics(),
+                'operations_run': operations_run,
+                'errors': errors,
+                'done': done
+            }
+        
+        start = time.monotonic()
+        deadline = start + max_seconds if max_seconds is not None else None
+        timed_out = False
+        next_update = start
+        for op in self._prepare_trace(ops):
+            try:
+                self._apply_trace_operation(op)
+            except (ValueError, TypeError, IndexError) as e:
+                errors += 1
+                if self._log_operations:
+                    logging.debug("Trace operation %s failed: %s", operations_run, e)
+            operations_run += 1
+            
+            now = time.monotonic()
+            if op_interval:
+                delay = start + operations_run * op_interval - now
+                if delay > 0:
+                    time.sleep(delay)
+                    now += delay
+            if deadline is not None and now >= deadline:
+                timed_out = True
+                break
+            if now >= next_update:
+                result = update(False)
+                since_version = result['state']['version']
+                next_update = now + update_interval
+                yield result
+        
+        result = update(True)
+        result['timed_out'] = timed_out
+        yield result
+    
+    def replay_accesses(self, addresses):
+        """
+        Execute a stream of memory accesses without per-operation dicts
+        
+        Args:
+            addresses (iterable): Addresses to access in order, e.g. from
+                workloads.stream_addresses()
+        
+        Returns:
+            dict: Number of accesses run, errors and aggregate results from
+                get_results()
+        """
+        accesses_run = 0
+        errors = 0
+        
+        if self.policy is not None and self.policy.needs_future:
+            addresses = list(addresses)
+            self.policy.prepare_trace(self._access_frames(addresses), self.memory_accesses)
+        
+        access_memory = self.access_memory
+        for address in addresses:
+            try:
+                access_memory(address)
+            except (ValueError, TypeError) as e:
+                errors += 1
+                if self._log_operations:
+                    logging.debug("Access %s failed: %s", accesses_run, e)
+            accesses_run += 1
+        
+        return {
+            'operations_run': accesses_run,
+            'errors': errors,
+            'results': self.get_results()
+        }
+    
+    def _prepare_trace(self, ops):
+        """
+        Give offline policies (OPT) every upcoming access before a trace runs
+        
+        Args:
+            ops (iterable): Trace operations
+        
+        Returns:
+            iterable: The operations, materialized if the policy needed them
+        """
+        if self.policy is not None and self.policy.needs_future:
+            ops = list(ops)
+            self.policy.prepare_trace(self._trace_access_frames(ops), self.memory_accesses)
+        return ops
+    
+    def _apply_trace_operation(self, op):
+        """
+        Execute a single trace operation
+        
+        Args:
+            op (dict): Operation with 'operation'/'type', 'size'/'address'
+                and optionally 'process_id' for virtual accesses
+        """
+        self.process_operation(
+            op.get('operation', op.get('type')),
+            size=op.get('size'),
+            address=op.get('address'),
+            process_id=op.get('process_id')
+        )
+    
+    def _trace_access_frames(self, ops):
+        """
+        Get the frame each access in a trace will touch, in order
+        
+        Args:
+            ops (list): Trace operations
+        
+        Returns:
+            list: Frame numbers, clamped like access_memory() does
+        """
+        return self._access_frames(
+            op.get('address', 0) for op in ops if op.get('operation', op.get('type')) == 'access'
+        )
+    
+    def _access_frames(self, addresses):
+        """
+        Get the frame each address will touch, in order
+        
+        Args:
+            addresses (iterable): Accessed addresses
+        
+        Returns:
+            list: Frame numbers, clamped like access_memory() does
+        """
+        frames = []
+        last_frame = self.total_frames - 1
+        for address in addresses:
+            try:
+                frame_num = int(address) // self.page_size
+            except (ValueError, TypeError):
+                continue  # access_memory() rejects it without counting an access
+            frames.append(min(max(0, frame_num), last_frame))
+        return frames
+    
+    def fork(self):
+        """
+        Create an independent branch of the simulation at its current state
+        
+        The frame table and page table are shared copy-on-write, so forking
+        does not copy them: each branch copies a frame chunk the first time
+        it writes to it, and the page table dict (not its frame lists) on
+        its first change. Recorded operations and state versions are shared
+        since they never change. A spilled operation history stays with
+        this simulation.
+        
+        Everything else is copied with each component's copy(), which copies
+        whole containers in C rather than walking objects like deepcopy.
+        Those copies are still O(n) in the pages the replacement policy
+        tracks (up to the frame count), the pages the stack distance
+        analyzer has seen, the working-set window, the translator's
+        frame-to-page map (its page tables are shared copy-on-write per
+        process) and the segment allocator's holes and tree (2 ints per
+        frame).
+        
+        Returns:
+            MemoryManager: The branch
+        """
+        self._page_table_shared = True
+        clone = MemoryManager.__new__(MemoryManager)
+        clone.__dict__.update(self.__dict__)
+        clone.memory = self.memory.fork()
+        clone.operations = self.operations.copy()
+        clone._state_history = deque(self._state_history, maxlen=STATE_HISTORY_LIMIT)
+        clone._changed_processes = set(self._changed_processes)
+        clone._process_slack = dict(self._process_slack)
+        for name in ('allocator', 'policy', 'stack_analyzer', 'translator', 'working_sets'):
+            component = getattr(self, name)
+            if component is not None:
+                setattr(clone, name, component.copy())
+        return clone
+    
+    def _own_page_table(self):
+        """Copy the page table before changing it if a fork shares it"""
+        if self._page_table_shared:
+            self.page_table = dict(self.page_table)
+            self._page_table_shared = False
+    
+    def snapshot(self):
+        """
+        Serialize the whole simulation so it can be restored later
+        
+        Covers the frame table, page table, allocator, replacement policy,
+        counters, analyzers and the recent operations, written as plain
+        data (see snapshot_format) rather than pickled objects. A spilled
+        operation history and the state version history are not included,
+        so the first state after a restore is sent in full.
+        
+        Returns:
+            bytes: SNAPSHOT_MAGIC followed by the compressed state
+        """
+        self._commit_state_version()
+        page_table = list(self.page_table.items())
+        frames = array('i')
+        for _, process_frames in page_table:
+            frames.extend(process_frames)
+        state = {
+            'config': {
+                'technique': self.technique,
+                'memory_size': self.memory_size,
+                'page_size': self.page_size,
+                'algorithm': self.algorithm,
+                'fit': self.fit,
+                'stack_analysis': self.stack_analyzer is not None,
+                'translation': self.translator.get_options() if self.translator is not None else None,
+                'working_set_window': self.working_sets.tau if self.working_sets is not None else None
+            },
+            'counters': [getattr(self, name) for name in SNAPSHOT_COUNTERS],
+            'memory': self.memory.get_state(),
+            'page_table': {
+                'processes': array('q', [pid for pid, _ in page_table]),
+                'lengths': array('i', [len(process_frames) for _, process_frames in page_table]),
+                'frames': frames
+            },
+            'process_slack': self._process_slack,
+            'allocator': self.allocator.get_state() if self.allocator is not None else None,
+            'policy': self.policy.get_state() if self.policy is not None else None,
+            'stack_analyzer': self.stack_analyzer.get_state() if self.stack_analyzer is not None else None,
+            'translator': self.translator.get_state() if self.translator is not None else None,
+            'working_sets': self.working_sets.get_state() if self.working_sets is not None else None,
+            'operations': self.operations.get_state()
+        }
+        return SNAPSHOT_MAGIC + zlib.compress(encode(state), 1)
+    
+    @classmethod
+    def restore(cls, data):
+        """
+        Create a simulation from snapshot() data
+        
+        Each call returns an independent copy, so one snapshot can be
+        restored several times to run different traces from the same point.
+        Only plain data is decoded, and it is checked for consistency
+        before it is loaded.
+        
+        Args:
+            data (bytes): Output of snapshot()
+        
+        Returns:
+            MemoryManager: The restored simulation
+        
+        Raises:
+            ValueError: If the data is not a valid snapshot
+        """
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError("Not a memory manager snapshot")
+        decompressor = zlib.decompressobj()
+        try:
+            payload = decompressor.decompress(data[len(SNAPSHOT_MAGIC):], SNAPSHOT_STATE_LIMIT)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt snapshot: {e}")
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Snapshot state exceeds {SNAPSHOT_STATE_LIMIT} bytes")
+        if not decompressor.eof or decompressor.unused_data:
+            raise ValueError("Corrupt snapshot: truncated or trailing data")
+        try:
+            return cls._from_snapshot_state(decode(payload))
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Corrupt snapshot: {e!r}")
+    
+    @classmethod
+    def _from_snapshot_state(cls, state):
+        """
+        Build a simulation from decoded snapshot() state
+        
+        Sizes that the constructor allocates from are checked against the
+        data first, so a snapshot cannot allocate more than it contains.
+        
+        Args:
+            state (dict): Decoded state
+        
+        Returns:
+            MemoryManager: The restored simulation
+        """
+        config = state['config']
+        require(config['technique'] in ('paging', 'segmentation', 'buddy'), "unknown technique")
+        memory_size = checked_int(config['memory_size'], 1)
+        page_size = checked_int(config['page_size'], 1)
+        require(len(state['memory']['owners']) == memory_size // page_size, "frame owners do not match the memory size")
+        translation = config['translation']
+        if translation is not None:
+            require(type(translation) is dict and set(translation) == {
+                'levels', 'address_bits', 'tlb_entries', 'tlb_ways', 'tlb_policy'
+            }, "invalid translation options")
+            require(checked_int(translation['tlb_ways'], 1) * len(state['translator']['tlb']['sets'])
+                    == translation['tlb_entries'], "TLB sets do not match its size")
+        working_set_window = config['working_set_window']
+        if working_set_window is not None:
+            require(checked_int(working_set_window, 1) == len(state['working_sets']['window']),
+                    "working-set window does not match its size")
+        
+        manager = cls(
+            technique=config['technique'],
+            memory_size=memory_size,
+            page_size=page_size,
+            algorithm=config['algorithm'],
+            fit=config['fit'],
+            stack_analysis=config['stack_analysis'] is True,
+            translation=translation,
+            working_set_window=working_set_window
+        )
+        
+        counters = state['counters']
+        require(type(counters) is list and len(counters) == len(SNAPSHOT_COUNTERS), "invalid counters")
+        for name, value in zip(SNAPSHOT_COUNTERS, counters):
+            setattr(manager, name, checked_int(value, 0))
+        
+        manager.memory.set_state(state['memory'])
+        owners = state['memory']['owners']
+        page_table = state['page_table']
+        processes = page_table['processes']
+        lengths = page_table['lengths']
+        frames = frame_array(page_table['frames'], manager.total_frames)
+        require(type(processes) is array and type(lengths) is array and len(processes) == len(lengths)
+                and sum(lengths) == len(frames), "invalid page table")
+        start = 0
+        for pid, length in zip(processes, lengths):
+            process_frames = frames[start:start + length].tolist()
+            start += length
+            require(length > 0 and all(owners[frame_idx] == pid for frame_idx in process_frames),
+                    "page table does not match the frame owners")
+            manager.page_table[pid] = process_frames
+        process_slack = state['process_slack']
+        require(type(process_slack) is dict and all(pid in manager.page_table for pid in process_slack),
+                "invalid process slack")
+        manager._process_slack = {pid: checked_int(slack, 0) for pid, slack in process_slack.items()}
+        
+        for name in ('allocator', 'policy', 'stack_analyzer', 'working_sets'):
+            component = getattr(manager, name)
+            require((component is None) == (state[name] is None), f"{name} does not match the configuration")
+            if component is not None:
+                component.set_state(state[name])
+        if manager.translator is not None:
+            manager.translator.set_state(state['translator'], manager.total_frames)
+        manager.operations.set_state(state['operations'])
+        return manager
+    
+    def _snapshot_state(self):
+        """
+        Get a copy of the current memory state that later operations won't mutate
+        
+        Returns:
+            dict: Detached copy of get_current_state()
+        """
+        state = self.get_current_state()
+        state['page_table'] = {pid: list(frames) for pid, frames in state['page_table'].items()}
+        state['operations'] = [dict(op) for op in state['operations']]
+        return state
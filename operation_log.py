@@ -0,0 +1,267 @@
+"""
+Operation history for the Memory Management Visualizer
+Keeps recent operations in memory and optionally spills every one to disk
+"""
+import os
+import struct
+from array import array
+from collections import deque
+from itertools import islice
+
+from snapshot_format import checked_int, require
+
+OPERATION_TYPES = ('allocate', 'deallocate', 'access')
+ACCESS_RESULTS = (None, 'hit', 'fault')
+
+# type, access result, process ID, size or address, number of frame runs
+_RECORD_HEADER = struct.Struct('<BBqqI')
+# start frame, run length
+_FRAME_RUN = struct.Struct('<II')
+
+# Spilled records are written in batches of about this many bytes
+SPILL_BUFFER_BYTES = 64 * 1024
+# Every this many records the spill file offset is kept for paging
+SPILL_INDEX_INTERVAL = 1024
+
+
+def _frame_runs(frames):
+    """Compress a frame list into (start, length) runs of consecutive frames"""
+    runs = []
+    for frame_idx in frames:
+        if runs and runs[-1][0] + runs[-1][1] == frame_idx:
+            runs[-1][1] += 1
+        else:
+            runs.append([frame_idx, 1])
+    return runs
+
+
+def pack_operation(op):
+    """
+    Encode an operation dict as a compact binary record
+
+    Args:
+        op (dict): Operation as recorded by MemoryManager
+
+    Returns:
+        bytes: Record header followed by the frames as runs
+    """
+    op_type = op['type']
+    value = op.get('size', 0) if op_type == 'allocate' else op.get('address', 0)
+    runs = _frame_runs(op.get('frames', ()))
+    record = bytearray(_RECORD_HEADER.pack(
+        OPERATION_TYPES.index(op_type),
+        ACCESS_RESULTS.index(op.get('result')),
+        op.get('process_id', 0),
+        value,
+        len(runs)
+    ))
+    for start, length in runs:
+        record += _FRAME_RUN.pack(start, length)
+    return bytes(record)
+
+
+def read_operations(f):
+    """
+    Decode records from an open spill file until its end
+
+    Args:
+        f (file): Binary file positioned at a record boundary
+
+    Yields:
+        dict: Operations in the format MemoryManager records them
+    """
+    while True:
+        header = f.read(_RECORD_HEADER.size)
+        if len(header) < _RECORD_HEADER.size:
+            return
+        type_code, result_code, process_id, value, run_count = _RECORD_HEADER.unpack(header)
+        op_type = OPERATION_TYPES[type_code]
+        if op_type == 'access':
+            yield {'type': op_type, 'address': value, 'result': ACCESS_RESULTS[result_code]}
+            continue
+
+        frames = []
+        runs = f.read(_FRAME_RUN.size * run_count)
+        for start, length in _FRAME_RUN.iter_unpack(runs):
+            frames.extend(range(start, start + length))
+        yield {
+            'type': op_type,
+            'process_id': process_id,
+            'size' if op_type == 'allocate' else 'address': value,
+            'frames': frames
+        }
+
+
+class OperationLog:
+    """
+    Fixed-capacity ring buffer of recent operations with optional spill of
+    the full history to an append-only file.
+
+    Spilled records are struct-packed (22 bytes plus 8 per run of
+    consecutive frames) and written in batches. The offset of every
+    SPILL_INDEX_INTERVAL-th record is kept so page() can seek close to any
+    position without reading the file from the start.
+    """
+
+    def __init__(self, capacity=1024, spill_path=None):
+        """
+        Initialize an empty log
+
+        Args:
+            capacity (int): Number of recent operations kept in memory
+            spill_path (str): File that receives every operation (created
+                or truncated), or None to keep only the recent ones
+        """
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.total = 0  # Operations ever recorded
+        self._recent = deque(maxlen=capacity)
+        self._pending = bytearray()  # Packed records not yet written
+        self._spilled_bytes = 0
+        self._index = array('Q')  # Offset of every SPILL_INDEX_INTERVAL-th record
+
+        if spill_path is not None:
+            open(spill_path, 'wb').close()
+
+    def __len__(self):
+        return len(self._recent)
+
+    def copy(self):
+        """
+        Copy the log for a forked simulation
+
+        Recorded operations are never modified, so the copy shares them.
+        Like a snapshot, it keeps only the recent operations; the spill
+        file stays with the log that created it.
+
+        Returns:
+            OperationLog: Log that records independently of this one
+        """
+        clone = OperationLog(self.capacity)
+        clone.total = self.total
+        clone._recent.extend(self._recent)
+        return clone
+
+    def get_state(self):
+        """
+        Get the recent operations as plain data for a snapshot
+
+        Returns:
+            dict: Capacity, total operations recorded and the recent
+                operation dicts, oldest first
+        """
+        return {'capacity': self.capacity, 'total': self.total, 'recent': list(self._recent)}
+
+    def set_state(self, state):
+        """
+        Load get_state() data into an empty log without a spill file
+
+        Args:
+            state (dict): Output of get_state()
+        """
+        recent = state['recent']
+        require(type(recent) is list and all(type(op) is dict and op.get('type') in OPERATION_TYPES for op in recent),
+                "invalid operation history")
+        self.capacity = checked_int(state['capacity'], 1)
+        self.total = checked_int(state['total'], len(recent))
+        self._recent = deque(recent, maxlen=self.capacity)
+
+    def __iter__(self):
+        return iter(self._recent)
+
+    def append(self, op):
+        """
+        Record an operation
+
+        Args:
+            op (dict): Operation to record
+        """
+        self._recent.append(op)
+        if self.spill_path is not None:
+            if self.total % SPILL_INDEX_INTERVAL == 0:
+                self._index.append(self._spilled_bytes + len(self._pending))
+            self._pending += pack_operation(op)
+            if len(self._pending) >= SPILL_BUFFER_BYTES:
+                self.flush()
+        self.total += 1
+
+    def recent(self, count):
+        """
+        Get the most recent operations
+
+        Args:
+            count (int): Maximum number of operations
+
+        Returns:
+            list: Up to ``count`` operations, oldest first
+        """
+        skip = max(0, len(self._recent) - count)
+        return list(islice(self._recent, skip, None))
+
+    def flush(self):
+        """Write pending records to the spill file"""
+        if self._pending:
+            with open(self.spill_path, 'ab') as f:
+                f.write(self._pending)
+            self._spilled_bytes += len(self._pending)
+            self._pending = bytearray()
+
+    def page(self, start, count):
+        """
+        Get a range of the history by operation number
+
+        Without a spill file only the operations still in the ring buffer
+        are available.
+
+        Args:
+            start (int): Number of the first operation (0 is the first
+                operation ever recorded)
+            count (int): Maximum number of operations
+
+        Returns:
+            list: Operations from ``start`` onwards, oldest first
+        """
+        start = max(0, start)
+        if self.spill_path is None:
+            first_kept = self.total - len(self._recent)
+            skip = max(0, start - first_kept)
+            return list(islice(self._recent, skip, skip + count))
+
+        self.flush()
+        checkpoint = min(start // SPILL_INDEX_INTERVAL, len(self._index) - 1)
+        if checkpoint < 0:
+            return []
+        with open(self.spill_path, 'rb') as f:
+            f.seek(self._index[checkpoint])
+            skip = start - checkpoint * SPILL_INDEX_INTERVAL
+            return list(islice(read_operations(f), skip, skip + count))
+
+    def history(self):
+        """
+        Iterate over every spilled operation, e.g. to replay or export it
+
+        Records use the same keys as run_trace() operations, so the history
+        can be passed to MemoryManager.run_trace() directly.
+
+        Yields:
+            dict: Operations, oldest first
+        """
+        if self.spill_path is None:
+            yield from self._recent
+            return
+        self.flush()
+        with open(self.spill_path, 'rb') as f:
+            yield from read_operations(f)
+
+    def close(self, delete=False):
+        """
+        Write pending records and optionally remove the spill file
+
+        Args:
+            delete (bool): Delete the spill file
+        """
+        if self.spill_path is None:
+            return
+        self.flush()
+        if delete and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
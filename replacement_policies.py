@@ -0,0 +1,552 @@
+"""
+Page replacement policies for the Memory Management Visualizer
+Each policy tracks resident frames and picks the victim for _replace_pages
+"""
+import heapq
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+
+from snapshot_format import checked_int, frame_array, require
+
+
+class ReplacementPolicy:
+    """
+    Interface between MemoryManager and a page replacement algorithm.
+
+    Pages are identified by frame number. ``time`` is the manager's
+    ``memory_accesses`` counter when the event happens.
+    """
+
+    name = None
+    needs_future = False  # True for offline policies that need prepare_trace()
+
+    def __init__(self, total_frames):
+        self.total_frames = total_frames
+
+    def on_load(self, frame_idx, time):
+        """A page was placed in a frame (allocation or page fault)"""
+        raise NotImplementedError
+
+    def on_hit(self, frame_idx, time):
+        """A resident page was accessed"""
+        raise NotImplementedError
+
+    def on_remove(self, frame_idx):
+        """A page was freed by deallocation rather than replacement"""
+        raise NotImplementedError
+
+    def select_victim(self):
+        """
+        Choose and stop tracking the page to evict
+
+        Returns:
+            int: Frame number of the victim, or None if nothing is tracked
+        """
+        raise NotImplementedError
+
+    def prepare_trace(self, future_frames, start_time):
+        """
+        Receive the frames a trace is about to access (used by offline policies)
+
+        Args:
+            future_frames (list): Frame accessed by each upcoming access
+            start_time (int): memory_accesses value before the first of them
+        """
+
+    def copy(self):
+        """
+        Copy the policy for a forked simulation
+
+        Every container attribute is copied one level deep, which is a full
+        copy for policies whose state is flat collections of frame numbers.
+
+        Returns:
+            ReplacementPolicy: Independent policy in the same state
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__ = {
+            name: value.copy() if hasattr(value, 'copy') else value
+            for name, value in self.__dict__.items()
+        }
+        return clone
+
+    def get_state(self):
+        """
+        Get the policy's bookkeeping as plain data for a snapshot
+
+        Returns:
+            dict: Arrays of frame numbers and counters, in the order the
+                policy keeps them
+        """
+        raise NotImplementedError
+
+    def set_state(self, state):
+        """
+        Load get_state() data into a new policy over the same frames
+
+        Args:
+            state (dict): Output of get_state()
+
+        Raises:
+            ValueError: If the state does not fit this policy
+        """
+        raise NotImplementedError
+
+
+class FifoPolicy(ReplacementPolicy):
+    """First-in first-out: evict the page that was loaded earliest"""
+
+    name = 'FIFO'
+
+    def __init__(self, total_frames):
+        super().__init__(total_frames)
+        self._queue = OrderedDict()  # Oldest load first
+
+    def on_load(self, frame_idx, time):
+        self._queue[frame_idx] = None
+        self._queue.move_to_end(frame_idx)
+
+    def on_hit(self, frame_idx, time):
+        pass
+
+    def on_remove(self, frame_idx):
+        self._queue.pop(frame_idx, None)
+
+    def select_victim(self):
+        if not self._queue:
+            return None
+        frame_idx, _ = self._queue.popitem(last=False)
+        return frame_idx
+
+    def get_state(self):
+        return {'queue': array('i', self._queue)}
+
+    def set_state(self, state):
+        self._queue = OrderedDict.fromkeys(frame_array(state['queue'], self.total_frames))
+
+
+class LruPolicy(ReplacementPolicy):
+    """Least recently used: evict the page whose last load or hit is oldest"""
+
+    name = 'LRU'
+
+    def __init__(self, total_frames):
+        super().__init__(total_frames)
+        self._recency = OrderedDict()  # Least recently used first
+
+    def on_load(self, frame_idx, time):
+        self._recency[frame_idx] = time
+        self._recency.move_to_end(frame_idx)
+
+    def on_hit(self, frame_idx, time):
+        self.on_load(frame_idx, time)
+
+    def on_remove(self, frame_idx):
+        self._recency.pop(frame_idx, None)
+
+    def select_victim(self):
+        if not self._recency:
+            return None
+        frame_idx, _ = self._recency.popitem(last=False)
+        return frame_idx
+
+    def get_state(self):
+        return {'frames': array('i', self._recency), 'times': array('q', self._recency.values())}
+
+    def set_state(self, state):
+        frames = frame_array(state['frames'], self.total_frames)
+        times = state['times']
+        require(type(times) is array and len(times) == len(frames), "LRU times do not match its frames")
+        self._recency = OrderedDict(zip(frames, times))
+
+
+class ClockPolicy(ReplacementPolicy):
+    """
+    Clock: a hand sweeps the ring of physical frames, clearing reference
+    bits and evicting the first resident frame whose bit is already clear.
+    """
+
+    name = 'CLOCK'
+
+    def __init__(self, total_frames):
+        super().__init__(total_frames)
+        self._resident = bytearray(total_frames)
+        self._referenced = bytearray(total_frames)
+        self._resident_count = 0
+        self._hand = 0
+
+    def on_load(self, frame_idx, time):
+        if not self._resident[frame_idx]:
+            self._resident[frame_idx] = 1
+            self._resident_count += 1
+        self._referenced[frame_idx] = 1
+
+    def on_hit(self, frame_idx, time):
+        self._referenced[frame_idx] = 1
+
+    def on_remove(self, frame_idx):
+        if self._resident[frame_idx]:
+            self._resident[frame_idx] = 0
+            self._resident_count -= 1
+        self._referenced[frame_idx] = 0
+
+    def select_victim(self):
+        if not self._resident_count:
+            return None
+        while True:
+            # Jump over empty frames, wrapping at the end of the ring
+            frame_idx = self._resident.find(1, self._hand)
+            if frame_idx == -1:
+                frame_idx = self._resident.find(1)
+            self._hand = (frame_idx + 1) % self.total_frames
+            if self._referenced[frame_idx]:
+                self._referenced[frame_idx] = 0
+                continue
+            self.on_remove(frame_idx)
+            return frame_idx
+
+    def get_state(self):
+        return {'resident': bytes(self._resident), 'referenced': bytes(self._referenced), 'hand': self._hand}
+
+    def set_state(self, state):
+        resident = state['resident']
+        referenced = state['referenced']
+        for bits in (resident, referenced):
+            require(type(bits) is bytes and len(bits) == self.total_frames and not bits.translate(None, b'\x00\x01'),
+                    "invalid clock bits")
+        self._resident = bytearray(resident)
+        self._referenced = bytearray(referenced)
+        self._resident_count = resident.count(1)
+        self._hand = checked_int(state['hand'], 0, max(0, self.total_frames - 1))
+
+
+class SecondChancePolicy(ReplacementPolicy):
+    """
+    Second chance: FIFO, except a page referenced since it was queued has its
+    bit cleared and goes back to the tail instead of being evicted.
+    """
+
+    name = 'SECOND_CHANCE'
+
+    def __init__(self, total_frames):
+        super().__init__(total_frames)
+        self._queue = OrderedDict()  # frame -> reference bit, oldest first
+
+    def on_load(self, frame_idx, time):
+        self._queue[frame_idx] = False
+        self._queue.move_to_end(frame_idx)
+
+    def on_hit(self, frame_idx, time):
+        if frame_idx in self._queue:
+            self._queue[frame_idx] = True
+
+    def on_remove(self, frame_idx):
+        self._queue.pop(frame_idx, None)
+
+    def select_victim(self):
+        while self._queue:
+            frame_idx, referenced = self._queue.popitem(last=False)
+            if not referenced:
+                return frame_idx
+            self._queue[frame_idx] = False
+        return None
+
+    def get_state(self):
+        return {'queue': array('i', self._queue), 'referenced': bytes(self._queue.values())}
+
+    def set_state(self, state):
+        queue = frame_array(state['queue'], self.total_frames)
+        referenced = state['referenced']
+        require(type(referenced) is bytes and len(referenced) == len(queue), "reference bits do not match the queue")
+        self._queue = OrderedDict(zip(queue, map(bool, referenced)))
+
+
+class LfuPolicy(ReplacementPolicy):
+    """
+    Least frequently used with O(1) frequency buckets. Pages with the same
+    count are evicted least recently used first.
+    """
+
+    name = 'LFU'
+
+    def __init__(self, total_frames):
+        super().__init__(total_frames)
+        self._counts = {}  # frame -> access count
+        self._buckets = defaultdict(OrderedDict)  # count -> frames, LRU first
+        self._min_count = 0
+
+    def on_load(self, frame_idx, time):
+        self.on_remove(frame_idx)
+        self._counts[frame_idx] = 1
+        self._buckets[1][frame_idx] = None
+        self._min_count = 1
+
+    def on_hit(self, frame_idx, time):
+        count = self._counts.get(frame_idx)
+        if count is None:
+            self.on_load(frame_idx, time)
+            return
+        bucket = self._buckets[count]
+        del bucket[frame_idx]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[frame_idx] = count + 1
+        self._buckets[count + 1][frame_idx] = None
+
+    def on_remove(self, frame_idx):
+        count = self._counts.pop(frame_idx, None)
+        if count is None:
+            return
+        bucket = self._buckets[count]
+        del bucket[frame_idx]
+        if not bucket:
+            del self._buckets[count]
+            # The minimum is found again lazily in select_victim()
+
+    def copy(self):
+        clone = super().copy()
+        clone._buckets = defaultdict(OrderedDict, {count: bucket.copy() for count, bucket in self._buckets.items()})
+        return clone
+
+    def select_victim(self):
+        if not self._counts:
+            return None
+        if self._min_count not in self._buckets:
+            self._min_count = min(self._buckets)
+        bucket = self._buckets[self._min_count]
+        frame_idx, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[self._min_count]
+        del self._counts[frame_idx]
+        return frame_idx
+
+    def get_state(self):
+        # Frames bucket by bucket, each bucket least recently used first
+        frames = array('i')
+        counts = array('q')
+        for count, bucket in self._buckets.items():
+            frames.extend(bucket)
+            counts.extend([count] * len(bucket))
+        return {'frames': frames, 'counts': counts, 'min_count': self._min_count}
+
+    def set_state(self, state):
+        frames = frame_array(state['frames'], self.total_frames)
+        counts = state['counts']
+        require(type(counts) is array and len(counts) == len(frames) and (not counts or min(counts) >= 1),
+                "invalid LFU counts")
+        require(len(set(frames)) == len(frames), "frame counted twice")
+        self._counts = dict(zip(frames, counts))
+        self._buckets = defaultdict(OrderedDict)
+        for frame_idx, count in zip(frames, counts):
+            self._buckets[count][frame_idx] = None
+        self._min_count = checked_int(state['min_count'], 0)
+
+
+class ArcPolicy(ReplacementPolicy):
+    """
+    Adaptive Replacement Cache. Resident pages live in T1 (seen once) or T2
+    (seen again); recently evicted pages are remembered in ghost lists B1/B2,
+    and a fault on a ghost shifts the target size ``p`` of T1 toward the list
+    that would have kept it.
+
+    Victims are chosen before the incoming page is known, so REPLACE uses
+    ``len(T1) > p`` without the usual tie-break on the incoming page.
+    """
+
+    name = 'ARC'
+
+    def __init__(self, total_frames):
+        super().__init__(total_frames)
+        self.p = 0
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+
+    def on_load(self, frame_idx, time):
+        capacity = self.total_frames
+        if frame_idx in self._b1:
+            self.p = min(capacity, self.p + max(len(self._b2) // len(self._b1), 1))
+            del self._b1[frame_idx]
+            self._t2[frame_idx] = None
+        elif frame_idx in self._b2:
+            self.p = max(0, self.p - max(len(self._b1) // len(self._b2), 1))
+            del self._b2[frame_idx]
+            self._t2[frame_idx] = None
+        else:
+            self._t1[frame_idx] = None
+        self._trim_ghosts()
+
+    def on_hit(self, frame_idx, time):
+        if frame_idx in self._t1:
+            del self._t1[frame_idx]
+            self._t2[frame_idx] = None
+        elif frame_idx in self._t2:
+            self._t2.move_to_end(frame_idx)
+        else:
+            self.on_load(frame_idx, time)
+
+    def on_remove(self, frame_idx):
+        self._t1.pop(frame_idx, None)
+        self._t2.pop(frame_idx, None)
+
+    def select_victim(self):
+        if self._t1 and (len(self._t1) > self.p or not self._t2):
+            frame_idx, _ = self._t1.popitem(last=False)
+            self._b1[frame_idx] = None
+        elif self._t2:
+            frame_idx, _ = self._t2.popitem(last=False)
+            self._b2[frame_idx] = None
+        else:
+            return None
+        self._trim_ghosts()
+        return frame_idx
+
+    def _trim_ghosts(self):
+        """Keep |T1| + |B1| <= c and the total directory size <= 2c"""
+        capacity = self.total_frames
+        while self._b1 and len(self._t1) + len(self._b1) > capacity:
+            self._b1.popitem(last=False)
+        while self._b2 and len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) > 2 * capacity:
+            self._b2.popitem(last=False)
+
+    def get_state(self):
+        return {
+            'p': self.p,
+            't1': array('i', self._t1),
+            't2': array('i', self._t2),
+            'b1': array('i', self._b1),
+            'b2': array('i', self._b2)
+        }
+
+    def set_state(self, state):
+        self.p = checked_int(state['p'], 0, self.total_frames)
+        self._t1, self._t2, self._b1, self._b2 = (
+            OrderedDict.fromkeys(frame_array(state[name], self.total_frames)) for name in ('t1', 't2', 'b1', 'b2')
+        )
+        self._trim_ghosts()
+
+
+class OptimalPolicy(ReplacementPolicy):
+    """
+    Belady's optimal policy for offline traces: evict the page whose next use
+    is farthest in the future.
+
+    prepare_trace() builds a next-use index (sorted access times per frame),
+    so each load or hit finds its next use with one bisect, and the victim
+    comes from a max-heap with lazily skipped stale entries: O(log n) per
+    event. Pages never used again are evicted first, least recently used
+    first; without a trace every page looks unused and the policy behaves
+    like LRU.
+    """
+
+    name = 'OPT'
+    needs_future = True
+
+    NEVER = float('inf')
+
+    def __init__(self, total_frames):
+        super().__init__(total_frames)
+        self._uses = {}  # frame -> sorted access times
+        self._heap = []  # (-next_use, sequence, frame)
+        self._entry = {}  # frame -> sequence of its live heap entry
+        self._sequence = 0
+
+    def prepare_trace(self, future_frames, start_time):
+        uses = defaultdict(list)
+        for offset, frame_idx in enumerate(future_frames):
+            uses[frame_idx].append(start_time + offset + 1)
+        self._uses = dict(uses)
+
+        # Re-key resident pages against the new future
+        for frame_idx in list(self._entry):
+            self._push(frame_idx, start_time)
+
+    def on_load(self, frame_idx, time):
+        self._push(frame_idx, time)
+
+    def on_hit(self, frame_idx, time):
+        self._push(frame_idx, time)
+
+    def on_remove(self, frame_idx):
+        self._entry.pop(frame_idx, None)
+
+    def select_victim(self):
+        while self._heap:
+            _, sequence, frame_idx = heapq.heappop(self._heap)
+            if self._entry.get(frame_idx) == sequence:
+                del self._entry[frame_idx]
+                return frame_idx
+        return None
+
+    def get_state(self):
+        # Only live heap entries are kept; next uses of NEVER are stored as 0
+        live = [item for item in self._heap if self._entry.get(item[2]) == item[1]]
+        return {
+            'uses': {frame_idx: array('q', uses) for frame_idx, uses in self._uses.items()},
+            'next_uses': array('q', [0 if item[0] == -self.NEVER else -item[0] for item in live]),
+            'sequences': array('q', [item[1] for item in live]),
+            'frames': array('i', [item[2] for item in live]),
+            'sequence': self._sequence
+        }
+
+    def set_state(self, state):
+        uses = state['uses']
+        require(type(uses) is dict, "invalid OPT uses")
+        for frame_idx, times in uses.items():
+            checked_int(frame_idx, 0, self.total_frames - 1)
+            require(type(times) is array and times.typecode == 'q', "invalid OPT uses")
+        frames = frame_array(state['frames'], self.total_frames)
+        next_uses = state['next_uses']
+        sequences = state['sequences']
+        require(type(next_uses) is array and type(sequences) is array
+                and len(next_uses) == len(sequences) == len(frames), "invalid OPT heap")
+
+        self._uses = {frame_idx: list(times) for frame_idx, times in uses.items()}
+        self._heap = [(-next_use if next_use else -self.NEVER, sequence, frame_idx)
+                      for next_use, sequence, frame_idx in zip(next_uses, sequences, frames)]
+        heapq.heapify(self._heap)
+        self._entry = {frame_idx: sequence for _, sequence, frame_idx in self._heap}
+        self._sequence = checked_int(state['sequence'], 0)
+
+    def _next_use(self, frame_idx, time):
+        """First access time of a frame after ``time`` (accesses up to it are done)"""
+        uses = self._uses.get(frame_idx)
+        if not uses:
+            return self.NEVER
+        i = bisect_right(uses, time)
+        return uses[i] if i < len(uses) else self.NEVER
+
+    def _push(self, frame_idx, time):
+        self._sequence += 1
+        self._entry[frame_idx] = self._sequence
+        heapq.heappush(self._heap, (-self._next_use(frame_idx, time), self._sequence, frame_idx))
+        if len(self._heap) > 2 * len(self._entry) + 64:
+            self._heap = [item for item in self._heap if self._entry.get(item[2]) == item[1]]
+            heapq.heapify(self._heap)
+
+
+POLICIES = {
+    policy.name: policy
+    for policy in (FifoPolicy, LruPolicy, ClockPolicy, SecondChancePolicy, LfuPolicy, ArcPolicy, OptimalPolicy)
+}
+
+REPLACEMENT_ALGORITHMS = tuple(POLICIES)
+
+
+def create_policy(algorithm, total_frames):
+    """
+    Create the policy object for a replacement algorithm name
+
+    Args:
+        algorithm (str): Algorithm name, e.g. 'FIFO' or 'LRU'
+        total_frames (int): Number of physical frames
+
+    Returns:
+        ReplacementPolicy: New policy, or None if the name is unknown
+    """
+    policy_class = POLICIES.get(algorithm)
+    return policy_class(total_frames) if policy_class else None
@@ -0,0 +1,127 @@
+"""
+Simulation registry for the Memory Management Visualizer
+Keeps one MemoryManager per user session with bounded memory use
+"""
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class SimulationBusyError(Exception):
+    """Raised when a simulation stays locked by another request for too long"""
+
+
+class _SimulationEntry:
+    """A registered simulation and the lock that serializes its operations"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class SimulationRegistry:
+    """
+    Thread-safe registry of simulations keyed by session.
+
+    Simulations idle for longer than ``ttl_seconds`` are dropped, and once
+    ``max_simulations`` are registered the least recently used one is
+    evicted to make room for a new one.
+    """
+
+    def __init__(self, max_simulations=100, ttl_seconds=1800, lock_timeout=None):
+        """
+        Initialize an empty registry
+
+        Args:
+            max_simulations (int): Maximum number of live simulations
+            ttl_seconds (float): Idle time after which a simulation expires
+            lock_timeout (float): Longest a request waits for a simulation
+                another request is using (None waits indefinitely)
+        """
+        self.max_simulations = max_simulations
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout = lock_timeout
+        self._entries = OrderedDict()  # Least recently used first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def put(self, simulation_id, manager):
+        """
+        Register a simulation, replacing any existing one with the same ID
+
+        Args:
+            simulation_id (str): Session key of the simulation
+            manager (MemoryManager): Simulation to register
+        """
+        with self._lock:
+            self._entries.pop(simulation_id, None)
+            self._evict_expired()
+            while len(self._entries) >= self.max_simulations:
+                evicted_id, _ = self._entries.popitem(last=False)
+                logging.info("Evicted simulation %s to stay within %s simulations", evicted_id, self.max_simulations)
+            self._entries[simulation_id] = _SimulationEntry(manager)
+
+    def remove(self, simulation_id):
+        """
+        Drop a simulation if it is registered
+
+        Args:
+            simulation_id (str): Session key of the simulation
+        """
+        with self._lock:
+            self._entries.pop(simulation_id, None)
+
+    @contextmanager
+    def use(self, simulation_id):
+        """
+        Hold a simulation for the duration of a request
+
+        Other requests for the same simulation wait until this one is
+        done, for at most ``lock_timeout`` seconds.
+
+        Args:
+            simulation_id (str): Session key of the simulation
+
+        Yields:
+            MemoryManager: The simulation, or None if there is none
+
+        Raises:
+            SimulationBusyError: If the simulation is still in use by
+                another request after ``lock_timeout`` seconds
+        """
+        with self._lock:
+            entry = self._entries.get(simulation_id) if simulation_id else None
+            if entry is not None:
+                if time.monotonic() - entry.last_used > self.ttl_seconds:
+                    del self._entries[simulation_id]
+                    entry = None
+                else:
+                    entry.last_used = time.monotonic()
+                    self._entries.move_to_end(simulation_id)
+
+        if entry is None:
+            yield None
+            return
+
+        if not entry.lock.acquire(timeout=-1 if self.lock_timeout is None else self.lock_timeout):
+            raise SimulationBusyError(f"Simulation {simulation_id} is busy")
+        try:
+            yield entry.manager
+        finally:
+            entry.lock.release()
+
+    def _evict_expired(self):
+        """Drop simulations idle for longer than the TTL (caller holds the lock)"""
+        now = time.monotonic()
+        while self._entries:
+            simulation_id, entry = next(iter(self._entries.items()))
+            if now - entry.last_used <= self.ttl_seconds:
+                break
+            del self._entries[simulation_id]
+            logging.info("Expired idle simulation %s", simulation_id)
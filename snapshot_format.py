@@ -0,0 +1,233 @@
+"""
+Snapshot encoding for the Memory Management Visualizer
+Writes simulation state as tagged plain data and reads it back with struct and array
+"""
+import struct
+import sys
+from array import array
+
+# Array typecodes a snapshot may contain (bytes, C ints, 64-bit ints, doubles)
+ARRAY_TYPECODES = 'Biqd'
+
+# Deepest nesting of lists, tuples and dicts decode() accepts
+MAX_DEPTH = 16
+
+_LENGTH = struct.Struct('<I')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_INT_MIN = -(1 << 63)
+_INT_MAX = (1 << 63) - 1
+
+
+def encode(value):
+    """
+    Encode plain data as a snapshot payload
+
+    Supported values are None, bool, int, float, str, bytes, tuple, list,
+    dict and arrays of the ARRAY_TYPECODES. Each is written as a one-byte
+    tag followed by its little-endian contents, so decode() never has to
+    construct anything but these built-in types.
+
+    Args:
+        value: Plain data to encode
+
+    Returns:
+        bytes: Encoded value
+
+    Raises:
+        TypeError: If the value contains anything else
+    """
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def _encode(value, out):
+    value_type = type(value)
+    if value is None:
+        out += b'N'
+    elif value is True:
+        out += b'T'
+    elif value is False:
+        out += b'F'
+    elif value_type is int:
+        if _INT_MIN <= value <= _INT_MAX:
+            out += b'i'
+            out += _INT.pack(value)
+        else:
+            raw = value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+            out += b'I'
+            out += _LENGTH.pack(len(raw))
+            out += raw
+    elif value_type is float:
+        out += b'd'
+        out += _FLOAT.pack(value)
+    elif value_type is str:
+        raw = value.encode('utf-8')
+        out += b's'
+        out += _LENGTH.pack(len(raw))
+        out += raw
+    elif value_type is bytes or value_type is bytearray:
+        out += b'b'
+        out += _LENGTH.pack(len(value))
+        out += value
+    elif value_type is list or value_type is tuple:
+        out += b'l' if value_type is list else b't'
+        out += _LENGTH.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif value_type is dict:
+        out += b'm'
+        out += _LENGTH.pack(len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    elif value_type is array and value.typecode in ARRAY_TYPECODES:
+        if sys.byteorder == 'big':
+            value = array(value.typecode, value)
+            value.byteswap()
+        raw = value.tobytes()
+        out += b'a'
+        out += value.typecode.encode()
+        out += _LENGTH.pack(len(raw))
+        out += raw
+    else:
+        raise TypeError(f"Cannot encode {value_type.__name__} in a snapshot")
+
+
+def decode(data):
+    """
+    Decode a payload written by encode()
+
+    Args:
+        data (bytes): Encoded value
+
+    Returns:
+        The decoded plain data
+
+    Raises:
+        ValueError: If the data is truncated, malformed or nested too deeply
+    """
+    reader = _Reader(data)
+    value = reader.value(0)
+    if reader.pos != len(data):
+        raise ValueError("Corrupt snapshot: trailing data")
+    return value
+
+
+class _Reader:
+    """Cursor over an encoded payload"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read(self, size):
+        end = self.pos + size
+        if end > len(self.data):
+            raise ValueError("Corrupt snapshot: truncated data")
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def length(self):
+        return _LENGTH.unpack(self.read(_LENGTH.size))[0]
+
+    def value(self, depth):
+        tag = self.read(1)
+        if tag == b'N':
+            return None
+        if tag == b'T':
+            return True
+        if tag == b'F':
+            return False
+        if tag == b'i':
+            return _INT.unpack(self.read(_INT.size))[0]
+        if tag == b'I':
+            return int.from_bytes(self.read(self.length()), 'little', signed=True)
+        if tag == b'd':
+            return _FLOAT.unpack(self.read(_FLOAT.size))[0]
+        if tag == b's':
+            return self.read(self.length()).decode('utf-8')
+        if tag == b'b':
+            return bytes(self.read(self.length()))
+        if tag == b'a':
+            return self.array()
+
+        if tag not in (b'l', b't', b'm'):
+            raise ValueError(f"Corrupt snapshot: unknown tag {tag!r}")
+        if depth >= MAX_DEPTH:
+            raise ValueError("Corrupt snapshot: nested too deeply")
+        count = self.length()
+        if tag == b'm':
+            result = {}
+            for _ in range(count):
+                key = self.value(depth + 1)
+                try:
+                    result[key] = self.value(depth + 1)
+                except TypeError:
+                    raise ValueError(f"Corrupt snapshot: unhashable key {key!r}")
+            return result
+        items = [self.value(depth + 1) for _ in range(count)]
+        return items if tag == b'l' else tuple(items)
+
+    def array(self):
+        typecode = self.read(1).decode('ascii', 'replace')
+        if typecode not in ARRAY_TYPECODES:
+            raise ValueError(f"Corrupt snapshot: unknown array type {typecode!r}")
+        values = array(typecode)
+        raw = self.read(self.length())
+        if len(raw) % values.itemsize:
+            raise ValueError("Corrupt snapshot: truncated array")
+        values.frombytes(raw)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+
+def require(condition, message):
+    """
+    Reject snapshot data that fails a consistency check
+
+    Args:
+        condition (bool): Result of the check
+        message (str): What was wrong, for the error
+
+    Raises:
+        ValueError: If ``condition`` is false
+    """
+    if not condition:
+        raise ValueError(f"Corrupt snapshot: {message}")
+
+
+def checked_int(value, low=None, high=None):
+    """
+    Check that a decoded value is an int within bounds
+
+    Args:
+        value: Decoded value
+        low (int): Smallest accepted value (None for no bound)
+        high (int): Largest accepted value (None for no bound)
+
+    Returns:
+        int: The value
+    """
+    require(type(value) is int and (low is None or value >= low) and (high is None or value <= high),
+            f"invalid number {value!r}")
+    return value
+
+
+def frame_array(value, total_frames):
+    """
+    Check that a decoded value is an array('i') of frame numbers
+
+    Args:
+        value: Decoded value
+        total_frames (int): Number of frames; every entry must be below it
+
+    Returns:
+        array: The value
+    """
+    require(type(value) is array and value.typecode == 'i', "expected an array of frames")
+    require(not value or (min(value) >= 0 and max(value) < total_frames), "frame number out of range")
+    return value
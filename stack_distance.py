@@ -0,0 +1,272 @@
+"""
+Stack distance analysis for the Memory Management Visualizer
+Computes LRU hit ratios for every frame count in one pass over an access trace
+"""
+from array import array
+
+from snapshot_format import checked_int, require
+
+
+class FenwickTree:
+    """
+    Binary indexed tree over integer counts with O(log n) point updates and
+    prefix sums.
+    """
+
+    def __init__(self, size, ones=0):
+        """
+        Initialize the tree
+
+        Args:
+            size (int): Number of positions
+            ones (int): Number of leading positions that start at 1 (the
+                rest start at 0); built in O(size)
+        """
+        self.size = size
+        tree = [1 if i <= ones else 0 for i in range(size + 1)]
+        tree[0] = 0
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def copy(self):
+        """
+        Copy the tree
+
+        Returns:
+            FenwickTree: Independent tree with the same counts
+        """
+        clone = FenwickTree.__new__(FenwickTree)
+        clone.size = self.size
+        clone._tree = list(self._tree)
+        return clone
+
+    def add(self, index, delta):
+        """
+        Add ``delta`` at a position
+
+        Args:
+            index (int): Zero-based position
+            delta (int): Amount to add
+        """
+        tree = self._tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index):
+        """
+        Sum of positions 0..index inclusive
+
+        Args:
+            index (int): Zero-based position
+
+        Returns:
+            int: Prefix sum
+        """
+        tree = self._tree
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+class StackDistanceAnalyzer:
+    """
+    Online Mattson stack distance analysis.
+
+    The stack distance of an access is the number of distinct pages touched
+    since the previous access to the same page, counting the page itself: an
+    LRU memory with at least that many frames hits, and any smaller one
+    faults. Each page's last access time is marked in a Fenwick tree, so the
+    distance is the number of marks after that time, found in O(log n).
+    Time slots are renumbered when the tree fills up, which keeps its size
+    proportional to the number of distinct pages rather than the trace
+    length.
+    """
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self):
+        self.accesses = 0
+        self.cold_misses = 0
+        self.histogram = [0]  # distance -> number of accesses (index 0 unused)
+        self._last_slot = {}  # page -> slot of its most recent access
+        self._capacity = self.MIN_CAPACITY
+        self._tree = FenwickTree(self._capacity)
+        self._next_slot = 0
+
+    def access(self, page):
+        """
+        Record an access
+
+        Args:
+            page (int): Page number accessed
+
+        Returns:
+            int: Stack distance, or None for the first access to the page
+        """
+        self.accesses += 1
+        slot = self._last_slot.get(page)
+        if slot is None:
+            self.cold_misses += 1
+            distance = None
+        else:
+            distance = len(self._last_slot) - self._tree.prefix_sum(slot) + 1
+            self._tree.add(slot, -1)
+            del self._last_slot[page]
+            if distance >= len(self.histogram):
+                self.histogram.extend([0] * (distance + 1 - len(self.histogram)))
+            self.histogram[distance] += 1
+
+        if self._next_slot == self._capacity:
+            self._compact()
+        self._tree.add(self._next_slot, 1)
+        self._last_slot[page] = self._next_slot
+        self._next_slot += 1
+        return distance
+
+    def copy(self):
+        """
+        Copy the analysis for a forked simulation
+
+        The histogram, slot map and tree are flat containers of ints (and
+        immutable page keys), so each is copied whole in C.
+
+        Returns:
+            StackDistanceAnalyzer: Independent analyzer in the same state
+        """
+        clone = StackDistanceAnalyzer.__new__(StackDistanceAnalyzer)
+        clone.__dict__.update(self.__dict__)
+        clone.histogram = list(self.histogram)
+        clone._last_slot = dict(self._last_slot)
+        clone._tree = self._tree.copy()
+        return clone
+
+    def get_state(self):
+        """
+        Get the analysis as plain data for a snapshot
+
+        Only the order of the live slots matters, so pages are listed least
+        recently used first rather than with their slot numbers.
+
+        Returns:
+            dict: Access and cold miss counts, the distance histogram and
+                the pages in LRU order
+        """
+        return {
+            'accesses': self.accesses,
+            'cold_misses': self.cold_misses,
+            'histogram': array('q', self.histogram),
+            'pages': sorted(self._last_slot, key=self._last_slot.get)
+        }
+
+    def set_state(self, state):
+        """
+        Load get_state() data, renumbering the slots as _compact() does
+
+        Args:
+            state (dict): Output of get_state()
+        """
+        histogram = state['histogram']
+        pages = state['pages']
+        require(type(histogram) is array and len(histogram) >= 1, "invalid stack distance histogram")
+        require(type(pages) is list, "invalid stack distance pages")
+        self.accesses = checked_int(state['accesses'], 0)
+        self.cold_misses = checked_int(state['cold_misses'], 0)
+        self.histogram = list(histogram)
+        self._last_slot = {page: slot for slot, page in enumerate(pages)}
+        require(len(self._last_slot) == len(pages), "page listed twice")
+        self._compact()
+
+    def hit_counts(self):
+        """
+        Get LRU hit counts for every frame count that changes the result
+
+        Returns:
+            list: Entry k - 1 is the number of hits with k frames; frame
+                counts beyond the end all hit as often as the last entry
+        """
+        hits = []
+        total = 0
+        for count in self.histogram[1:]:
+            total += count
+            hits.append(total)
+        return hits
+
+    def hit_ratio_curve(self, max_frames=None, max_points=None):
+        """
+        Get the LRU hit ratio as a function of the number of frames
+
+        Args:
+            max_frames (int): Largest frame count to report (defaults to
+                the largest stack distance seen)
+            max_points (int): Sample at most this many evenly spaced frame
+                counts (the largest is always included)
+
+        Returns:
+            dict: 'frames' and matching 'hit_ratio' lists, plus the access
+                and cold miss counts
+        """
+        hits = self.hit_counts()
+        if max_frames is None:
+            max_frames = max(1, len(hits))
+
+        if max_points and max_frames > max_points:
+            frames = sorted({max(1, round(i * max_frames / max_points)) for i in range(1, max_points + 1)})
+        else:
+            frames = list(range(1, max_frames + 1))
+
+        all_hits = hits[-1] if hits else 0
+        accesses = max(1, self.accesses)
+        return {
+            'frames': frames,
+            'hit_ratio': [(hits[k - 1] if k <= len(hits) else all_hits) / accesses for k in frames],
+            'accesses': self.accesses,
+            'cold_misses': self.cold_misses,
+        }
+
+    def _compact(self):
+        """Renumber live slots 0..k-1 in access order and resize the tree"""
+        pages = sorted(self._last_slot, key=self._last_slot.get)
+        self._last_slot = {page: slot for slot, page in enumerate(pages)}
+        self._capacity = max(self.MIN_CAPACITY, 2 * len(pages))
+        self._tree = FenwickTree(self._capacity, ones=len(pages))
+        self._next_slot = len(pages)
+
+
+def stack_distances(pages):
+    """
+    Compute the stack distance of every access in a trace in O(n log n)
+
+    Args:
+        pages (iterable): Page numbers in access order
+
+    Returns:
+        list: Stack distance per access, None for first accesses
+    """
+    analyzer = StackDistanceAnalyzer()
+    return [analyzer.access(page) for page in pages]
+
+
+def lru_hit_curve(pages, max_frames=None, max_points=None):
+    """
+    Compute the LRU hit ratio of a trace for every frame count in one pass
+
+    Args:
+        pages (iterable): Page numbers in access order
+        max_frames (int): Largest frame count to report
+        max_points (int): Sample at most this many frame counts
+
+    Returns:
+        dict: As returned by StackDistanceAnalyzer.hit_ratio_curve()
+    """
+    analyzer = StackDistanceAnalyzer()
+    for page in pages:
+        analyzer.access(page)
+    return analyzer.hit_ratio_curve(max_frames=max_frames, max_points=max_points)
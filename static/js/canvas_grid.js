@@ -0,0 +1,268 @@
+/**
+ * Canvas renderer for large memory grids
+ *
+ * Each frame is one pixel of an offscreen image; the visible canvas shows
+ * that image scaled up (without smoothing) with zoom and pan. Updates only
+ * rewrite the pixels of changed frames and then blit the image once, so the
+ * cost per update does not depend on the number of frames.
+ */
+
+// Grids with more frames than this are drawn on a canvas instead of DOM cells
+const CANVAS_GRID_THRESHOLD = 2048;
+const CANVAS_GRID_HEIGHT = 400;
+const CANVAS_MAX_ZOOM = 64;
+
+// Frame colors as 0xAABBGGRR (little-endian RGBA pixels)
+const CANVAS_COLORS = {
+    free: 0xff575049,      // #495057
+    allocated: 0xff548719, // #198754
+    fault: 0xff4535dc      // #dc3545
+};
+
+// Renderer state for the current grid
+let canvasGrid = null;
+
+/**
+ * Check whether a state should be drawn with the canvas renderer
+ * @param {Object} state - Memory state
+ * @returns {boolean} - True above CANVAS_GRID_THRESHOLD frames
+ */
+function useCanvasGrid(state) {
+    return !!(state && Array.isArray(state.memory) && state.memory.length > CANVAS_GRID_THRESHOLD);
+}
+
+/**
+ * Create the canvas grid for a memory state
+ * @param {Object} state - Memory state
+ */
+function initializeCanvasGrid(state) {
+    const gridElement = document.getElementById('memory-grid');
+    if (!gridElement) {
+        console.error('Could not find memory-grid element');
+        return;
+    }
+
+    const frameCount = state.memory.length;
+    const width = Math.max(100, gridElement.clientWidth - 20);
+
+    // Square-ish pixels that fill the grid area at zoom 1
+    const baseCell = Math.max(1, Math.floor(Math.sqrt(width * CANVAS_GRID_HEIGHT / frameCount)));
+    const columns = Math.max(1, Math.min(frameCount, Math.floor(width / baseCell)));
+    const rows = Math.ceil(frameCount / columns);
+
+    const canvas = document.createElement('canvas');
+    canvas.className = 'memory-canvas';
+    canvas.style.width = `${width}px`;
+    canvas.style.height = `${CANVAS_GRID_HEIGHT}px`;
+    canvas.style.cursor = 'grab';
+    const ratio = window.devicePixelRatio || 1;
+    canvas.width = Math.floor(width * ratio);
+    canvas.height = Math.floor(CANVAS_GRID_HEIGHT * ratio);
+
+    const image = document.createElement('canvas');
+    image.width = columns;
+    image.height = rows;
+    const imageContext = image.getContext('2d');
+    const imageData = imageContext.createImageData(columns, rows);
+
+    const debugInfo = document.createElement('div');
+    debugInfo.className = 'memory-debug-info text-muted small mt-2';
+
+    gridElement.innerHTML = '';
+    gridElement.appendChild(canvas);
+    gridElement.appendChild(debugInfo);
+
+    canvasGrid = {
+        canvas,
+        context: canvas.getContext('2d'),
+        image,
+        imageContext,
+        imageData,
+        pixels: new Uint32Array(imageData.data.buffer),
+        debugInfo,
+        frameCount,
+        columns,
+        rows,
+        baseCell,
+        ratio,
+        zoom: 1,
+        panX: 0,
+        panY: 0,
+        faultTimer: null
+    };
+
+    for (let i = 0; i < frameCount; i++) {
+        canvasGrid.pixels[i] = frameColor(state.memory[i]);
+    }
+    canvasGrid.imageContext.putImageData(imageData, 0, 0);
+
+    attachCanvasGridEvents(canvasGrid);
+    drawCanvasGrid();
+    updateCanvasGridInfo(state);
+}
+
+/**
+ * Repaint the frames that changed and redraw the view
+ * @param {Object} state - Current memory state
+ * @param {Array} [changedFrames] - Indexes of frames that changed; all frames are repainted if omitted
+ */
+function updateCanvasGrid(state, changedFrames) {
+    if (!canvasGrid || canvasGrid.frameCount !== state.memory.length) {
+        initializeCanvasGrid(state);
+        return;
+    }
+
+    const grid = canvasGrid;
+    const indexes = Array.isArray(changedFrames) ? changedFrames : state.memory.keys();
+
+    // Track the rows touched so only that band of the image is uploaded
+    let firstRow = grid.rows;
+    let lastRow = -1;
+    for (const index of indexes) {
+        if (index < 0 || index >= grid.frameCount) continue;
+        grid.pixels[index] = frameColor(state.memory[index]);
+        const row = Math.floor(index / grid.columns);
+        if (row < firstRow) firstRow = row;
+        if (row > lastRow) lastRow = row;
+    }
+
+    // Flash the frame of a faulting access
+    const operations = state.operations;
+    const lastOp = operations && operations.length > 0 ? operations[operations.length - 1] : null;
+    if (lastOp && lastOp.type === 'access' && lastOp.result === 'fault' && typeof lastOp.address === 'number') {
+        const frameNum = Math.floor(lastOp.address / state.page_size);
+        if (frameNum >= 0 && frameNum < grid.frameCount) {
+            flashCanvasFrame(state, frameNum);
+            const row = Math.floor(frameNum / grid.columns);
+            firstRow = Math.min(firstRow, row);
+            lastRow = Math.max(lastRow, row);
+        }
+    }
+
+    if (lastRow >= firstRow) {
+        grid.imageContext.putImageData(grid.imageData, 0, 0, 0, firstRow, grid.columns, lastRow - firstRow + 1);
+        drawCanvasGrid();
+    }
+    updateCanvasGridInfo(state);
+}
+
+/**
+ * Paint a frame red for a moment, then restore its status color
+ * @param {Object} state - Current memory state
+ * @param {number} frameNum - Frame to flash
+ */
+function flashCanvasFrame(state, frameNum) {
+    const grid = canvasGrid;
+    grid.pixels[frameNum] = CANVAS_COLORS.fault;
+
+    setTimeout(() => {
+        if (canvasGrid !== grid) return;
+        // The state may have been replaced by a newer one meanwhile
+        const current = memoryState || state;
+        grid.pixels[frameNum] = frameColor(current.memory[frameNum]);
+        const row = Math.floor(frameNum / grid.columns);
+        grid.imageContext.putImageData(grid.imageData, 0, 0, 0, row, grid.columns, 1);
+        drawCanvasGrid();
+    }, 2000);
+}
+
+/**
+ * Draw the frame image onto the visible canvas at the current zoom and pan
+ */
+function drawCanvasGrid() {
+    const grid = canvasGrid;
+    if (!grid) return;
+
+    const ctx = grid.context;
+    const cell = grid.baseCell * grid.zoom * grid.ratio;
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.fillStyle = '#212529';
+    ctx.fillRect(0, 0, grid.canvas.width, grid.canvas.height);
+    ctx.imageSmoothingEnabled = false;
+    ctx.drawImage(grid.image, grid.panX * grid.ratio, grid.panY * grid.ratio, grid.columns * cell, grid.rows * cell);
+}
+
+/**
+ * Set up zoom (wheel), pan (drag), reset (double click) and frame tooltips
+ * @param {Object} grid - Renderer state
+ */
+function attachCanvasGridEvents(grid) {
+    const canvas = grid.canvas;
+    let dragStart = null;
+
+    canvas.addEventListener('wheel', event => {
+        event.preventDefault();
+        const rect = canvas.getBoundingClientRect();
+        const x = event.clientX - rect.left;
+        const y = event.clientY - rect.top;
+        const zoom = Math.min(CANVAS_MAX_ZOOM, Math.max(1, grid.zoom * (event.deltaY < 0 ? 1.25 : 0.8)));
+
+        // Keep the point under the cursor fixed while zooming
+        grid.panX = x - (x - grid.panX) * zoom / grid.zoom;
+        grid.panY = y - (y - grid.panY) * zoom / grid.zoom;
+        grid.zoom = zoom;
+        if (zoom === 1) {
+            grid.panX = 0;
+            grid.panY = 0;
+        }
+        drawCanvasGrid();
+    }, { passive: false });
+
+    canvas.addEventListener('mousedown', event => {
+        dragStart = { x: event.clientX - grid.panX, y: event.clientY - grid.panY };
+        canvas.style.cursor = 'grabbing';
+    });
+
+    window.addEventListener('mouseup', () => {
+        dragStart = null;
+        canvas.style.cursor = 'grab';
+    });
+
+    canvas.addEventListener('mousemove', event => {
+        if (dragStart) {
+            grid.panX = event.clientX - dragStart.x;
+            grid.panY = event.clientY - dragStart.y;
+            drawCanvasGrid();
+            return;
+        }
+
+        const rect = canvas.getBoundingClientRect();
+        const cell = grid.baseCell * grid.zoom;
+        const column = Math.floor((event.clientX - rect.left - grid.panX) / cell);
+        const row = Math.floor((event.clientY - rect.top - grid.panY) / cell);
+        const index = row * grid.columns + column;
+        if (column >= 0 && column < grid.columns && index >= 0 && index < grid.frameCount && memoryState) {
+            const frame = memoryState.memory[index] || { status: 'free' };
+            canvas.title = frame.status === 'allocated'
+                ? `Frame ${index} (allocated to process ${frame.id})`
+                : `Frame ${index} (${frame.status})`;
+        } else {
+            canvas.title = '';
+        }
+    });
+
+    canvas.addEventListener('dblclick', () => {
+        grid.zoom = 1;
+        grid.panX = 0;
+        grid.panY = 0;
+        drawCanvasGrid();
+    });
+}
+
+/**
+ * Update the text below the canvas
+ * @param {Object} state - Current memory state
+ */
+function updateCanvasGridInfo(state) {
+    canvasGrid.debugInfo.textContent = `Memory size: ${state.memory_size} bytes, Page size: ${state.page_size} bytes, ` +
+        `Frames: ${state.memory.length} (scroll to zoom, drag to pan, double-click to reset)`;
+}
+
+/**
+ * Get the pixel color of a frame
+ * @param {Object} frame - Frame data
+ * @returns {number} - 32-bit RGBA pixel
+ */
+function frameColor(frame) {
+    return frame && frame.status === 'allocated' ? CANVAS_COLORS.allocated : CANVAS_COLORS.free;
+}
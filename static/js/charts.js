@@ -9,6 +9,7 @@ let utilizationData = {
     allocated: [],
     free: []
 };
+let lruCurveChart = null;
 
 /**
  * Initialize the memory utilization chart
@@ -272,3 +273,105 @@ function resetUtilizationChart() {
         console.error('Error in resetUtilizationChart:', error);
     }
 }
+
+/**
+ * Initialize the LRU hit ratio curve chart
+ */
+function initLruCurveChart() {
+    try {
+        const canvas = document.getElementById('lru-curve-chart');
+        if (!canvas) {
+            console.error('Cannot find lru-curve-chart canvas element');
+            return;
+        }
+        
+        if (typeof Chart === 'undefined') {
+            console.error('Chart.js is not loaded. Please check the script inclusion.');
+            return;
+        }
+        
+        if (lruCurveChart) {
+            try {
+                lruCurveChart.destroy();
+            } catch (error) {
+                console.error('Error destroying existing LRU curve chart:', error);
+            }
+        }
+        
+        lruCurveChart = new Chart(canvas.getContext('2d'), {
+            type: 'line',
+            data: {
+                labels: [],
+                datasets: [
+                    {
+                        label: 'LRU Hit Ratio (%)',
+                        data: [],
+                        borderColor: 'rgba(13, 110, 253, 0.9)',
+                        backgroundColor: 'rgba(13, 110, 253, 0.2)',
+                        fill: true,
+                        pointRadius: 0,
+                        stepped: true
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                animation: false,
+                scales: {
+                    x: {
+                        title: {
+                            display: true,
+                            text: 'Frames'
+                        }
+                    },
+                    y: {
+                        beginAtZero: true,
+                        max: 100
+                    }
+                }
+            }
+        });
+    } catch (error) {
+        console.error('Error initializing LRU curve chart:', error);
+    }
+}
+
+/**
+ * Update the LRU curve chart
+ * @param {Object} curve - Curve from /api/lru_curve (frames and hit_ratio lists)
+ */
+function updateLruCurveChart(curve) {
+    try {
+        if (!curve || !Array.isArray(curve.frames)) {
+            console.warn('Cannot update LRU curve chart: invalid curve', curve);
+            return;
+        }
+        
+        if (!lruCurveChart) {
+            initLruCurveChart();
+            if (!lruCurveChart) return;
+        }
+        
+        lruCurveChart.data.labels = curve.frames;
+        lruCurveChart.data.datasets[0].data = curve.hit_ratio.map(ratio => parseFloat((ratio * 100).toFixed(1)));
+        lruCurveChart.update();
+    } catch (error) {
+        console.error('Error updating LRU curve chart:', error);
+    }
+}
+
+/**
+ * Reset the LRU curve chart
+ */
+function resetLruCurveChart() {
+    try {
+        if (lruCurveChart) {
+            lruCurveChart.data.labels = [];
+            lruCurveChart.data.datasets[0].data = [];
+            lruCurveChart.update();
+        }
+    } catch (error) {
+        console.error('Error resetting LRU curve chart:', error);
+    }
+}
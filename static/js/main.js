@@ -10,10 +10,15 @@ const operationSelect = document.getElementById('operation');
 const allocateInput = document.querySelector('.allocate-input');
 const addressInput = document.querySelector('.address-input');
 const executeBtn = operationForm.querySelector('button[type="submit"]');
+const autoRunForm = document.getElementById('auto-run-form');
+const autoRunBtn = document.getElementById('auto-run-btn');
+const autoStopBtn = document.getElementById('auto-stop-btn');
 
 // State variables
 let simulationActive = false;
 let memoryState = null;
+let lruCurveEnabled = false;
+let autoRunController = null;
 
 // Initialize the page
 document.addEventListener('DOMContentLoaded', function() {
@@ -45,6 +50,23 @@ function initEventListeners() {
     operationSelect.addEventListener('change', function() {
         updateOperationForm();
     });
+    
+    // Auto run form submit - Stream a whole workload
+    autoRunForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        startAutoRun();
+    });
+    
+    autoStopBtn.addEventListener('click', function() {
+        stopAutoRun();
+    });
+    
+    // Workload change - Toggle between access count and trace file
+    document.getElementById('auto-workload').addEventListener('change', function() {
+        const uploaded = this.value === 'trace';
+        document.querySelector('.auto-count-input').classList.toggle('d-none', uploaded);
+        document.querySelector('.auto-trace-input').classList.toggle('d-none', !uploaded);
+    });
 }
 
 /**
@@ -67,6 +89,8 @@ async function startSimulation() {
     }
     
     const algorithm = document.getElementById('algorithm').value;
+    const fit = document.getElementById('fit').value;
+    const stackAnalysis = document.getElementById('stack-analysis').checked;
     
     // Validate input
     if (isNaN(memorySize) || memorySize <= 0) {
@@ -99,7 +123,9 @@ async function startSimulation() {
                 technique,
                 memory_size: memorySize,
                 page_size: pageSize,
-                algorithm
+                algorithm,
+                fit,
+                stack_analysis: stackAnalysis
             })
         });
         
@@ -117,9 +143,11 @@ async function startSimulation() {
         if (data.status === 'success') {
             simulationActive = true;
             memoryState = data.initial_state;
+            lruCurveEnabled = stackAnalysis;
             
             // Update UI
             executeBtn.disabled = false;
+            autoRunBtn.disabled = false;
             showAlert('Simulation started successfully', 'success');
             
             // Initialize visualization with error handling
@@ -168,6 +196,7 @@ async function startSimulation() {
             
             try {
                 initUtilizationChart();
+                initLruCurveChart();
             } catch (e) {
                 console.error('Error initializing utilization chart:', e);
             }
@@ -239,7 +268,8 @@ async function executeOperation() {
             body: JSON.stringify({
                 operation,
                 size,
-                address
+                address,
+                since_version: memoryState ? memoryState.version : null
             })
         });
         
@@ -255,53 +285,7 @@ async function executeOperation() {
         const data = await response.json();
         
         if (data.status === 'success') {
-            memoryState = data.state;
-            
-            // Update UI with error handling for each component
-            try {
-                updateMemoryVisualization(memoryState);
-            } catch (e) {
-                console.error('Error updating memory visualization:', e);
-            }
-            
-            try {
-                updateMemoryInfo(memoryState);
-            } catch (e) {
-                console.error('Error updating memory info:', e);
-            }
-            
-            try {
-                updateAnalytics(memoryState);
-            } catch (e) {
-                console.error('Error updating analytics:', e);
-            }
-            
-            try {
-                updateUtilizationChart(memoryState);
-            } catch (e) {
-                console.error('Error updating utilization chart:', e);
-            }
-            
-            try {
-                if (memoryState.operations) {
-                    updateOperationLog(memoryState.operations);
-                }
-            } catch (e) {
-                console.error('Error updating operation log:', e);
-            }
-            
-            // Check for page fault and show indicator
-            try {
-                const lastOperation = memoryState.operations && memoryState.operations.length > 0 
-                    ? memoryState.operations[memoryState.operations.length - 1] 
-                    : null;
-                
-                if (lastOperation && lastOperation.type === 'access' && lastOperation.result === 'fault') {
-                    showPageFaultIndicator();
-                }
-            } catch (e) {
-                console.error('Error checking for page fault:', e);
-            }
+            renderServerState(data.state);
         } else {
             showAlert(`Error: ${data.message}`, 'danger');
         }
@@ -315,6 +299,246 @@ async function executeOperation() {
     }
 }
 
+/**
+ * Apply a state (full or delta) returned by the server and update the UI
+ * @param {Object} state - State from /api/next_step or /api/stream
+ */
+function renderServerState(state) {
+    const previousAccesses = memoryState ? memoryState.memory_accesses : 0;
+    
+    // Apply a delta on top of the current state, or take the full snapshot
+    let changedFrames = null;
+    if (state.delta && memoryState) {
+        changedFrames = applyStateDelta(memoryState, state);
+    } else {
+        memoryState = state;
+    }
+    
+    // Update UI with error handling for each component
+    try {
+        updateMemoryVisualization(memoryState, changedFrames);
+    } catch (e) {
+        console.error('Error updating memory visualization:', e);
+    }
+    
+    try {
+        updateMemoryInfo(memoryState);
+    } catch (e) {
+        console.error('Error updating memory info:', e);
+    }
+    
+    try {
+        updateAnalytics(memoryState);
+    } catch (e) {
+        console.error('Error updating analytics:', e);
+    }
+    
+    try {
+        updateUtilizationChart(memoryState);
+    } catch (e) {
+        console.error('Error updating utilization chart:', e);
+    }
+    
+    // The LRU curve only changes when there are new accesses
+    if (memoryState.memory_accesses !== previousAccesses) {
+        fetchLruCurve();
+    }
+    
+    try {
+        if (memoryState.operations) {
+            updateOperationLog(memoryState.operations);
+        }
+    } catch (e) {
+        console.error('Error updating operation log:', e);
+    }
+    
+    // Check for page fault and show indicator
+    try {
+        const lastOperation = memoryState.operations && memoryState.operations.length > 0 
+            ? memoryState.operations[memoryState.operations.length - 1] 
+            : null;
+        
+        if (lastOperation && lastOperation.type === 'access' && lastOperation.result === 'fault') {
+            showPageFaultIndicator();
+        }
+    } catch (e) {
+        console.error('Error checking for page fault:', e);
+    }
+}
+
+/**
+ * Run a generated or uploaded trace on the server and render the streamed
+ * updates (the server coalesces changes to at most N updates per second)
+ */
+async function startAutoRun() {
+    if (!simulationActive) {
+        showAlert('Please start a simulation first', 'warning');
+        return;
+    }
+    
+    const workload = document.getElementById('auto-workload').value;
+    const body = {
+        updates_per_second: parseFloat(document.getElementById('auto-updates').value) || 10,
+        ops_per_second: parseFloat(document.getElementById('auto-speed').value) || 0,
+        since_version: memoryState ? memoryState.version : null
+    };
+    
+    try {
+        if (workload === 'trace') {
+            const file = document.getElementById('auto-trace-file').files[0];
+            if (!file) {
+                showAlert('Please choose a trace file', 'warning');
+                return;
+            }
+            const trace = JSON.parse(await file.text());
+            body.operations = Array.isArray(trace) ? trace : trace.operations;
+        } else {
+            body.workload = workload;
+            body.count = parseInt(document.getElementById('auto-count').value) || 10000;
+        }
+    } catch (error) {
+        showAlert(`Invalid trace file: ${error.message}`, 'danger');
+        return;
+    }
+    
+    autoRunController = new AbortController();
+    setAutoRunning(true);
+    const progress = document.getElementById('auto-run-progress');
+    
+    try {
+        const response = await fetch('/api/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(body),
+            signal: autoRunController.signal
+        });
+        
+        if (!response.ok) {
+            const data = await response.json().catch(() => ({}));
+            throw new Error(data.message || `Server responded with ${response.status}`);
+        }
+        
+        // Parse the text/event-stream body: events are separated by blank lines
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const message = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                let event = 'message';
+                let data = '';
+                message.split('\n').forEach(line => {
+                    if (line.startsWith('event: ')) event = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                });
+                const payload = JSON.parse(data);
+                
+                if (event === 'error') {
+                    throw new Error(payload.message);
+                }
+                renderServerState(payload.state);
+                progress.textContent = `${payload.operations_run} operations, ${payload.errors} errors`;
+                if (event === 'done') {
+                    if (payload.timed_out) {
+                        showAlert('Auto run stopped at the server\'s time limit', 'warning');
+                    } else {
+                        showAlert('Auto run finished', 'success');
+                    }
+                }
+            }
+        }
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            showAlert(`Error during auto run: ${error.message}`, 'danger');
+            console.error('Error during auto run:', error);
+        }
+    } finally {
+        autoRunController = null;
+        setAutoRunning(false);
+    }
+}
+
+/**
+ * Stop a running auto run
+ */
+function stopAutoRun() {
+    if (autoRunController) {
+        autoRunController.abort();
+    }
+}
+
+/**
+ * Toggle the controls that must not be used while an auto run is streaming
+ * @param {boolean} running - Whether an auto run is in progress
+ */
+function setAutoRunning(running) {
+    autoRunBtn.disabled = running || !simulationActive;
+    autoStopBtn.disabled = !running;
+    executeBtn.disabled = running || !simulationActive;
+    resetBtn.disabled = running;
+}
+
+/**
+ * Fetch the LRU hit ratio curve for the current simulation and chart it
+ */
+async function fetchLruCurve() {
+    if (!lruCurveEnabled) {
+        return;
+    }
+    
+    try {
+        const response = await fetch('/api/lru_curve?points=100');
+        if (!response.ok) {
+            throw new Error(`Server responded with ${response.status}`);
+        }
+        
+        const data = await response.json();
+        if (data.status === 'success') {
+            updateLruCurveChart(data.curve);
+        }
+    } catch (error) {
+        console.error('Error fetching LRU curve:', error);
+    }
+}
+
+/**
+ * Apply a state delta from the server to the local memory state
+ * @param {Object} state - Local memory state to patch in place
+ * @param {Object} delta - Delta returned by /api/next_step
+ * @returns {Array} - Indexes of the frames that changed
+ */
+function applyStateDelta(state, delta) {
+    const changedFrames = [];
+    
+    delta.changed_frames.forEach(frame => {
+        state.memory[frame.index] = { status: frame.status, id: frame.id };
+        changedFrames.push(frame.index);
+    });
+    
+    Object.entries(delta.page_table).forEach(([processId, frames]) => {
+        state.page_table[processId] = frames;
+    });
+    delta.removed_processes.forEach(processId => {
+        delete state.page_table[processId];
+    });
+    
+    // Counters and recent operations are always sent in full
+    ['page_faults', 'memory_accesses', 'page_hits', 'operations', 'version'].forEach(key => {
+        state[key] = delta[key];
+    });
+    
+    return changedFrames;
+}
+
 /**
  * Reset the current simulation
  */
@@ -345,6 +569,7 @@ async function resetSimulation() {
             
             // Reset UI
             executeBtn.disabled = true;
+            autoRunBtn.disabled = true;
             showAlert('Simulation reset successfully', 'success');
             
             const gridElement = document.getElementById('memory-grid');
@@ -360,6 +585,7 @@ async function resetSimulation() {
             clearAnalytics();
             clearOperationLog();
             resetUtilizationChart();
+            resetLruCurveChart();
             
             // Enable simulation settings
             Array.from(simulationForm.elements).forEach(element => {
@@ -12,6 +12,13 @@ function initializeMemoryGrid(state) {
         return;
     }
     
+    // Large memories are drawn as pixels on a canvas (see canvas_grid.js)
+    if (useCanvasGrid(state)) {
+        initializeCanvasGrid(state);
+        return;
+    }
+    canvasGrid = null;
+    
     const gridElement = document.getElementById('memory-grid');
     if (!gridElement) {
         console.error('Could not find memory-grid element');
@@ -119,13 +126,19 @@ function createMemoryCell(index, frame) {
 /**
  * Update the memory visualization based on new state
  * @param {Object} state - Current memory state
+ * @param {Array} [changedFrames] - Indexes of frames that changed; all cells are updated if omitted
  */
-function updateMemoryVisualization(state) {
+function updateMemoryVisualization(state, changedFrames) {
     if (!state || !state.memory) {
         console.error('Invalid memory state received:', state);
         return;
     }
     
+    if (useCanvasGrid(state)) {
+        updateCanvasGrid(state, changedFrames);
+        return;
+    }
+    
     console.log('Updating memory visualization with state:', state);
     
     // Check if we need to completely reinitialize the grid
@@ -146,61 +159,13 @@ function updateMemoryVisualization(state) {
     }
     
     try {
-        // Update each cell with direct styling to ensure visibility
-        state.memory.forEach((frame, index) => {
-            if (index < cells.length) {
-                const cell = cells[index];
-                if (!cell) return; // Skip if cell doesn't exist
-                
-                // Check if state changed
-                const oldStatus = cell.className.replace('memory-cell ', '').replace(' fault', '').replace(' pulse', '');
-                const newStatus = frame.status || 'free';
-                
-                // Always update to ensure styles are applied
-                // Update class and content
-                cell.className = `memory-cell ${newStatus}`;
-                cell.textContent = newStatus === 'allocated' ? (frame.id || '') : '';
-                
-                // Ensure styles are applied directly
-                cell.style.display = 'inline-block';
-                cell.style.width = '30px';
-                cell.style.height = '30px';
-                cell.style.margin = '2px';
-                cell.style.textAlign = 'center';
-                cell.style.lineHeight = '30px';
-                cell.style.fontWeight = 'bold';
-                cell.style.fontSize = '0.8rem';
-                cell.style.borderRadius = '3px';
-                
-                // Apply color based on class
-                if (cell.classList.contains('free')) {
-                    cell.style.backgroundColor = '#495057'; // gray-700
-                    cell.style.color = '#adb5bd';
-                } else if (cell.classList.contains('allocated')) {
-                    cell.style.backgroundColor = '#198754'; // success
-                    cell.style.color = 'white';
-                } else if (cell.classList.contains('fault')) {
-                    cell.style.backgroundColor = '#dc3545'; // danger
-                    cell.style.color = 'white';
-                }
-                
-                // Animation for state change (only if state changed)
-                if (oldStatus !== newStatus || 
-                    (newStatus === 'allocated' && cell.textContent != frame.id)) {
-                    // Add a temporary border for visual indicator of change
-                    cell.style.border = '2px solid #fff';
-                    setTimeout(() => {
-                        try {
-                            if (cell) {
-                                cell.style.border = 'none';
-                            }
-                        } catch (e) {
-                            // Ignore errors in setTimeout callbacks
-                        }
-                    }, 1000);
-                }
+        // Update only the changed cells when the caller knows them
+        const indexes = Array.isArray(changedFrames) ? changedFrames : state.memory.keys();
+        for (const index of indexes) {
+            if (index < cells.length && cells[index]) {
+                updateMemoryCell(cells[index], state.memory[index]);
             }
-        });
+        }
         
         // Update memory debug info
         const debugInfo = document.querySelector('.memory-debug-info');
@@ -253,6 +218,61 @@ function updateMemoryVisualization(state) {
     }
 }
 
+/**
+ * Update a single memory cell to match its frame
+ * @param {HTMLElement} cell - Memory cell element
+ * @param {Object} frame - Frame data
+ */
+function updateMemoryCell(cell, frame) {
+    // Check if state changed
+    const oldStatus = cell.className.replace('memory-cell ', '').replace(' fault', '').replace(' pulse', '');
+    const newStatus = (frame && frame.status) || 'free';
+    const oldContent = cell.textContent;
+    
+    // Always update to ensure styles are applied
+    // Update class and content
+    cell.className = `memory-cell ${newStatus}`;
+    cell.textContent = newStatus === 'allocated' ? (frame.id || '') : '';
+    
+    // Ensure styles are applied directly
+    cell.style.display = 'inline-block';
+    cell.style.width = '30px';
+    cell.style.height = '30px';
+    cell.style.margin = '2px';
+    cell.style.textAlign = 'center';
+    cell.style.lineHeight = '30px';
+    cell.style.fontWeight = 'bold';
+    cell.style.fontSize = '0.8rem';
+    cell.style.borderRadius = '3px';
+    
+    // Apply color based on class
+    if (cell.classList.contains('free')) {
+        cell.style.backgroundColor = '#495057'; // gray-700
+        cell.style.color = '#adb5bd';
+    } else if (cell.classList.contains('allocated')) {
+        cell.style.backgroundColor = '#198754'; // success
+        cell.style.color = 'white';
+    } else if (cell.classList.contains('fault')) {
+        cell.style.backgroundColor = '#dc3545'; // danger
+        cell.style.color = 'white';
+    }
+    
+    // Animation for state change (only if state changed)
+    if (oldStatus !== newStatus || oldContent !== cell.textContent) {
+        // Add a temporary border for visual indicator of change
+        cell.style.border = '2px solid #fff';
+        setTimeout(() => {
+            try {
+                if (cell) {
+                    cell.style.border = 'none';
+                }
+            } catch (e) {
+                // Ignore errors in setTimeout callbacks
+            }
+        }, 1000);
+    }
+}
+
 /**
  * Update analytics with current memory state
  * @param {Object} state - Current memory state
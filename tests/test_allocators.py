@@ -0,0 +1,148 @@
+"""
+Checks of the buddy and segment allocators
+"""
+import random
+
+import pytest
+
+from buddy import BuddyAllocator
+from segmentation import FIT_STRATEGIES, SegmentAllocator
+
+
+def free_blocks(allocator):
+    """Free (start, length) blocks of a buddy allocator"""
+    return sorted((start, 1 << order) for order, free_list in enumerate(allocator._free_lists) for start in free_list)
+
+
+def test_buddy_split_and_merge():
+    allocator = BuddyAllocator(16)
+    assert allocator.allocate(3) == (0, 4)
+    assert free_blocks(allocator) == [(4, 4), (8, 8)]
+    assert allocator.allocate(1) == (4, 1)
+    assert free_blocks(allocator) == [(5, 1), (6, 2), (8, 8)]
+    assert allocator.allocate(16) is None
+
+    allocator.free(0, 4)
+    assert free_blocks(allocator) == [(0, 4), (5, 1), (6, 2), (8, 8)]
+    allocator.free(4, 1)
+    assert free_blocks(allocator) == [(0, 16)]
+    assert (allocator.hole_count, allocator.largest_hole) == (1, 16)
+
+
+def test_buddy_non_power_of_two_memory():
+    allocator = BuddyAllocator(13)
+    assert free_blocks(allocator) == [(0, 8), (8, 4), (12, 1)]
+    assert allocator.allocate(5) == (0, 8)
+    allocator.free(0, 8)
+    # 8 and 12 are not buddies of anything in range, so nothing merges
+    assert free_blocks(allocator) == [(0, 8), (8, 4), (12, 1)]
+
+
+@pytest.mark.parametrize('total_frames', [64, 100])
+def test_buddy_random_blocks(total_frames):
+    rng = random.Random(total_frames)
+    allocator = BuddyAllocator(total_frames)
+    initial = free_blocks(allocator)
+    blocks = []
+    for _ in range(2000):
+        if blocks and rng.random() < 0.45:
+            allocator.free(*blocks.pop(rng.randrange(len(blocks))))
+        else:
+            block = allocator.allocate(rng.randint(1, 12))
+            if block is not None:
+                blocks.append(block)
+
+        used = [0] * total_frames
+        for start, length in blocks + free_blocks(allocator):
+            assert start % length == 0  # Blocks are aligned to their size
+            for frame_idx in range(start, start + length):
+                used[frame_idx] += 1
+        assert used == [1] * total_frames  # Free and allocated blocks tile memory
+
+    for block in blocks:
+        allocator.free(*block)
+    assert free_blocks(allocator) == initial
+
+
+class ReferenceSegments:
+    """Holes kept in a plain dict, searched linearly"""
+
+    def __init__(self, total_frames, fit):
+        self.fit = fit
+        self.holes = {0: total_frames}
+        self.cursor = 0
+
+    def allocate(self, num_frames):
+        fitting = sorted((start, length) for start, length in self.holes.items() if length >= num_frames)
+        if not fitting:
+            return None
+        if self.fit == 'first':
+            start = fitting[0][0]
+        elif self.fit == 'best':
+            start = min(fitting, key=lambda hole: (hole[1], hole[0]))[0]
+        elif self.fit == 'worst':
+            start = min(fitting, key=lambda hole: (-hole[1], hole[0]))[0]
+        else:
+            after = [hole for hole in fitting if hole[0] >= self.cursor]
+            start = (after or fitting)[0][0]
+        length = self.holes.pop(start)
+        if length > num_frames:
+            self.holes[start + num_frames] = length - num_frames
+        self.cursor = start + num_frames
+        return start, num_frames
+
+    def free(self, start, num_frames):
+        self.holes[start] = num_frames
+        merged = {}
+        for hole_start in sorted(self.holes):
+            previous = max(merged) if merged else None
+            if previous is not None and previous + merged[previous] == hole_start:
+                merged[previous] += self.holes[hole_start]
+            else:
+                merged[hole_start] = self.holes[hole_start]
+        self.holes = merged
+
+
+@pytest.mark.parametrize('fit', FIT_STRATEGIES)
+def test_segments_match_linear_search(fit):
+    rng = random.Random(fit)
+    total_frames = 300
+    allocator = SegmentAllocator(total_frames, fit)
+    reference = ReferenceSegments(total_frames, fit)
+    segments = []
+    for _ in range(3000):
+        if segments and rng.random() < 0.45:
+            segment = segments.pop(rng.randrange(len(segments)))
+            allocator.free(*segment)
+            reference.free(*segment)
+        else:
+            num_frames = rng.randint(1, 40)
+            segment = allocator.allocate(num_frames)
+            assert segment == reference.allocate(num_frames)
+            if segment is not None:
+                segments.append(segment)
+        assert allocator._holes_by_start == reference.holes
+        assert allocator.hole_count == len(reference.holes)
+        assert allocator.largest_hole == max(reference.holes.values(), default=0)
+
+
+def test_unknown_fit_is_rejected():
+    with pytest.raises(ValueError):
+        SegmentAllocator(10, 'exact')
+
+
+@pytest.mark.parametrize('num_frames', [0, -3])
+def test_segment_lengths_must_be_positive(num_frames):
+    allocator = SegmentAllocator(10)
+    with pytest.raises(ValueError):
+        allocator.allocate(num_frames)
+    assert allocator._holes_by_start == {0: 10}
+
+
+@pytest.mark.parametrize('num_frames', [0, -3])
+def test_buddy_lengths_must_be_positive(num_frames):
+    allocator = BuddyAllocator(16)
+    with pytest.raises(ValueError):
+        allocator.allocate(num_frames)
+    assert allocator.hole_count == 1
+    assert allocator.largest_hole == 16
@@ -0,0 +1,196 @@
+"""
+Request validation checks for the Flask endpoints
+"""
+import logging
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    logging.disable(logging.CRITICAL)
+    with app_module.app.test_client() as client:
+        yield client
+    logging.disable(logging.NOTSET)
+
+
+def start_simulation(client, **options):
+    config = {'technique': 'paging', 'memory_size': 1024, 'page_size': 64, 'algorithm': 'FIFO'}
+    config.update(options)
+    response = client.post('/api/start_simulation', json=config)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_run_workload(client):
+    start_simulation(client)
+    response = client.post('/api/run_workload', json={'workload': 'zipfian', 'count': 500, 'seed': 1})
+    assert response.status_code == 200
+    assert response.get_json()['results']['memory_accesses'] == 500
+
+
+@pytest.mark.parametrize('params', [
+    {'num_pages': 10 ** 11},
+    {'num_pages': 0},
+    {'phases': 10 ** 9},
+    {'phases': 0},
+    {'alpha': -50},
+    {'alpha': 'nan'},
+    {'seed': -1},
+    {'stride': 10 ** 30},
+    {'working_set': 'many'},
+])
+def test_run_workload_rejects_out_of_range_options(client, params):
+    start_simulation(client)
+    response = client.post('/api/run_workload', json={'workload': 'phases', 'count': 100, **params})
+    assert response.status_code == 400
+
+
+def test_stream_rejects_out_of_range_options(client):
+    start_simulation(client)
+    response = client.get('/api/stream?workload=phases&count=100&phases=1000000000')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('query', ['ops_per_second=0.000001', 'ops_per_second=-1', 'updates_per_second=0.001'])
+def test_stream_rejects_slow_rates(client, query):
+    start_simulation(client)
+    response = client.get(f'/api/stream?workload=uniform&count=10&{query}')
+    assert response.status_code == 400
+
+
+def test_stream_stops_at_time_limit(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'MAX_STREAM_SECONDS', 0.2)
+    start_simulation(client)
+    response = client.get('/api/stream?workload=uniform&count=100&ops_per_second=20')
+    events = [line for line in response.get_data(as_text=True).split('\n') if line.startswith('event: ')]
+    assert events[-1] == 'event: done'
+    assert '"timed_out": true' in response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize('size', [0, -100, 1.5, '64', None])
+def test_allocation_size_must_be_a_positive_integer(client, size):
+    start_simulation(client)
+    response = client.post('/api/next_step', json={'operation': 'allocate', 'size': size})
+    assert response.status_code == 400
+    operations = [{'operation': 'allocate', 'size': size}]
+    assert client.post('/api/run_trace', json={'operations': operations}).status_code == 400
+    assert client.post('/api/compare', json={'operations': operations}).status_code == 400
+
+
+@pytest.mark.parametrize('grid', [
+    {axis: list(range(1000)) for axis in ('memory_size', 'page_size', 'algorithm', 'fit', 'technique')},
+    {'algorithm': [['FIFO']]},
+    {'memory_size': [{'size': 1024}]},
+])
+def test_compare_rejects_invalid_grids(client, grid):
+    operations = [{'operation': 'access', 'address': 0}]
+    response = client.post('/api/compare', json={'operations': operations, 'grid': grid})
+    assert response.status_code == 400
+
+
+def test_traces_are_capped(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'MAX_TRACE_OPERATIONS', 2)
+    start_simulation(client)
+    operations = [{'operation': 'access', 'address': 0}] * 3
+    assert client.post('/api/run_trace', json={'operations': operations}).status_code == 400
+    assert client.post('/api/compare', json={'operations': operations}).status_code == 400
+    assert client.post('/api/run_trace', json={'operations': operations[:2]}).status_code == 200
+
+
+def test_memory_size_is_capped(client):
+    page_size = 64
+    response = client.post('/api/start_simulation', json={
+        'technique': 'paging', 'algorithm': 'FIFO', 'page_size': page_size,
+        'memory_size': (app_module.MAX_TOTAL_FRAMES + 1) * page_size,
+    })
+    assert response.status_code == 400
+    start_simulation(client, memory_size=app_module.MAX_TOTAL_FRAMES * page_size, page_size=page_size)
+
+
+def test_analyses_are_opt_in(client):
+    start_simulation(client)
+    assert client.get('/api/lru_curve').status_code == 400
+    response = client.post('/api/next_step', json={'operation': 'access', 'address': 0})
+    assert response.get_json()['analytics']['working_set'] is None
+
+    start_simulation(client, stack_analysis=True, working_set_window=100)
+    assert client.get('/api/lru_curve').status_code == 200
+    response = client.post('/api/next_step', json={'operation': 'access', 'address': 0})
+    assert response.get_json()['analytics']['working_set'] is not None
+
+
+@pytest.mark.parametrize('options', [
+    {'stack_analysis': 'yes'},
+    {'working_set_window': 0},
+    {'working_set_window': 10 ** 9},
+    {'working_set_window': '100'},
+])
+def test_start_rejects_invalid_analysis_options(client, options):
+    config = {'technique': 'paging', 'memory_size': 1024, 'page_size': 64, 'algorithm': 'FIFO', **options}
+    assert client.post('/api/start_simulation', json=config).status_code == 400
+
+
+def test_busy_simulation_returns_409(client, monkeypatch):
+    monkeypatch.setattr(app_module.simulations, 'lock_timeout', 0.05)
+    start_simulation(client)
+    with client.session_transaction() as session:
+        simulation_id = session['simulation_id']
+    with app_module.simulations.use(simulation_id):
+        response = client.post('/api/next_step', json={'operation': 'allocate', 'size': 64})
+        assert response.status_code == 409
+        stream = client.get('/api/stream?workload=uniform&count=10')
+        assert 'event: error' in stream.get_data(as_text=True)
+    assert client.post('/api/next_step', json={'operation': 'allocate', 'size': 64}).status_code == 200
+
+
+def test_snapshots_need_a_configured_secret(client):
+    start_simulation(client)
+    assert client.get('/api/snapshot').status_code == 403
+    assert client.post('/api/restore', data=b'anything').status_code == 403
+
+
+def test_snapshot_and_restore(client, monkeypatch):
+    monkeypatch.setattr(app_module.app, 'secret_key', 'test-secret')
+    start_simulation(client)
+    client.post('/api/next_step', json={'operation': 'allocate', 'size': 200})
+    snapshot = client.get('/api/snapshot').get_data()
+
+    client.post('/api/next_step', json={'operation': 'allocate', 'size': 200})
+    response = client.post('/api/restore', data=snapshot)
+    assert response.status_code == 200
+    assert len(response.get_json()['state']['page_table']) == 1
+
+    tampered = snapshot[:-1] + bytes([snapshot[-1] ^ 1])
+    assert client.post('/api/restore', data=tampered).status_code == 400
+
+
+def test_tutorial_steps_keep_the_tutorial_configuration(client):
+    response = client.post('/api/tutorials/start', json={'tutorial_id': 'page_replacement'})
+    state = response.get_json()['tutorial_step']['memory_state']
+    assert (state['memory_size'], state['page_size'], state['algorithm']) == (512, 64, 'FIFO')
+
+    # Steps that only name an algorithm keep the rest of the first step's setup
+    states = [client.post('/api/tutorials/next').get_json()['tutorial_step'].get('memory_state') for _ in range(3)]
+    assert (states[0]['memory_size'], states[0]['total_frames'], states[0]['algorithm']) == (512, 8, 'FIFO')
+    assert states[1] is None
+    assert (states[2]['memory_size'], states[2]['total_frames'], states[2]['algorithm']) == (512, 8, 'LRU')
+
+    response = client.post('/api/next_step', json={'operation': 'allocate', 'size': 512})
+    assert response.get_json()['state']['page_faults'] == 0
+
+
+@pytest.mark.parametrize('payload', [
+    [1, 2],
+    {'operation_data': 'allocate'},
+    {'operation_data': ['allocate', 128]},
+    {'operation_data': {'type': 'allocate', 'size': 'lots'}},
+])
+def test_tutorial_rejects_malformed_operations(client, payload):
+    client.post('/api/tutorials/start', json={'tutorial_id': 'intro'})
+    client.post('/api/tutorials/next')  # To the step that expects a 128-byte allocation
+    assert client.post('/api/tutorials/next', json=payload).status_code == 400
+    response = client.post('/api/tutorials/next', json={'operation_data': {'type': 'allocate', 'size': 128}})
+    assert response.status_code == 200
@@ -0,0 +1,101 @@
+"""
+Checks of FrameTable against a plain list of frame owners
+"""
+import random
+
+import pytest
+
+from frame_table import BLOCK_SIZE, CHUNK_SIZE, FrameTable
+
+# Spans a chunk boundary and ends in a partial chunk and a partial block
+TOTAL_FRAMES = CHUNK_SIZE + BLOCK_SIZE + 37
+
+
+def free_runs(owners):
+    """Number of maximal runs of free frames"""
+    return sum(1 for i, owner in enumerate(owners) if owner is None and (i == 0 or owners[i - 1] is not None))
+
+
+def assert_matches(table, owners):
+    assert table.free_count == owners.count(None)
+    assert table.allocated_count == len(owners) - owners.count(None)
+    assert table.free_runs == free_runs(owners)
+    free = [i for i, owner in enumerate(owners) if owner is None]
+    assert table.lowest_free(50) == free[:50]
+    allocated = [i for i, owner in enumerate(owners) if owner is not None]
+    assert table.first_allocated() == (allocated[0] if allocated else None)
+
+
+def random_writes(table, owners, rng, count):
+    # Mostly around the chunk boundary and the ends, where neighbours cross chunks
+    hot = [0, 1, CHUNK_SIZE - 2, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, TOTAL_FRAMES - 2, TOTAL_FRAMES - 1]
+    for _ in range(count):
+        if rng.random() < 0.3:
+            frame_idx = rng.choice(hot)
+        else:
+            frame_idx = rng.randrange(len(owners))
+        if rng.random() < 0.55:
+            process_id = rng.randint(1, 9)
+            table.allocate(frame_idx, process_id)
+            owners[frame_idx] = process_id
+        else:
+            table.free(frame_idx)
+            owners[frame_idx] = None
+
+
+def test_new_table_is_free():
+    table = FrameTable(TOTAL_FRAMES)
+    assert_matches(table, [None] * TOTAL_FRAMES)
+    assert FrameTable(0).free_runs == 0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_counters_match_brute_force(seed):
+    rng = random.Random(seed)
+    table = FrameTable(TOTAL_FRAMES)
+    owners = [None] * TOTAL_FRAMES
+    for _ in range(40):
+        random_writes(table, owners, rng, 100)
+        assert_matches(table, owners)
+    assert [frame['id'] for frame in table] == owners
+    assert [table.owner(i) for i in range(TOTAL_FRAMES)] == owners
+
+
+def test_allocating_twice_and_freeing_twice_is_idempotent():
+    table = FrameTable(8)
+    table.allocate(3, 1)
+    table.allocate(3, 2)
+    assert (table.free_count, table.free_runs, table.owner(3)) == (7, 2, 2)
+    table.free(3)
+    table.free(3)
+    assert (table.free_count, table.free_runs, table.owner(3)) == (8, 1, None)
+
+
+def test_drain_changes():
+    table = FrameTable(8)
+    table.allocate(1, 1)
+    table.free(5)
+    assert table.drain_changes() == {1, 5}
+    assert table.drain_changes() == set()
+
+
+def test_fork_copies_on_write():
+    rng = random.Random(7)
+    table = FrameTable(TOTAL_FRAMES)
+    owners = [None] * TOTAL_FRAMES
+    random_writes(table, owners, rng, 2000)
+
+    clone = table.fork()
+    clone_owners = list(owners)
+    assert table.shared_chunks == clone.shared_chunks == 2
+
+    clone.allocate(0, 42)
+    clone_owners[0] = 42
+    assert clone.shared_chunks == 1 and table.shared_chunks == 2
+
+    random_writes(table, owners, rng, 1000)
+    random_writes(clone, clone_owners, rng, 1000)
+    assert_matches(table, owners)
+    assert_matches(clone, clone_owners)
+    assert [frame['id'] for frame in table] == owners
+    assert [frame['id'] for frame in clone] == clone_owners
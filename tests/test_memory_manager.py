@@ -0,0 +1,184 @@
+"""
+End-to-end checks of MemoryManager
+"""
+import json
+import logging
+import os
+import pickle
+import random
+import zlib
+
+import pytest
+
+from memory_manager import SNAPSHOT_MAGIC, MemoryManager
+from replacement_policies import REPLACEMENT_ALGORITHMS
+
+# Options that give a simulation every optional component
+COMPONENT_OPTIONS = dict(memory_size=4096, page_size=64, stack_analysis=True, working_set_window=100,
+                        translation={'levels': 2, 'address_bits': 16, 'tlb_entries': 8, 'tlb_ways': 2,
+                                     'tlb_policy': 'RANDOM'})
+
+# Traces run through the original MemoryManager (before the replacement
+# policy rewrite) with its per-operation results and final state
+RECORDED_TRACES = os.path.join(os.path.dirname(__file__), 'data', 'fifo_lru_traces.json')
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def replay(manager, operations):
+    methods = {
+        'allocate': manager.allocate_memory,
+        'deallocate': manager.deallocate_memory,
+        'access': manager.access_memory
+    }
+    results = []
+    for operation, argument in operations:
+        try:
+            results.append(methods[operation](argument))
+        except ValueError as e:
+            results.append({'error': str(e)})
+    return results
+
+
+def random_operations(seed, memory_size, count=300):
+    rng = random.Random(seed)
+    operations = []
+    for _ in range(count):
+        r = rng.random()
+        if r < 0.3:
+            operations.append(('allocate', rng.randint(1, memory_size // 4)))
+        elif r < 0.45:
+            operations.append(('deallocate', rng.randrange(memory_size)))
+        else:
+            operations.append(('access', rng.randrange(memory_size)))
+    return operations
+
+
+def replay_virtual(manager, seed, count=200):
+    rng = random.Random(seed)
+    results = []
+    for _ in range(count):
+        try:
+            results.append(manager.access_virtual(rng.randrange(1, manager.next_id), rng.randrange(1024)))
+        except ValueError as e:
+            results.append({'error': str(e)})
+    return results
+
+
+def final_state(manager):
+    return (
+        [frame['id'] for frame in manager.memory],
+        {pid: list(frames) for pid, frames in manager.page_table.items()},
+        manager.get_results()
+    )
+
+
+def load_recorded_traces():
+    with open(RECORDED_TRACES) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('case', load_recorded_traces(),
+                         ids=lambda case: f"{case['algorithm']}-{case['memory_size']}-{case['page_size']}")
+def test_fifo_lru_match_recorded_traces(case):
+    manager = MemoryManager(memory_size=case['memory_size'], page_size=case['page_size'], algorithm=case['algorithm'])
+    assert replay(manager, case['operations']) == case['results']
+    assert (manager.page_faults, manager.page_hits) == (case['page_faults'], case['page_hits'])
+    assert [frame['id'] for frame in manager.memory] == case['owners']
+    assert {str(pid): frames for pid, frames in manager.page_table.items()} == case['page_table']
+
+
+@pytest.mark.parametrize('technique', ['paging', 'segmentation', 'buddy'])
+@pytest.mark.parametrize('size', [0, -100])
+def test_allocation_sizes_must_be_positive(technique, size):
+    manager = MemoryManager(memory_size=1024, page_size=64, technique=technique)
+    with pytest.raises(ValueError):
+        manager.allocate_memory(size)
+    assert manager.page_table == {}
+    assert manager.memory.free_count == manager.total_frames
+    assert manager.internal_fragmentation == 0
+    assert manager.allocate_memory(64) == 0
+
+
+@pytest.mark.parametrize('technique, algorithm', [('paging', algorithm) for algorithm in REPLACEMENT_ALGORITHMS]
+                         + [('segmentation', 'FIFO'), ('buddy', 'FIFO')])
+def test_fork_branches_independently(technique, algorithm):
+    options = dict(technique=technique, algorithm=algorithm, **COMPONENT_OPTIONS)
+    operations = random_operations(1, 4096)
+    branch_operations = random_operations(2, 4096)
+
+    def run_branch(simulation):
+        return replay(simulation, branch_operations) + replay_virtual(simulation, 4)
+
+    manager = MemoryManager(**options)
+    replay(manager, operations)
+    replay_virtual(manager, 3)
+    fork = manager.fork()
+
+    expected = MemoryManager(**options)
+    replay(expected, operations)
+    replay_virtual(expected, 3)
+    expected_results = run_branch(expected)
+
+    # The fork runs the branch like an unforked simulation would, and the
+    # original is untouched by it and can run the same branch itself
+    assert run_branch(fork) == expected_results
+    assert final_state(fork) == final_state(expected)
+    assert fork.get_analytics() == expected.get_analytics()
+    assert fork.get_lru_curve() == expected.get_lru_curve()
+    assert run_branch(manager) == expected_results
+    assert final_state(manager) == final_state(expected)
+    assert manager.get_analytics() == expected.get_analytics()
+
+
+@pytest.mark.parametrize('technique, algorithm', [('paging', algorithm) for algorithm in REPLACEMENT_ALGORITHMS]
+                         + [('segmentation', 'FIFO'), ('buddy', 'FIFO')])
+def test_snapshot_restores_every_component(technique, algorithm):
+    manager = MemoryManager(technique=technique, algorithm=algorithm, **COMPONENT_OPTIONS)
+    operations = random_operations(1, 4096)
+    branch_operations = random_operations(2, 4096)
+    if manager.policy is not None:
+        # Gives OPT next uses that reach past the snapshot
+        future = manager._access_frames(argument for operation, argument in operations + branch_operations
+                                        if operation == 'access')
+        manager.policy.prepare_trace(future, 0)
+    replay(manager, operations)
+    replay_virtual(manager, 3)
+
+    restored = MemoryManager.restore(manager.snapshot())
+    assert final_state(restored) == final_state(manager)
+    assert restored.get_analytics() == manager.get_analytics()
+
+    # Both continue identically, down to the TLB's random victims
+    assert replay(restored, branch_operations) == replay(manager, branch_operations)
+    assert replay_virtual(restored, 4) == replay_virtual(manager, 4)
+    assert final_state(restored) == final_state(manager)
+    assert restored.get_analytics() == manager.get_analytics()
+    assert restored.get_lru_curve() == manager.get_lru_curve()
+    assert restored.operations.recent(50) == manager.operations.recent(50)
+    assert restored.operations.total == manager.operations.total
+
+
+def test_restore_rejects_anything_but_a_snapshot():
+    manager = MemoryManager(**COMPONENT_OPTIONS)
+    replay(manager, random_operations(1, 4096))
+    data = manager.snapshot()
+
+    rejected = [
+        b'',
+        data[:len(data) // 2],
+        data + b'x',
+        data[:-8] + bytes(8),
+        # A pickle is never unpickled, even behind the right header
+        SNAPSHOT_MAGIC + zlib.compress(pickle.dumps(manager.get_results())),
+        SNAPSHOT_MAGIC + zlib.compress(b'l' + (0xFFFFFFFF).to_bytes(4, 'little')),
+        SNAPSHOT_MAGIC + zlib.compress(b'l\x01\x00\x00\x00' * 100 + b'N'),
+    ]
+    for payload in rejected:
+        with pytest.raises(ValueError):
+            MemoryManager.restore(payload)
@@ -0,0 +1,297 @@
+"""
+Behaviour checks for the page replacement policies
+
+Policies are driven directly as a cache of ``capacity`` pages, with page
+numbers standing in for frame numbers.
+"""
+import random
+
+import pytest
+
+from replacement_policies import (
+    ArcPolicy, ClockPolicy, LfuPolicy, OptimalPolicy, SecondChancePolicy,
+    REPLACEMENT_ALGORITHMS, create_policy
+)
+
+# Silberschatz's reference string and its fault counts with 3 frames
+TEXTBOOK_TRACE = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+
+class PageCache:
+    """A cache of ``capacity`` pages whose evictions are chosen by a policy"""
+
+    def __init__(self, policy, capacity, resident=()):
+        self.policy = policy
+        self.capacity = capacity
+        self.resident = set(resident)
+        self.time = 0
+
+    def access(self, page):
+        """
+        Access a page
+
+        Returns:
+            tuple: (True if it faulted, evicted page or None)
+        """
+        self.time += 1
+        if page in self.resident:
+            self.policy.on_hit(page, self.time)
+            return False, None
+        victim = None
+        if len(self.resident) == self.capacity:
+            victim = self.policy.select_victim()
+            self.resident.remove(victim)
+        self.resident.add(page)
+        self.policy.on_load(page, self.time)
+        return True, victim
+
+
+def run_cache(policy, trace, capacity):
+    """
+    Replay a page trace through a policy
+
+    Returns:
+        tuple: (number of faults, evicted pages in order)
+    """
+    cache = PageCache(policy, capacity)
+    faults = 0
+    victims = []
+    for page in trace:
+        faulted, victim = cache.access(page)
+        faults += faulted
+        if victim is not None:
+            victims.append(victim)
+    return faults, victims
+
+
+def belady_faults(trace, capacity):
+    """Brute-force Belady: evict the resident page used farthest in the future"""
+    resident = set()
+    faults = 0
+    for time, page in enumerate(trace):
+        if page in resident:
+            continue
+        faults += 1
+        if len(resident) == capacity:
+            def next_use(candidate):
+                for later in range(time + 1, len(trace)):
+                    if trace[later] == candidate:
+                        return later
+                return len(trace)
+            resident.remove(max(resident, key=next_use))
+        resident.add(page)
+    return faults
+
+
+def random_trace(rng, length, pages):
+    return [rng.randrange(pages) for _ in range(length)]
+
+
+@pytest.mark.parametrize('algorithm, expected_faults', [('FIFO', 15), ('LRU', 12)])
+def test_textbook_fault_counts(algorithm, expected_faults):
+    faults, _ = run_cache(create_policy(algorithm, 8), TEXTBOOK_TRACE, 3)
+    assert faults == expected_faults
+
+
+def test_fifo_victims_and_beladys_anomaly():
+    trace = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+    faults, victims = run_cache(create_policy('FIFO', 8), trace, 3)
+    assert faults == 9
+    assert victims == [1, 2, 3, 4, 1, 2]
+    assert run_cache(create_policy('FIFO', 8), trace, 4)[0] == 10
+
+
+def test_lru_victims():
+    _, victims = run_cache(create_policy('LRU', 8), TEXTBOOK_TRACE, 3)
+    assert victims == [7, 1, 2, 3, 0, 4, 0, 3, 2]
+
+
+def test_optimal_textbook():
+    policy = OptimalPolicy(8)
+    policy.prepare_trace(TEXTBOOK_TRACE, 0)
+    faults, victims = run_cache(policy, TEXTBOOK_TRACE, 3)
+    assert faults == 9
+    assert victims == [7, 1, 0, 4, 3, 2]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_optimal_matches_brute_force_belady(seed):
+    rng = random.Random(seed)
+    pages = rng.randint(3, 12)
+    capacity = rng.randint(1, pages - 1)
+    trace = random_trace(rng, 200, pages)
+    policy = OptimalPolicy(pages)
+    policy.prepare_trace(trace, 0)
+    assert run_cache(policy, trace, capacity)[0] == belady_faults(trace, capacity)
+
+
+def test_optimal_is_never_beaten():
+    rng = random.Random(1)
+    for _ in range(20):
+        trace = random_trace(rng, 150, 10)
+        policy = OptimalPolicy(10)
+        policy.prepare_trace(trace, 0)
+        optimal = run_cache(policy, trace, 4)[0]
+        for algorithm in REPLACEMENT_ALGORITHMS:
+            if algorithm != 'OPT':
+                assert run_cache(create_policy(algorithm, 10), trace, 4)[0] >= optimal
+
+
+def test_optimal_without_trace_behaves_like_lru():
+    rng = random.Random(5)
+    trace = random_trace(rng, 200, 10)
+    assert run_cache(OptimalPolicy(10), trace, 4) == run_cache(create_policy('LRU', 10), trace, 4)
+
+
+def test_clock_sweeps_reference_bits():
+    policy = ClockPolicy(4)
+    for frame_idx in (0, 1, 2):
+        policy.on_load(frame_idx, 0)
+    # Every bit is set, so the hand clears them all and comes back to 0
+    assert policy.select_victim() == 0
+    policy.on_hit(1, 0)
+    policy.on_load(3, 0)
+    # The hand is at 1: its bit is set again, 2's was cleared by the sweep
+    assert policy.select_victim() == 2
+    # 3 gets a second chance, 0 is empty and 1's bit is now clear
+    assert policy.select_victim() == 1
+    assert policy.select_victim() == 3
+    assert policy.select_victim() is None
+
+
+def test_clock_skips_removed_frames():
+    policy = ClockPolicy(4)
+    for frame_idx in range(4):
+        policy.on_load(frame_idx, 0)
+    policy.on_remove(0)
+    policy.on_remove(2)
+    assert policy.select_victim() == 1
+    assert policy.select_victim() == 3
+    assert policy.select_victim() is None
+
+
+def test_second_chance_requeues_referenced_pages():
+    policy = SecondChancePolicy(8)
+    for frame_idx in (0, 1, 2):
+        policy.on_load(frame_idx, 0)
+    policy.on_hit(0, 0)
+    assert policy.select_victim() == 1
+    assert policy.select_victim() == 2
+    assert policy.select_victim() == 0
+    assert policy.select_victim() is None
+
+
+def test_lfu_evicts_least_frequent_then_least_recent():
+    policy = LfuPolicy(8)
+    for frame_idx in (0, 1, 2):
+        policy.on_load(frame_idx, 0)
+    for frame_idx in (0, 0, 1):
+        policy.on_hit(frame_idx, 0)
+    assert policy.select_victim() == 2
+    policy.on_load(3, 0)
+    assert policy.select_victim() == 3
+    policy.on_load(4, 0)
+    policy.on_hit(4, 0)
+    # 1 and 4 were both used twice; 1 less recently
+    assert policy.select_victim() == 1
+    assert policy.select_victim() == 4
+    assert policy.select_victim() == 0
+    assert policy.select_victim() is None
+
+
+def test_lfu_reload_resets_count():
+    policy = LfuPolicy(8)
+    policy.on_load(0, 0)
+    for _ in range(5):
+        policy.on_hit(0, 0)
+    policy.on_load(1, 0)
+    policy.on_hit(1, 0)
+    policy.on_load(0, 0)  # Reloaded after being freed elsewhere
+    assert policy.select_victim() == 0
+
+
+def test_lfu_matches_brute_force():
+    rng = random.Random(2)
+    for _ in range(20):
+        trace = random_trace(rng, 200, 8)
+        policy = LfuPolicy(8)
+        counts = {}
+        last_use = {}
+        resident = set()
+        for time, page in enumerate(trace):
+            if page in resident:
+                policy.on_hit(page, time)
+                counts[page] += 1
+            else:
+                if len(resident) == 3:
+                    expected = min(resident, key=lambda p: (counts[p], last_use[p]))
+                    assert policy.select_victim() == expected
+                    resident.remove(expected)
+                resident.add(page)
+                policy.on_load(page, time)
+                counts[page] = 1
+            last_use[page] = time
+
+
+def test_arc_ghost_hits_adapt_target():
+    policy = ArcPolicy(3)
+    policy.on_load(1, 0)
+    policy.on_hit(1, 0)
+    policy.on_load(2, 0)
+    policy.on_load(3, 0)
+    assert policy.select_victim() == 2
+    policy.on_load(4, 0)
+    assert policy.select_victim() == 3
+    # 2 is a ghost in B1: T1 should have been larger
+    policy.on_load(2, 0)
+    assert policy.p == 1
+    assert list(policy._t2) == [1, 2]
+
+    # With one page in T1 (not above p) the victim comes from T2
+    assert policy.select_victim() == 1
+    policy.on_load(5, 0)
+    assert policy.select_victim() == 4
+    # 1 is a ghost in B2: T2 should have been larger
+    policy.on_load(1, 0)
+    assert policy.p == 0
+    assert list(policy._t2) == [2, 1]
+
+
+def test_arc_resists_scans():
+    policy = ArcPolicy(4)
+    trace = [100, 100, 101, 101] + list(range(20))
+    _, victims = run_cache(policy, trace, 4)
+    assert 100 not in victims and 101 not in victims
+
+
+def test_arc_directory_invariants():
+    rng = random.Random(3)
+    capacity = 6
+    policy = ArcPolicy(capacity)
+    cache = PageCache(policy, capacity)
+    for _ in range(3000):
+        cache.access(int(rng.paretovariate(1.2)) % 30)
+        t1, t2, b1, b2 = (set(getattr(policy, name)) for name in ('_t1', '_t2', '_b1', '_b2'))
+        assert t1 | t2 == cache.resident
+        assert not (t1 & t2) and not ((t1 | t2) & (b1 | b2)) and not (b1 & b2)
+        assert len(t1) + len(b1) <= capacity
+        assert len(t1) + len(t2) + len(b1) + len(b2) <= 2 * capacity
+        assert 0 <= policy.p <= capacity
+
+
+@pytest.mark.parametrize('algorithm', REPLACEMENT_ALGORITHMS)
+def test_copy_is_independent(algorithm):
+    rng = random.Random(4)
+    trace = random_trace(rng, 300, 12)
+    policy = create_policy(algorithm, 12)
+    policy.prepare_trace(trace, 0)
+    cache = PageCache(policy, 5)
+    for page in trace[:150]:
+        cache.access(page)
+
+    # The copy and the original evict the same pages when replayed one
+    # after the other, so neither run disturbed the other
+    clone = PageCache(policy.copy(), 5, cache.resident)
+    clone.time = cache.time
+    clone_results = [clone.access(page) for page in trace[150:]]
+    assert [cache.access(page) for page in trace[150:]] == clone_results
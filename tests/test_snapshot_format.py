@@ -0,0 +1,37 @@
+"""
+Checks of the snapshot encoding
+"""
+from array import array
+from collections import OrderedDict
+
+import pytest
+
+from snapshot_format import MAX_DEPTH, decode, encode
+
+
+def test_round_trip():
+    value = {
+        'none': None, 'flags': [True, False], 'small': -5, 'large': 1 << 100, 'negative': -(1 << 70),
+        'float': float('-inf'), 'text': 'páge', 'raw': b'\x00\xff',
+        (1, 2): ('tuple', 'key'), 3: [array('i', [1, -2]), array('q', [1 << 40]), array('B', b'ab'), array('d', [0.5])],
+    }
+    decoded = decode(encode(value))
+    assert decoded == value
+    assert type(decoded['flags']) is list and type(decoded[(1, 2)]) is tuple
+    assert [item.typecode for item in decoded[3]] == ['i', 'q', 'B', 'd']
+
+
+@pytest.mark.parametrize('value', [OrderedDict(), {1, 2}, object(), array('f', [1.0])])
+def test_only_plain_data_is_encoded(value):
+    with pytest.raises(TypeError):
+        encode([value])
+
+
+@pytest.mark.parametrize('data', [
+    b'', b'Q', b'i\x00', b'NN', b's\x02\x00\x00\x00\xff\xfe', b'ai\x03\x00\x00\x00abc',
+    b'm\x01\x00\x00\x00l\x00\x00\x00\x00N',  # List as a dict key
+    b'l\x01\x00\x00\x00' * (MAX_DEPTH + 1) + b'N',
+])
+def test_malformed_data_is_rejected(data):
+    with pytest.raises(ValueError):
+        decode(data)
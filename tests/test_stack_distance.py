@@ -0,0 +1,78 @@
+"""
+Checks of stack distance analysis against an explicit LRU stack
+"""
+import random
+
+import pytest
+
+from replacement_policies import create_policy
+from stack_distance import FenwickTree, StackDistanceAnalyzer, lru_hit_curve, stack_distances
+
+
+def brute_force_distances(pages):
+    stack = []  # Most recently used last
+    distances = []
+    for page in pages:
+        if page in stack:
+            distances.append(len(stack) - stack.index(page))
+            stack.remove(page)
+        else:
+            distances.append(None)
+        stack.append(page)
+    return distances
+
+
+def lru_hits(pages, frames):
+    policy = create_policy('LRU', 0)
+    resident = set()
+    hits = 0
+    for time, page in enumerate(pages):
+        if page in resident:
+            hits += 1
+            policy.on_hit(page, time)
+            continue
+        if len(resident) == frames:
+            resident.remove(policy.select_victim())
+        resident.add(page)
+        policy.on_load(page, time)
+    return hits
+
+
+def test_fenwick_prefix_sums():
+    rng = random.Random(0)
+    values = [1] * 10 + [0] * 30
+    tree = FenwickTree(len(values), ones=10)
+    for _ in range(500):
+        index = rng.randrange(len(values))
+        delta = rng.randint(-3, 3)
+        tree.add(index, delta)
+        values[index] += delta
+        probe = rng.randrange(len(values))
+        assert tree.prefix_sum(probe) == sum(values[:probe + 1])
+
+
+def test_distances_of_a_small_trace():
+    assert stack_distances([1, 2, 1, 3, 2, 2, 1]) == [None, None, 2, None, 3, 1, 3]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_distances_match_brute_force(seed):
+    rng = random.Random(seed)
+    # Long enough to renumber the tree's slots several times
+    pages = [rng.randrange(rng.choice((5, 50, 400))) for _ in range(5 * StackDistanceAnalyzer.MIN_CAPACITY)]
+    assert stack_distances(pages) == brute_force_distances(pages)
+
+
+def test_hit_curve_matches_lru_simulation():
+    rng = random.Random(4)
+    pages = [int(rng.paretovariate(1.0)) % 40 for _ in range(3000)]
+    curve = lru_hit_curve(pages, max_frames=45)
+    assert curve['accesses'] == len(pages)
+    assert curve['cold_misses'] == len(set(pages))
+    for frames, ratio in zip(curve['frames'], curve['hit_ratio']):
+        assert ratio == lru_hits(pages, frames) / len(pages)
+
+
+def test_hit_curve_sampling():
+    curve = lru_hit_curve([1, 2, 3, 1, 2, 3] * 10, max_frames=100, max_points=10)
+    assert len(curve['frames']) == 10 and curve['frames'][-1] == 100
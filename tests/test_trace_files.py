@@ -0,0 +1,45 @@
+"""
+Checks of trace file parsing and conversion
+"""
+import pytest
+
+from trace_files import convert_csv_to_binary, parse_address, read_trace
+
+
+@pytest.mark.parametrize('text, address', [
+    ('42', 42),
+    ('007', 7),
+    (' 0000000128 ', 128),
+    ('0x1f', 31),
+    ('0X00FF', 255),
+    ('-3', -3),
+])
+def test_parse_address(text, address):
+    assert parse_address(text) == address
+
+
+@pytest.mark.parametrize('text', ['', 'abc', '0x', '1.5', '0b101'])
+def test_parse_address_rejects_other_text(text):
+    with pytest.raises(ValueError):
+        parse_address(text)
+
+
+def test_convert_round_trip(tmp_path):
+    csv_path = tmp_path / 'trace.csv'
+    csv_path.write_text('time,address\n1,0000064\n2,0x80\n# comment\n3,007\n')
+    binary_path = tmp_path / 'trace.bin'
+    assert convert_csv_to_binary(str(csv_path), str(binary_path)) == 3
+    assert list(read_trace(str(binary_path))) == [64, 128, 7]
+    assert list(read_trace(str(csv_path))) == [64, 128, 7]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['trace.bin', 'trace.csv']
+
+
+def test_failed_convert_keeps_existing_output(tmp_path):
+    csv_path = tmp_path / 'trace.csv'
+    csv_path.write_text('1\n2\nbad\n')
+    binary_path = tmp_path / 'trace.bin'
+    binary_path.write_bytes(b'previous')
+    with pytest.raises(ValueError):
+        convert_csv_to_binary(str(csv_path), str(binary_path), chunk_size=1)
+    assert binary_path.read_bytes() == b'previous'
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['trace.bin', 'trace.csv']
@@ -0,0 +1,244 @@
+"""
+Trace file ingestion for the Memory Management Visualizer
+Streams address traces from binary or CSV files with constant memory
+
+The binary format is an 8-byte magic header followed by one little-endian
+unsigned 64-bit address per access. CSV traces have one access per row:
+either a single address column without a header, or a header row with an
+'address' column (other columns are ignored). Addresses may be decimal
+(leading zeros allowed, as in fixed-width dumps) or 0x-prefixed hexadecimal.
+
+Usage:
+    python trace_files.py convert trace.csv trace.bin
+    python trace_files.py replay trace.bin --memory-size 65536 --algorithm LRU
+"""
+import os
+import sys
+import csv
+import json
+import logging
+import argparse
+
+import numpy as np
+
+from memory_manager import MemoryManager
+from workloads import STREAM_CHUNK_SIZE, stream_addresses
+
+BINARY_MAGIC = b'MMTRACE1'
+ADDRESS_DTYPE = np.dtype('<u8')
+
+
+def is_binary_trace(path):
+    """
+    Check whether a file starts with the binary trace header
+
+    Args:
+        path (str): Trace file path
+
+    Returns:
+        bool: True for binary traces
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def map_binary_trace(path):
+    """
+    Memory-map the addresses of a binary trace without reading them
+
+    Args:
+        path (str): Binary trace file path
+
+    Returns:
+        numpy.ndarray: Read-only array of addresses backed by the file
+    """
+    if not is_binary_trace(path):
+        raise ValueError(f"{path} is not a binary trace")
+    payload = os.path.getsize(path) - len(BINARY_MAGIC)
+    if payload % ADDRESS_DTYPE.itemsize:
+        raise ValueError(f"{path} is truncated")
+    if payload == 0:
+        return np.empty(0, dtype=ADDRESS_DTYPE)  # memmap cannot map zero bytes
+    return np.memmap(path, dtype=ADDRESS_DTYPE, mode='r', offset=len(BINARY_MAGIC))
+
+
+def read_binary_trace(path, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream the addresses of a binary trace
+
+    Only one chunk is converted to Python ints at a time; the operating
+    system pages the mapped file in and out as the stream advances.
+
+    Args:
+        path (str): Binary trace file path
+        chunk_size (int): Addresses converted per chunk
+
+    Yields:
+        int: One address per access
+    """
+    yield from stream_addresses(map_binary_trace(path), chunk_size)
+
+
+def parse_address(text):
+    """
+    Parse a trace address
+
+    Args:
+        text (str): Decimal, or hexadecimal with a 0x prefix
+
+    Returns:
+        int: Address
+
+    Raises:
+        ValueError: If the text is not an address
+    """
+    text = text.strip()
+    is_hex = text.lstrip('+-')[:2].lower() == '0x'
+    return int(text, 16 if is_hex else 10)
+
+
+def read_csv_chunks(path, column='address', chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Read a CSV trace as lists of addresses
+
+    Args:
+        path (str): CSV trace file path
+        column (str): Header of the address column (ignored for files
+            without a header, which use the first column)
+        chunk_size (int): Addresses per list
+
+    Yields:
+        list: Up to ``chunk_size`` addresses
+    """
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        index = 0
+        chunk = []
+        first_row = True
+        for line_number, row in enumerate(reader, 1):
+            if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+                continue
+            try:
+                chunk.append(parse_address(row[index]))
+            except ValueError:
+                if first_row:
+                    # Header row: locate the address column
+                    headers = [name.strip().lower() for name in row]
+                    if column.lower() not in headers:
+                        raise ValueError(f"{path} has no '{column}' column")
+                    index = headers.index(column.lower())
+                    first_row = False
+                    continue
+                raise ValueError(f"{path}:{line_number}: invalid address {row[index]!r}")
+            except IndexError:
+                raise ValueError(f"{path}:{line_number}: missing address column")
+            first_row = False
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def read_csv_trace(path, column='address', chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream the addresses of a CSV trace
+
+    Args:
+        path (str): CSV trace file path
+        column (str): Header of the address column
+        chunk_size (int): Rows parsed per chunk
+
+    Yields:
+        int: One address per access
+    """
+    for chunk in read_csv_chunks(path, column, chunk_size):
+        yield from chunk
+
+
+def read_trace(path, column='address', chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream a trace file, detecting binary or CSV format from its header
+
+    Args:
+        path (str): Trace file path
+        column (str): Address column for CSV traces
+        chunk_size (int): Addresses per chunk
+
+    Returns:
+        iterator: One address per access
+    """
+    if is_binary_trace(path):
+        return read_binary_trace(path, chunk_size)
+    return read_csv_trace(path, column, chunk_size)
+
+
+def convert_csv_to_binary(csv_path, binary_path, column='address', chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Convert a CSV trace to the binary format, one chunk at a time
+
+    The output is written to ``binary_path + '.tmp'`` and renamed over
+    ``binary_path`` once the whole trace has converted, so a bad row never
+    leaves a partial trace behind.
+
+    Args:
+        csv_path (str): Source CSV trace
+        binary_path (str): Destination binary trace (overwritten)
+        column (str): Address column of the CSV trace
+        chunk_size (int): Rows converted per chunk
+
+    Returns:
+        int: Number of addresses written
+    """
+    written = 0
+    temp_path = binary_path + '.tmp'
+    out = open(temp_path, 'wb')
+    try:
+        with out:
+            out.write(BINARY_MAGIC)
+            for chunk in read_csv_chunks(csv_path, column, chunk_size):
+                if min(chunk) < 0:
+                    raise ValueError(f"{csv_path}: negative addresses cannot be stored in a binary trace")
+                np.asarray(chunk, dtype=ADDRESS_DTYPE).tofile(out)
+                written += len(chunk)
+        os.replace(temp_path, binary_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert and replay memory access traces")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help="Convert a CSV trace to the binary format")
+    convert.add_argument('csv_path')
+    convert.add_argument('binary_path')
+    convert.add_argument('--column', default='address')
+
+    replay = commands.add_parser('replay', help="Replay a trace through a MemoryManager")
+    replay.add_argument('trace')
+    replay.add_argument('--column', default='address')
+    replay.add_argument('--memory-size', type=int, default=65536)
+    replay.add_argument('--page-size', type=int, default=64)
+    replay.add_argument('--algorithm', default='FIFO')
+    replay.add_argument('--history', default=None, help="File to spill the operation history to")
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        count = convert_csv_to_binary(args.csv_path, args.binary_path, args.column)
+        print(f"Wrote {count} addresses to {args.binary_path}")
+        return 0
+
+    logging.disable(logging.CRITICAL)
+    manager = MemoryManager(memory_size=args.memory_size, page_size=args.page_size, algorithm=args.algorithm,
+                            operation_log_path=args.history)
+    result = manager.replay_accesses(read_trace(args.trace, args.column))
+    manager.operations.close()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Working-set tracking for the Memory Management Visualizer
+Per-process working sets and page-fault frequency over a sliding window
+"""
+import heapq
+
+from snapshot_format import checked_int, require
+
+# Window fault rate at or above which a process is reported as thrashing
+PFF_THRASHING_RATE = 0.5
+# Accesses a process needs in the window before its fault rate is judged
+PFF_MIN_ACCESSES = 10
+# Processes listed in a report (those with the highest fault rate)
+WORKING_SET_REPORT_LIMIT = 20
+
+
+class WorkingSetTracker:
+    """
+    Denning working sets over the last ``tau`` accesses.
+
+    The window is a ring buffer of the most recent accesses as (process,
+    page, faulted) entries. Each process keeps a reference count per page
+    and counts of its accesses and faults in the window. An access adds
+    its entry and retires the one it overwrites, so the working set of a
+    process (the pages with a non-zero count) and its page-fault frequency
+    are maintained in O(1) per access. The window is measured in accesses
+    of the whole simulation, not of each process.
+    """
+
+    def __init__(self, tau=1000):
+        """
+        Initialize an empty window
+
+        Args:
+            tau (int): Window size in accesses
+        """
+        if tau <= 0:
+            raise ValueError(f"Working-set window must be positive, got {tau}")
+        self.tau = tau
+        self._window = [None] * tau
+        self._next = 0
+        self._pages = {}  # process_id -> {page: references in the window}
+        self._accesses = {}  # process_id -> accesses in the window
+        self._faults = {}  # process_id -> faults in the window
+
+    def access(self, process_id, page, fault):
+        """
+        Record an access
+
+        Args:
+            process_id (int): Process that made the access
+            page (hashable): Page accessed, unique within the process
+            fault (bool): Whether the access faulted
+        """
+        old = self._window[self._next]
+        if old is not None:
+            self._retire(*old)
+        self._window[self._next] = (process_id, page, fault)
+        self._next = (self._next + 1) % self.tau
+
+        pages = self._pages.get(process_id)
+        if pages is None:
+            pages = self._pages[process_id] = {}
+            self._accesses[process_id] = 0
+            self._faults[process_id] = 0
+        pages[page] = pages.get(page, 0) + 1
+        self._accesses[process_id] += 1
+        if fault:
+            self._faults[process_id] += 1
+
+    def _retire(self, process_id, page, fault):
+        """Remove an access that has left the window"""
+        pages = self._pages.get(process_id)
+        if pages is None:
+            return  # The process was forgotten
+        count = pages[page] - 1
+        if count:
+            pages[page] = count
+        else:
+            del pages[page]
+        self._accesses[process_id] -= 1
+        if fault:
+            self._faults[process_id] -= 1
+        if not self._accesses[process_id]:
+            self.forget(process_id)
+
+    def forget(self, process_id):
+        """
+        Stop tracking a process (its accesses still age out of the window)
+
+        Args:
+            process_id (int): Process that no longer exists
+        """
+        if self._pages.pop(process_id, None) is not None:
+            del self._accesses[process_id]
+            del self._faults[process_id]
+
+    def copy(self):
+        """
+        Copy the tracker for a forked simulation
+
+        Window entries are immutable tuples, so the window is copied as one
+        list; each tracked process's page counts are a dict copy.
+
+        Returns:
+            WorkingSetTracker: Independent tracker in the same state
+        """
+        clone = WorkingSetTracker.__new__(WorkingSetTracker)
+        clone.__dict__.update(self.__dict__)
+        clone._window = list(self._window)
+        clone._pages = {process_id: dict(pages) for process_id, pages in self._pages.items()}
+        clone._accesses = dict(self._accesses)
+        clone._faults = dict(self._faults)
+        return clone
+
+    def get_state(self):
+        """
+        Get the window as plain data for a snapshot
+
+        Returns:
+            dict: Window size, the ring buffer of (process, page, faulted)
+                entries and its next slot, and the tracked processes
+        """
+        return {'tau': self.tau, 'window': list(self._window), 'next': self._next, 'processes': list(self._pages)}
+
+    def set_state(self, state):
+        """
+        Load get_state() data, recounting each tracked process's pages,
+        accesses and faults from the window
+
+        Args:
+            state (dict): Output of get_state() for a tracker of this size
+        """
+        window = state['window']
+        processes = state['processes']
+        require(state['tau'] == self.tau and type(window) is list and len(window) == self.tau,
+                "working-set window does not match its size")
+        require(type(processes) is list, "invalid working-set processes")
+        for entry in window:
+            require(entry is None or (type(entry) is tuple and len(entry) == 3 and type(entry[2]) is bool),
+                    "invalid working-set entry")
+        self._window = window
+        self._next = checked_int(state['next'], 0, self.tau - 1)
+
+        # A tracked process has every entry it still has in the window counted
+        self._pages = {process_id: {} for process_id in processes}
+        self._accesses = dict.fromkeys(self._pages, 0)
+        self._faults = dict.fromkeys(self._pages, 0)
+        for entry in window:
+            if entry is not None and entry[0] in self._pages:
+                process_id, page, fault = entry
+                pages = self._pages[process_id]
+                pages[page] = pages.get(page, 0) + 1
+                self._accesses[process_id] += 1
+                self._faults[process_id] += fault
+        require(all(self._accesses.values()), "tracked process without accesses")
+
+    def working_set_size(self, process_id):
+        """
+        Get the number of distinct pages a process touched in the window
+
+        Args:
+            process_id (int): Process
+
+        Returns:
+            int: Working-set size in pages
+        """
+        pages = self._pages.get(process_id)
+        return len(pages) if pages else 0
+
+    def fault_rate(self, process_id):
+        """
+        Get a process's page-fault frequency over the window
+
+        Args:
+            process_id (int): Process
+
+        Returns:
+            float: Faults per access in the window (0 if it made none)
+        """
+        accesses = self._accesses.get(process_id, 0)
+        return self._faults[process_id] / accesses if accesses else 0
+
+    def is_thrashing(self, process_id):
+        """
+        Check whether a process faults on at least PFF_THRASHING_RATE of
+        its accesses, once it has made PFF_MIN_ACCESSES in the window
+
+        Args:
+            process_id (int): Process
+
+        Returns:
+            bool: True if the process is thrashing
+        """
+        return (self._accesses.get(process_id, 0) >= PFF_MIN_ACCESSES
+                and self.fault_rate(process_id) >= PFF_THRASHING_RATE)
+
+    def get_report(self, total_frames, limit=WORKING_SET_REPORT_LIMIT):
+        """
+        Summarize working sets and fault frequency
+
+        Args:
+            total_frames (int): Frames in memory, to compare the combined
+                working set against
+            limit (int): Number of processes to list
+
+        Returns:
+            dict: Window size, combined working set, whether it exceeds
+                memory, thrashing process count and the ``limit``
+                processes with the highest fault rate
+        """
+        total_working_set = sum(len(pages) for pages in self._pages.values())
+        thrashing = [pid for pid in self._pages if self.is_thrashing(pid)]
+        worst = heapq.nlargest(limit, self._pages, key=lambda pid: (self.fault_rate(pid), self._accesses[pid]))
+        return {
+            'tau': self.tau,
+            'tracked_processes': len(self._pages),
+            'total_working_set': total_working_set,
+            'overcommitted': total_working_set > total_frames,
+            'thrashing_processes': len(thrashing),
+            'processes': [{
+                'process_id': pid,
+                'working_set': len(self._pages[pid]),
+                'accesses': self._accesses[pid],
+                'faults': self._faults[pid],
+                'fault_rate': self.fault_rate(pid),
+                'thrashing': self.is_thrashing(pid)
+            } for pid in worst]
+        }
@@ -0,0 +1,174 @@
+"""
+Synthetic workload generators for the Memory Management Visualizer
+Builds large access traces with vectorized NumPy sampling
+
+Each generator returns a NumPy array of byte addresses (one per access)
+that can be streamed into MemoryManager.replay_accesses() with
+stream_addresses(), without building an operation dict per access.
+"""
+import numpy as np
+
+# Addresses handed to the simulator per chunk when streaming
+STREAM_CHUNK_SIZE = 65536
+
+
+def _rng(seed):
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def _to_addresses(pages, page_size):
+    return pages.astype(np.int64) * page_size
+
+
+def _zipf_ranks(rng, count, num_items, alpha):
+    """Sample ranks 0..num_items-1 with P(rank k) proportional to 1 / (k + 1)**alpha"""
+    cdf = np.cumsum(1.0 / np.arange(1, num_items + 1) ** alpha)
+    cdf /= cdf[-1]
+    ranks = np.searchsorted(cdf, rng.random(count), side='right')
+    return np.minimum(ranks, num_items - 1)
+
+
+def uniform(count, num_pages, page_size=64, seed=None):
+    """
+    Accesses spread uniformly over every page
+
+    Args:
+        count (int): Number of accesses
+        num_pages (int): Pages in the address space
+        page_size (int): Page size in bytes
+        seed (int): Random seed or numpy Generator
+
+    Returns:
+        numpy.ndarray: Byte addresses
+    """
+    pages = _rng(seed).integers(0, num_pages, size=count)
+    return _to_addresses(pages, page_size)
+
+
+def zipfian(count, num_pages, page_size=64, alpha=1.0, seed=None):
+    """
+    Skewed accesses: the k-th most popular page is accessed in proportion
+    to 1 / k**alpha. Popular pages are scattered over the address space.
+
+    Args:
+        count (int): Number of accesses
+        num_pages (int): Pages in the address space
+        page_size (int): Page size in bytes
+        alpha (float): Skew (0 is uniform; larger is more skewed)
+        seed (int): Random seed or numpy Generator
+
+    Returns:
+        numpy.ndarray: Byte addresses
+    """
+    rng = _rng(seed)
+    pages = rng.permutation(num_pages)[_zipf_ranks(rng, count, num_pages, alpha)]
+    return _to_addresses(pages, page_size)
+
+
+def sequential_scan(count, num_pages, page_size=64, stride=1, start=0):
+    """
+    Pages visited in order, wrapping around at the end of the address space
+
+    Args:
+        count (int): Number of accesses
+        num_pages (int): Pages in the address space
+        page_size (int): Page size in bytes
+        stride (int): Pages advanced per access
+        start (int): First page
+
+    Returns:
+        numpy.ndarray: Byte addresses
+    """
+    pages = (start + np.arange(count, dtype=np.int64) * stride) % num_pages
+    return _to_addresses(pages, page_size)
+
+
+def looping(count, num_pages, page_size=64, working_set=64, seed=None):
+    """
+    Repeated sequential sweeps over one working set of pages (the classic
+    LRU worst case once the working set exceeds the frames)
+
+    Args:
+        count (int): Number of accesses
+        num_pages (int): Pages in the address space
+        page_size (int): Page size in bytes
+        working_set (int): Pages in the loop
+        seed (int): Random seed or numpy Generator (places the loop)
+
+    Returns:
+        numpy.ndarray: Byte addresses
+    """
+    working_set = max(1, min(working_set, num_pages))
+    base = _rng(seed).integers(0, num_pages - working_set + 1)
+    pages = base + np.arange(count, dtype=np.int64) % working_set
+    return _to_addresses(pages, page_size)
+
+
+def phase_changes(count, num_pages, page_size=64, phases=4, working_set=64, alpha=1.0, seed=None):
+    """
+    Zipfian accesses to a working set that moves to a new random region of
+    the address space at each phase boundary
+
+    Args:
+        count (int): Number of accesses
+        num_pages (int): Pages in the address space
+        page_size (int): Page size in bytes
+        phases (int): Number of equal-length phases
+        working_set (int): Pages in each phase's working set
+        alpha (float): Skew within a working set
+        seed (int): Random seed or numpy Generator
+
+    Returns:
+        numpy.ndarray: Byte addresses
+    """
+    rng = _rng(seed)
+    phases = max(1, phases)
+    working_set = max(1, min(working_set, num_pages))
+    bases = rng.integers(0, num_pages - working_set + 1, size=phases)
+    phase_of = np.arange(count, dtype=np.int64) * phases // max(1, count)
+    pages = bases[phase_of] + _zipf_ranks(rng, count, working_set, alpha)
+    return _to_addresses(pages, page_size)
+
+
+GENERATORS = {
+    'uniform': uniform,
+    'zipfian': zipfian,
+    'sequential': sequential_scan,
+    'looping': looping,
+    'phases': phase_changes,
+}
+
+
+def generate(workload, count, num_pages, page_size=64, **options):
+    """
+    Build a trace with a generator from GENERATORS
+
+    Args:
+        workload (str): Generator name
+        count (int): Number of accesses
+        num_pages (int): Pages in the address space
+        page_size (int): Page size in bytes
+        **options: Generator-specific parameters (seed, alpha, ...)
+
+    Returns:
+        numpy.ndarray: Byte addresses
+    """
+    generator = GENERATORS.get(workload)
+    if generator is None:
+        raise ValueError(f"Unknown workload: {workload}")
+    return generator(count, num_pages, page_size=page_size, **options)
+
+
+def stream_addresses(addresses, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield a trace as Python ints, converting one chunk at a time
+
+    Args:
+        addresses (numpy.ndarray): Byte addresses
+        chunk_size (int): Addresses converted per chunk
+
+    Yields:
+        int: One address per access
+    """
+    for start in range(0, len(addresses), chunk_size):
+        yield from addresses[start:start + chunk_size].tolist()